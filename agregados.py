@@ -0,0 +1,56 @@
+"""
+Totales acumulados de validación mantenidos de forma incremental
+Cada validación nueva (generación o CURP que no estaba en la cache) suma a
+contadores con nombre (por estado, sexo, década de nacimiento y resultado o
+tipo de error), así que leerlos cuesta lo mismo con 10 que con 100 mil
+validaciones. Son totales históricos, no el contenido de la cache: una CURP
+que se vuelve a validar tras salir de la cache cuenta otra vez, y ni la
+expulsión, ni la caducidad, ni /limpiar-cache los descuentan.
+"""
+
+from generador_curp import tipo_error
+
+PREFIJO = 'agregado.'
+
+
+def claves_agregado(validacion):
+    """Nombres de los contadores a los que suma un resultado de validar_sintaxis"""
+    tipo = tipo_error(validacion)
+    if tipo is not None:
+        return [f'{PREFIJO}resultado.invalida', f'{PREFIJO}error.{tipo}']
+    curp = validacion['curp']
+    año = validacion['tokens']['fecha'][-4:]
+    return [
+        f'{PREFIJO}resultado.valida',
+        f'{PREFIJO}estado.{curp[11:13]}',
+        f'{PREFIJO}sexo.{curp[10]}',
+        f'{PREFIJO}decada.{año[:3]}0',
+    ]
+
+
+def acumular(cantidades, validacion):
+    """Suma una validación a un dict {contador: cantidad} pendiente de escribir"""
+    for nombre in claves_agregado(validacion):
+        cantidades[nombre] = cantidades.get(nombre, 0) + 1
+    return cantidades
+
+
+def registrar(contadores, validacion):
+    contadores.incrementar_varios(acumular({}, validacion))
+
+
+def resumen(contadores):
+    """Totales acumulados desde que se crearon los contadores, agrupados"""
+    grupos = {}
+    for nombre, valor in contadores.con_prefijo(PREFIJO).items():
+        grupo, _, clave = nombre.partition('.')
+        grupos.setdefault(grupo, {})[clave] = valor
+    resultado = grupos.get('resultado', {})
+    return {
+        'validas': resultado.get('valida', 0),
+        'invalidas': resultado.get('invalida', 0),
+        'por_tipo_error': dict(sorted(grupos.get('error', {}).items())),
+        'por_estado': dict(sorted(grupos.get('estado', {}).items())),
+        'por_sexo': dict(sorted(grupos.get('sexo', {}).items())),
+        'por_decada': dict(sorted(grupos.get('decada', {}).items())),
+    }
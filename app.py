@@ -1,18 +1,90 @@
-from flask import Flask, render_template, request, jsonify
-from validador_ortografico import validar_campo
-from generador_curp import GeneradorCURP
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, g
+from validador_ortografico import validar_campo, validar_campos
+from autocompletado import autocompletar, MAX_COMPLETADOS
+from generador_curp import GeneradorCURP, verificar_datos_persona, generar_fila
+from validacion_lote import (validar_en_orden, ejecutor_procesos, ResumenLote, curp_de_elemento,
+                             curp_de_linea, persona_de_linea, lineas_no_vacias)
+from cache_curp import CacheCURP, ContadoresLocales
+from cache_compartido import CacheSQLite, ContadoresSQLite, IndiceHomonimosSQLite
+from indice_homonimos import IndiceHomonimos, LONGITUD_RAIZ
+from metricas import registro as metricas
+import agregados
+import instantanea
 from datetime import datetime
+from itertools import chain
+import csv
+import io
+import json
+import os
+import time
 
 app = Flask(__name__)
 generador = GeneradorCURP()
 
-curps_cache = {}
-validaciones_realizadas = 0
+def _config_numerica(nombre, defecto, tipo=int):
+    """Lee un límite numérico del entorno; vacío o 0 significa sin límite"""
+    valor = os.environ.get(nombre)
+    if valor is None:
+        return defecto
+    return tipo(valor) or None
+
+_limites_cache = {
+    'max_entradas': _config_numerica('CURP_CACHE_MAX_ENTRADAS', 10000),
+    'max_bytes': _config_numerica('CURP_CACHE_MAX_BYTES', 16 * 1024 * 1024),
+    'ttl': _config_numerica('CURP_CACHE_TTL', None, float),
+}
+
+_max_homonimos = _config_numerica('CURP_HOMONIMOS_MAX', 100000)
+
+# CURP_CACHE_BACKEND=sqlite comparte cache, contadores y homónimos entre los workers del nodo
+if os.environ.get('CURP_CACHE_BACKEND', 'local') == 'sqlite':
+    _ruta_cache = os.environ.get('CURP_CACHE_RUTA', 'curp_cache.sqlite3')
+    curps_cache = CacheSQLite(_ruta_cache, **_limites_cache)
+    contadores = ContadoresSQLite(_ruta_cache)
+    homonimos = IndiceHomonimosSQLite(_ruta_cache, max_registros=_max_homonimos)
+else:
+    curps_cache = CacheCURP(**_limites_cache)
+    contadores = ContadoresLocales()
+    homonimos = IndiceHomonimos(max_registros=_max_homonimos)
+
+# Índices de sugerencias y autocompletado desde la instantánea (CURP_INSTANTANEA,
+# vacío para no usarla; si falta o no está al día se construyen en memoria sin
+# escribirla); con gunicorn --preload se cargan una sola vez en el maestro
+metricas.observar('curp_arranque_instantanea_segundos', instantanea.precargar())
+
+def referencia_persona(data):
+    """Identifica a la persona detrás de una CURP generada para distinguir homónimos"""
+    return '|'.join(generador.normalizar_texto(data[campo]) for campo in
+                    ('apellido_paterno', 'apellido_materno', 'nombre')) + '|' + data['fecha_nacimiento']
+
+@app.before_request
+def iniciar_medicion():
+    g.inicio_peticion = time.perf_counter()
+
+@app.after_request
+def registrar_medicion(response):
+    inicio = g.pop('inicio_peticion', None)
+    if inicio is not None:
+        ruta = request.url_rule.rule if request.url_rule is not None else 'sin_ruta'
+        metricas.observar('curp_http_latencia_segundos', time.perf_counter() - inicio, ruta=ruta)
+        metricas.incrementar('curp_http_peticiones_total', ruta=ruta, metodo=request.method,
+                             codigo=response.status_code)
+        if response.status_code >= 400:
+            metricas.incrementar('curp_http_errores_total', ruta=ruta)
+    return response
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def respuesta_campo_vacio(tipo):
+    return {
+        'valido': False,
+        'tipo_error': 'vacio',
+        'mensaje': f'El {tipo.replace("_", " ")} no puede estar vacío',
+        'sugerencias': []
+    }
+
 @app.route('/validar-campo', methods=['POST'])
 def validar_campo_endpoint():
     data = request.get_json()
@@ -20,128 +92,372 @@ def validar_campo_endpoint():
     tipo = data.get('tipo', 'nombre')
     
     if not texto:
-        return jsonify({
-            'valido': False,
-            'tipo_error': 'vacio',
-            'mensaje': f'El {tipo.replace("_", " ")} no puede estar vacío',
-            'sugerencias': []
-        })
+        return jsonify(respuesta_campo_vacio(tipo))
     
     resultado = validar_campo(texto, tipo)
     return jsonify(resultado)
 
-@app.route('/generar-curp', methods=['POST'])
-def generar_curp_endpoint():
-    global validaciones_realizadas
-    
-    data = request.get_json()
-    required_fields = ['apellido_paterno', 'apellido_materno', 'nombre',
-                      'fecha_nacimiento', 'sexo', 'estado']
+CAMPOS_FORMULARIO = ['apellido_paterno', 'apellido_materno', 'nombre']
+
+def textos_formulario(data):
+    """Campos de texto no vacíos del formulario: {tipo: texto}"""
+    textos = {tipo: str(data.get(tipo) or '').strip() for tipo in CAMPOS_FORMULARIO}
+    return {tipo: texto for tipo, texto in textos.items() if texto}
+
+def respuesta_validar_formulario(data, campos=None):
+    """
+    Lógica de /validar-formulario: valida los tres campos de texto y, si todos
+    son válidos y se pide (generar, por omisión verdadero), genera la CURP.
+    campos: resultado de validar_campos() ya calculado, si lo hay
+    """
+    textos = textos_formulario(data)
+    if campos is None:
+        campos = validar_campos(textos)
+    campos = {tipo: campos[tipo] if tipo in textos else respuesta_campo_vacio(tipo)
+              for tipo in CAMPOS_FORMULARIO}
     
-    for field in required_fields:
-        if field not in data or not data[field]:
-            return jsonify({
-                'success': False,
-                'error': f'Falta el campo: {field.replace("_", " ")}'
-            }), 400
+    validos = all(resultado['valido'] for resultado in campos.values())
+    generacion = None
+    if validos and data.get('generar', True):
+        generacion, codigo = respuesta_generar_curp(data)
+        if not generacion['success']:
+            return {'success': False, 'campos': campos, 'generacion': generacion}, codigo
+    return {'success': validos, 'campos': campos, 'generacion': generacion}, 200
+
+@app.route('/validar-formulario', methods=['POST'])
+def validar_formulario_endpoint():
+    """Validación de los campos y generación de la CURP en una sola petición"""
+    cuerpo, codigo = respuesta_validar_formulario(request.get_json())
+    return jsonify(cuerpo), codigo
+
+@app.route('/autocompletar', methods=['GET'])
+def autocompletar_endpoint():
+    texto = request.args.get('q', '')
+    tipo = request.args.get('tipo', 'nombre')
+    try:
+        k = min(max(int(request.args.get('k', MAX_COMPLETADOS)), 1), MAX_COMPLETADOS)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'k debe ser un entero'}), 400
     
+    return jsonify({
+        'tipo': tipo,
+        'q': texto,
+        'sugerencias': [palabra.title() for palabra in autocompletar(texto, tipo, k)]
+    })
+
+def respuesta_generar_curp(data):
+    """Lógica de /generar-curp independiente del framework: (cuerpo, código HTTP)"""
     try:
-        try:
-            fecha = datetime.strptime(data['fecha_nacimiento'], '%d/%m/%Y')
-            if fecha > datetime.now():
-                return jsonify({'success': False, 'error': 'Fecha futura no válida'}), 400
-            if fecha.year < 1900:
-                return jsonify({'success': False, 'error': 'Fecha anterior a 1900 no válida'}), 400
-        except ValueError:
-            return jsonify({'success': False, 'error': 'Formato de fecha inválido'}), 400
-        
-        if data['sexo'].upper() not in ['H', 'M', 'X']:
-            return jsonify({'success': False, 'error': 'Sexo inválido'}), 400
-        
-        if data['estado'].upper() not in generador.estados:
-            return jsonify({'success': False, 'error': 'Estado inválido'}), 400
+        error = verificar_datos_persona(data)
+        if error:
+            return {'success': False, 'error': error}, 400
         
         curp = generador.generar_curp(data)
         validacion = generador.validar_curp_sintaxis(curp)
         
-        curps_cache[curp] = {
+        curps_cache.set(curp, {
             'datos': data,
             'validacion': validacion,
             'timestamp': datetime.now().isoformat()
-        }
+        })
         
-        validaciones_realizadas += 1
+        homonimos.agregar(curp, referencia_persona(data))
+        agregados.registrar(contadores, validacion)
+        total_validaciones = contadores.incrementar('validaciones')
         
-        return jsonify({
+        return {
             'success': True,
             'curp': curp,
             'validacion': validacion,
-            'total_validaciones': validaciones_realizadas
-        })
+            'total_validaciones': total_validaciones,
+            'homonimos': homonimos.cantidad(curp) - 1
+        }, 200
         
     except Exception as e:
-        return jsonify({
+        return {
             'success': False,
             'error': f'Error al generar CURP: {str(e)}'
-        }), 500
+        }, 500
 
-@app.route('/validar-curp', methods=['POST'])
-def validar_curp_endpoint():
-    global validaciones_realizadas
+@app.route('/generar-curp', methods=['POST'])
+def generar_curp_endpoint():
+    cuerpo, codigo = respuesta_generar_curp(request.get_json())
+    return jsonify(cuerpo), codigo
+
+def leer_filas_lote(stream, formato):
+    """Itera las filas de un lote CSV (con encabezado) o JSONL sin cargar el cuerpo completo"""
+    texto = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    if formato == 'csv':
+        for fila in csv.DictReader(texto):
+            yield fila
+        return
+    for linea in lineas_no_vacias(texto):
+        yield persona_de_linea(linea)
+
+def formato_lote():
+    formato = request.args.get('formato')
+    if formato:
+        return formato.lower()
+    if 'csv' in (request.mimetype or ''):
+        return 'csv'
+    return 'jsonl'
+
+@app.route('/generar-curp/lote', methods=['POST'])
+def generar_curp_lote_endpoint():
+    """Genera CURPs para un lote CSV/JSONL y responde una línea JSON por fila"""
+    formato = formato_lote()
+    if formato not in ('csv', 'jsonl'):
+        return jsonify({'success': False, 'error': f'Formato no soportado: {formato}'}), 400
     
-    data = request.get_json()
+    # La primera fila se lee antes de responder: un cuerpo que no es UTF-8
+    # desde el inicio se rechaza con 400; si el error aparece más adelante,
+    # ya enviadas las primeras filas, termina el flujo con una línea de error
+    filas = leer_filas_lote(request.stream, formato)
+    try:
+        primera = next(filas, None)
+    except UnicodeDecodeError:
+        return jsonify({'success': False, 'error': 'El lote debe estar codificado en UTF-8'}), 400
+    
+    def procesar():
+        pendientes = {}  # contadores acumulados, se escriben una sola vez
+        try:
+            todas = chain([primera], filas) if primera is not None else filas
+            for numero, data in enumerate(todas, start=1):
+                resultado = {'fila': numero, **generar_fila(generador, data)}
+                if resultado['success']:
+                    pendientes['validaciones'] = pendientes.get('validaciones', 0) + 1
+                    agregados.acumular(pendientes,
+                                       generador.validar_sintaxis(resultado['curp'], detalle=False))
+                yield json.dumps(resultado, ensure_ascii=False) + '\n'
+        except UnicodeDecodeError:
+            yield json.dumps({'success': False, 'error': 'El lote debe estar codificado en UTF-8'},
+                             ensure_ascii=False) + '\n'
+        finally:
+            if pendientes:
+                contadores.incrementar_varios(pendientes)
+    
+    return Response(stream_with_context(procesar()), mimetype='application/x-ndjson')
+
+def respuesta_validar_curp(data):
+    """Lógica de /validar-curp independiente del framework: (cuerpo, código HTTP)"""
     curp = data.get('curp', '').strip().upper()
     
     if not curp:
-        return jsonify({'success': False, 'error': 'CURP vacía'}), 400
+        return {'success': False, 'error': 'CURP vacía'}, 400
     
-    if curp in curps_cache:
-        return jsonify({
+    entrada = curps_cache.get(curp)
+    if entrada is not None:
+        return {
             'success': True,
             'cached': True,
-            'validacion': curps_cache[curp]['validacion']
-        })
+            'validacion': entrada['validacion']
+        }, 200
     
     validacion = generador.validar_curp_sintaxis(curp)
+    agregados.registrar(contadores, validacion)
     
     if validacion['valida']:
-        curps_cache[curp] = {
+        curps_cache.set(curp, {
             'validacion': validacion,
             'timestamp': datetime.now().isoformat()
-        }
-        validaciones_realizadas += 1
+        })
+        homonimos.agregar(curp)
+        total_validaciones = contadores.incrementar('validaciones')
         
-        return jsonify({
+        return {
             'success': True,
             'cached': False,
             'validacion': validacion,
-            'total_validaciones': validaciones_realizadas
-        })
+            'total_validaciones': total_validaciones
+        }, 200
     else:
-        return jsonify({
+        return {
             'success': False,
             'error': 'CURP no válida',
             'validacion': validacion
-        }), 400
+        }, 400
+
+@app.route('/validar-curp', methods=['POST'])
+def validar_curp_endpoint():
+    cuerpo, codigo = respuesta_validar_curp(request.get_json())
+    return jsonify(cuerpo), codigo
+
+def leer_curps_lote(stream, formato):
+    """
+    Itera las CURPs de un arreglo JSON o de un cuerpo con una CURP por línea
+    (texto plano, cadena JSON u objeto con 'curp'); solo el arreglo se lee completo
+    """
+    texto = io.TextIOWrapper(stream, encoding='utf-8')
+    if formato == 'json':
+        elementos = json.load(texto)
+        if not isinstance(elementos, list):
+            raise ValueError('Se esperaba un arreglo JSON')
+        for elemento in elementos:
+            yield curp_de_elemento(elemento)
+        return
+    for linea in lineas_no_vacias(texto):
+        yield curp_de_linea(linea)
+
+def _validaciones_en_cache(curps):
+    """{curp: validacion} de las CURPs del conjunto que están en la cache, en una sola consulta"""
+    return {curp: entrada['validacion'] for curp, entrada in curps_cache.obtener_varios(curps).items()}
+
+@app.route('/validar-curp/lote', methods=['POST'])
+def validar_curp_lote_endpoint():
+    """
+    Valida un lote de CURPs en varios procesos y responde una línea JSON por
+    CURP, en el orden de entrada, más una línea final con el resumen
+    """
+    formato = 'json' if request.mimetype == 'application/json' else 'lineas'
+    stream = request.stream
+    
+    def procesar():
+        resumen = ResumenLote()
+        pendientes = {}  # contadores acumulados, se escriben una sola vez
+        try:
+            bloques = validar_en_orden(leer_curps_lote(stream, formato), ejecutor_procesos(),
+                                       consultar=_validaciones_en_cache)
+            for texto, parcial, cantidades in bloques:
+                resumen.sumar(parcial)
+                for nombre, cantidad in cantidades.items():
+                    pendientes[nombre] = pendientes.get(nombre, 0) + cantidad
+                yield texto
+        except ValueError as e:
+            yield json.dumps({'success': False, 'error': f'Lote mal formado: {e}'},
+                             ensure_ascii=False) + '\n'
+        finally:
+            if pendientes:
+                contadores.incrementar_varios(pendientes)
+        yield json.dumps({'resumen': resumen.como_dict()}, ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(procesar()), mimetype='application/x-ndjson')
+
+MAX_PAGINA = 1000
+
+def respuesta_estadisticas():
+    """
+    Resumen de tiempo constante: contadores, métricas de cache y totales
+    acumulados de validación (históricos: no describen el contenido de la
+    cache ni se reinician con /limpiar-cache)
+    """
+    return {
+        'total_validaciones': contadores.valor('validaciones'),
+        'curps_en_cache': len(curps_cache),
+        'cache': curps_cache.metricas(),
+        'validaciones_acumuladas': agregados.resumen(contadores)
+    }
 
 @app.route('/estadisticas', methods=['GET'])
 def estadisticas():
+    return jsonify(respuesta_estadisticas())
+
+def respuesta_curps_cache(despues_de=None, limite=100):
+    """Página de CURPs en cache en orden alfabético; 'siguiente' es el cursor de la próxima"""
+    try:
+        limite = min(max(int(limite), 1), MAX_PAGINA)
+    except (TypeError, ValueError):
+        return {'success': False, 'error': 'limite debe ser un entero'}, 400
+    curps = curps_cache.pagina(despues_de or None, limite)
+    return {
+        'success': True,
+        'curps': curps,
+        'siguiente': curps[-1] if len(curps) == limite else None
+    }, 200
+
+@app.route('/estadisticas/curps', methods=['GET'])
+def estadisticas_curps():
+    cuerpo, codigo = respuesta_curps_cache(request.args.get('despues_de'),
+                                           request.args.get('limite', 100))
+    return jsonify(cuerpo), codigo
+
+def _fecha_consulta(texto):
+    """Fecha de un filtro de búsqueda (DD/MM/AAAA o AAAA-MM-DD) como AAAAMMDD"""
+    for formato in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(texto, formato).strftime('%Y%m%d')
+        except ValueError:
+            pass
+    raise ValueError(f"Fecha inválida: {texto}. Usa DD/MM/AAAA o AAAA-MM-DD")
+
+def respuesta_buscar_curps(consulta):
+    """
+    CURPs en cache filtradas por estado, rango de fecha de nacimiento y
+    prefijo, paginadas con el cursor 'siguiente' (índices secundarios)
+    """
+    try:
+        limite = min(max(int(consulta.get('limite', 100)), 1), MAX_PAGINA)
+    except (TypeError, ValueError):
+        return {'success': False, 'error': 'limite debe ser un entero'}, 400
+    estado = (consulta.get('estado') or '').strip().upper() or None
+    if estado is not None and estado not in GeneradorCURP.ESTADOS:
+        return {'success': False, 'error': f'Estado inválido: {estado}'}, 400
+    try:
+        desde, hasta = (_fecha_consulta(consulta[campo]) if consulta.get(campo) else None
+                        for campo in ('desde', 'hasta'))
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}, 400
+    prefijo = (consulta.get('prefijo') or '').strip().upper()
+    curps = curps_cache.buscar(estado, desde, hasta, prefijo,
+                               consulta.get('despues_de') or None, limite)
+    return {
+        'success': True,
+        'curps': curps,
+        'siguiente': curps[-1] if len(curps) == limite else None
+    }, 200
+
+@app.route('/curps/buscar', methods=['GET'])
+def buscar_curps():
+    cuerpo, codigo = respuesta_buscar_curps(request.args)
+    return jsonify(cuerpo), codigo
+
+@app.route('/homonimos', methods=['GET'])
+def colisiones_endpoint():
+    """Raíces de CURP compartidas por al menos `minimo` personas (por omisión 2)"""
+    try:
+        minimo = max(2, int(request.args.get('minimo', 2)))
+        limite = min(max(1, int(request.args.get('limite', 100))), MAX_PAGINA)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'minimo y limite deben ser enteros'}), 400
+    colisiones = homonimos.colisiones(minimo, limite)
     return jsonify({
-        'total_validaciones': validaciones_realizadas,
-        'curps_en_cache': len(curps_cache),
-        'curps_cache': list(curps_cache.keys())
+        'success': True,
+        'cantidad': len(colisiones),
+        'colisiones': [{'raiz': raiz, 'cantidad': len(registros), 'curps': [curp for _, curp in registros]}
+                       for raiz, registros in colisiones.items()]
     })
 
-@app.route('/limpiar-cache', methods=['POST'])
-def limpiar_cache():
-    global curps_cache
-    cantidad = len(curps_cache)
-    curps_cache.clear()
+@app.route('/homonimos/<raiz>', methods=['GET'])
+def homonimos_endpoint(raiz):
+    """Registros que comparten los primeros 16 caracteres de una CURP"""
+    raiz = raiz.strip().upper()
+    if len(raiz) < LONGITUD_RAIZ:
+        return jsonify({'success': False,
+                        'error': f'La raíz debe tener {LONGITUD_RAIZ} caracteres'}), 400
+    registros = homonimos.consultar(raiz)
     return jsonify({
         'success': True,
-        'mensaje': f'Se eliminaron {cantidad} CURPs del cache'
+        'raiz': raiz[:LONGITUD_RAIZ],
+        'cantidad': len(registros),
+        'curps': [curp for _, curp in registros]
     })
 
+def respuesta_limpiar_cache():
+    cantidad = curps_cache.limpiar()
+    homonimos.limpiar()
+    return {
+        'success': True,
+        'mensaje': f'Se eliminaron {cantidad} CURPs del cache'
+    }
+
+@app.route('/limpiar-cache', methods=['POST'])
+def limpiar_cache():
+    return jsonify(respuesta_limpiar_cache())
+
+@app.route('/metricas', methods=['GET'])
+def metricas_endpoint():
+    """Métricas de rutas y fases en formato de texto de Prometheus"""
+    return Response(metricas.exportar_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'success': False, 'error': 'Ruta no encontrada'}), 404
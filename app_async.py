@@ -0,0 +1,262 @@
+"""
+Frente ASGI para tráfico de validación de alta concurrencia
+Expone las rutas de la API de app.py con los mismos contratos JSON y sobre
+el mismo estado (cache, contadores, homónimos). Las llamadas baratas se
+atienden en el event loop; las que usan la cache SQLite (que puede esperar
+hasta 30 s el lock del archivo) van a un hilo, y la búsqueda difusa de
+sugerencias va a un ejecutor acotado que, cuando su cola se llena, responde
+503 en lugar de encolar sin límite.
+
+Uso:
+    uvicorn app_async:aplicacion --host 0.0.0.0 --port 8000
+    gunicorn app_async:aplicacion -k uvicorn.workers.UvicornWorker
+
+Variables de entorno:
+    CURP_ASYNC_EJECUTOR     hilos (por omisión) o procesos; las métricas de
+                            sugerencias registradas en otros procesos no llegan
+                            a /metricas
+    CURP_ASYNC_TRABAJADORES tamaño del ejecutor (por omisión, núcleos disponibles)
+    CURP_ASYNC_PENDIENTES   sugerencias en curso o en espera antes de responder 503
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from app import (
+    curps_cache, respuesta_buscar_curps, respuesta_campo_vacio, respuesta_curps_cache, respuesta_estadisticas,
+    respuesta_generar_curp, respuesta_limpiar_cache, respuesta_validar_curp, respuesta_validar_formulario,
+    textos_formulario,
+)
+from cache_compartido import CacheSQLite
+from metricas import registro as metricas
+from validador_ortografico import validar_campo, validar_campo_directo, validar_campos
+
+MAX_CUERPO = 1024 * 1024
+TRABAJADORES = int(os.environ.get('CURP_ASYNC_TRABAJADORES', 0)) or os.cpu_count() or 1
+MAX_PENDIENTES = int(os.environ.get('CURP_ASYNC_PENDIENTES', 0)) or 4 * TRABAJADORES
+SEGUNDOS_REINTENTO = 1
+# Con la cache SQLite cada consulta puede bloquear esperando el archivo
+CACHE_BLOQUEANTE = isinstance(curps_cache, CacheSQLite)
+
+metricas.describir('curp_async_rechazos_total', 'Peticiones rechazadas con 503 por ejecutor saturado')
+
+
+class ServicioSaturado(Exception):
+    """La cola del ejecutor está llena"""
+
+
+class TextoPlano(str):
+    """Cuerpo de respuesta que se envía tal cual (formato de texto de Prometheus) en lugar de JSON"""
+
+
+class EjecutorAcotado:
+    """
+    Ejecutor con un máximo de tareas en curso o en espera.
+
+    enviar() no bloquea el event loop: si ya hay max_pendientes tareas lanza
+    ServicioSaturado de inmediato para que el cliente reintente más tarde.
+    """
+
+    def __init__(self, trabajadores=TRABAJADORES, max_pendientes=MAX_PENDIENTES, tipo='hilos'):
+        self.trabajadores = trabajadores
+        self.max_pendientes = max_pendientes
+        self.tipo = tipo
+        self.pendientes = 0
+        self._ejecutor = None
+
+    def _crear(self):
+        if self.tipo == 'procesos':
+            return ProcessPoolExecutor(max_workers=self.trabajadores)
+        return ThreadPoolExecutor(max_workers=self.trabajadores)
+
+    async def enviar(self, funcion, *args):
+        if self.pendientes >= self.max_pendientes:
+            raise ServicioSaturado()
+        if self._ejecutor is None:
+            self._ejecutor = self._crear()
+        self.pendientes += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._ejecutor, funcion, *args)
+        finally:
+            self.pendientes -= 1
+
+    def cerrar(self):
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(wait=False, cancel_futures=True)
+            self._ejecutor = None
+
+
+ejecutor = EjecutorAcotado(tipo=os.environ.get('CURP_ASYNC_EJECUTOR', 'hilos'))
+
+
+async def con_cache(funcion, *args):
+    """Ejecuta una llamada que usa la cache: en un hilo si es la de SQLite, si no en el event loop"""
+    if CACHE_BLOQUEANTE:
+        return await asyncio.to_thread(funcion, *args)
+    return funcion(*args)
+
+
+# ==================== RUTAS ====================
+
+async def validar_campo_endpoint(data, consulta):
+    texto = data.get('texto', '').strip()
+    tipo = data.get('tipo', 'nombre')
+
+    if not texto:
+        return respuesta_campo_vacio(tipo), 200
+
+    resultado = validar_campo_directo(texto, tipo)
+    if resultado is None:
+        resultado = await ejecutor.enviar(validar_campo, texto, tipo)
+    return resultado, 200
+
+
+async def validar_formulario_endpoint(data, consulta):
+    textos = textos_formulario(data)
+    campos = None
+    if any(validar_campo_directo(texto, tipo) is None for tipo, texto in textos.items()):
+        campos = await ejecutor.enviar(validar_campos, textos)
+    return await con_cache(respuesta_validar_formulario, data, campos)
+
+
+async def generar_curp_endpoint(data, consulta):
+    return await con_cache(respuesta_generar_curp, data)
+
+
+async def validar_curp_endpoint(data, consulta):
+    return await con_cache(respuesta_validar_curp, data)
+
+
+async def estadisticas(data, consulta):
+    return await con_cache(respuesta_estadisticas), 200
+
+
+async def estadisticas_curps(data, consulta):
+    return await con_cache(respuesta_curps_cache, consulta.get('despues_de'), consulta.get('limite', 100))
+
+
+async def buscar_curps(data, consulta):
+    return await con_cache(respuesta_buscar_curps, consulta)
+
+
+async def limpiar_cache(data, consulta):
+    return await con_cache(respuesta_limpiar_cache), 200
+
+
+async def metricas_endpoint(data, consulta):
+    return TextoPlano(metricas.exportar_prometheus()), 200
+
+
+# ruta -> (método, manejador, espera cuerpo JSON)
+RUTAS = {
+    '/validar-campo': ('POST', validar_campo_endpoint, True),
+    '/validar-formulario': ('POST', validar_formulario_endpoint, True),
+    '/generar-curp': ('POST', generar_curp_endpoint, True),
+    '/validar-curp': ('POST', validar_curp_endpoint, True),
+    '/estadisticas': ('GET', estadisticas, False),
+    '/estadisticas/curps': ('GET', estadisticas_curps, False),
+    '/curps/buscar': ('GET', buscar_curps, False),
+    '/limpiar-cache': ('POST', limpiar_cache, False),
+    '/metricas': ('GET', metricas_endpoint, False),
+}
+
+
+# ==================== PROTOCOLO ASGI ====================
+
+async def _leer_cuerpo(receive):
+    partes = []
+    tamano = 0
+    while True:
+        mensaje = await receive()
+        if mensaje['type'] == 'http.disconnect':
+            return None
+        parte = mensaje.get('body', b'')
+        tamano += len(parte)
+        if tamano > MAX_CUERPO:
+            raise ValueError('Cuerpo demasiado grande')
+        partes.append(parte)
+        if not mensaje.get('more_body', False):
+            return b''.join(partes)
+
+
+async def _responder(send, codigo, cuerpo, encabezados=()):
+    if isinstance(cuerpo, TextoPlano):
+        datos, tipo = cuerpo.encode('utf-8'), b'text/plain; version=0.0.4'
+    else:
+        datos, tipo = json.dumps(cuerpo).encode('utf-8'), b'application/json'
+    await send({
+        'type': 'http.response.start',
+        'status': codigo,
+        'headers': [(b'content-type', tipo),
+                    (b'content-length', str(len(datos)).encode())] + list(encabezados),
+    })
+    await send({'type': 'http.response.body', 'body': datos})
+
+
+async def _atender(scope, receive):
+    """Resuelve la petición; retorna (cuerpo, código, encabezados extra)"""
+    ruta = RUTAS.get(scope['path'])
+    if ruta is None:
+        return {'success': False, 'error': 'Ruta no encontrada'}, 404, ()
+    metodo, manejador, con_cuerpo = ruta
+    if scope['method'] != metodo:
+        return {'success': False, 'error': 'Método no permitido'}, 405, [(b'allow', metodo.encode())]
+
+    data = None
+    if con_cuerpo:
+        try:
+            cuerpo = await _leer_cuerpo(receive)
+        except ValueError as e:
+            return {'success': False, 'error': str(e)}, 413, ()
+        try:
+            data = json.loads(cuerpo) if cuerpo else None
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return {'success': False, 'error': 'Se esperaba un objeto JSON'}, 400, ()
+
+    consulta = {clave: valores[-1] for clave, valores in
+                parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+    try:
+        cuerpo, codigo = await manejador(data, consulta)
+    except ServicioSaturado:
+        metricas.incrementar('curp_async_rechazos_total', ruta=scope['path'])
+        return ({'success': False, 'error': 'Servicio saturado, intenta de nuevo'}, 503,
+                [(b'retry-after', str(SEGUNDOS_REINTENTO).encode())])
+    except Exception:
+        return {'success': False, 'error': 'Error interno del servidor'}, 500, ()
+    return cuerpo, codigo, ()
+
+
+async def _ciclo_de_vida(receive, send):
+    while True:
+        mensaje = await receive()
+        if mensaje['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif mensaje['type'] == 'lifespan.shutdown':
+            ejecutor.cerrar()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def aplicacion(scope, receive, send):
+    """Aplicación ASGI 3"""
+    if scope['type'] == 'lifespan':
+        return await _ciclo_de_vida(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    inicio = time.perf_counter()
+    cuerpo, codigo, encabezados = await _atender(scope, receive)
+    await _responder(send, codigo, cuerpo, encabezados)
+
+    ruta = scope['path'] if scope['path'] in RUTAS else 'sin_ruta'
+    metricas.observar('curp_http_latencia_segundos', time.perf_counter() - inicio, ruta=ruta)
+    metricas.incrementar('curp_http_peticiones_total', ruta=ruta, metodo=scope['method'],
+                         codigo=codigo)
+    if codigo >= 400:
+        metricas.incrementar('curp_http_errores_total', ruta=ruta)
@@ -0,0 +1,100 @@
+"""
+Autocompletado por prefijo sobre los diccionarios plegados
+Cada nodo del trie guarda sus mejores k terminaciones ya ordenadas,
+así que una consulta solo recorre los caracteres del prefijo
+"""
+
+from itertools import islice
+
+import instantanea
+from diccionario_apellidos import INDICE_APELLIDOS
+from diccionario_nombres import INDICE_NOMBRES
+from normalizacion import plegar
+
+MAX_COMPLETADOS = 10
+
+# Con diccionarios en disco se ordena por peso solo este tramo del rango del prefijo
+LIMITE_RANGO_DISCO = 2000
+
+
+def peso_por_defecto(clave):
+    """
+    Peso de frecuencia cuando no hay conteos reales: las palabras simples
+    (las más usadas en el formulario) pesan más que las compuestas
+    """
+    return 2 if ' ' not in clave else 1
+
+
+class TrieAutocompletado:
+    """
+    Trie de claves plegadas con el top-k precalculado en cada nodo.
+
+    Args:
+        pesos (dict): clave -> peso de frecuencia (mayor = más arriba)
+        k (int): terminaciones guardadas por nodo
+    """
+
+    __slots__ = ('raiz', 'k')
+
+    def __init__(self, pesos, k=MAX_COMPLETADOS):
+        self.k = k
+        # nodo = [hijos {caracter: nodo}, mejores (tupla de claves)]
+        self.raiz = [{}, ()]
+        for clave in pesos:
+            nodo = self.raiz
+            for caracter in clave:
+                nodo = nodo[0].setdefault(caracter, [{}, ()])
+            nodo.append(clave)  # marca de fin de palabra
+        self._precalcular(self.raiz, pesos)
+
+    def _precalcular(self, raiz, pesos):
+        """Calcula el top-k de cada nodo en postorden, sin recursión"""
+        orden = lambda clave: (-pesos[clave], clave)
+        pila = [(raiz, False)]
+        while pila:
+            nodo, visitado = pila.pop()
+            if not visitado:
+                pila.append((nodo, True))
+                pila.extend((hijo, False) for hijo in nodo[0].values())
+                continue
+            candidatos = [clave for hijo in nodo[0].values() for clave in hijo[1]]
+            if len(nodo) > 2:
+                candidatos.append(nodo[2])
+            nodo[1] = tuple(sorted(candidatos, key=orden)[:self.k])
+
+    def completar(self, prefijo, k=MAX_COMPLETADOS):
+        """Hasta k claves que empiezan con el prefijo (ya plegado), de mayor a menor peso"""
+        nodo = self.raiz
+        for caracter in prefijo:
+            nodo = nodo[0].get(caracter)
+            if nodo is None:
+                return []
+        return list(nodo[1][:k])
+
+
+@instantanea.estructura('trie_nombres', INDICE_NOMBRES)
+def trie_nombres():
+    return TrieAutocompletado({clave: peso_por_defecto(clave) for clave in INDICE_NOMBRES})
+
+
+@instantanea.estructura('trie_apellidos', INDICE_APELLIDOS)
+def trie_apellidos():
+    return TrieAutocompletado({clave: peso_por_defecto(clave) for clave in INDICE_APELLIDOS})
+
+
+def autocompletar(texto, tipo='nombre', k=MAX_COMPLETADOS):
+    """Terminaciones (con su ortografía de presentación) para lo que el usuario lleva escrito"""
+    prefijo = plegar(texto)
+    if not prefijo:
+        return []
+    if texto[-1].isspace():
+        prefijo += ' '  # "JOSE " solo completa nombres compuestos
+    indice = INDICE_NOMBRES if tipo == 'nombre' else INDICE_APELLIDOS
+    if getattr(indice, 'en_disco', False):
+        # Archivo ordenado: el prefijo es un rango contiguo localizado por búsqueda binaria
+        rango = islice(indice.con_prefijo(prefijo), LIMITE_RANGO_DISCO)
+        claves = sorted(rango, key=lambda clave: (-peso_por_defecto(clave), clave))[:k]
+    else:
+        trie = trie_nombres() if tipo == 'nombre' else trie_apellidos()
+        claves = trie.completar(prefijo, k)
+    return [indice.mostrar(clave) for clave in claves]
@@ -0,0 +1,741 @@
+"""
+Suite de benchmarks reproducible para generación, validación y corrección ortográfica
+
+Uso:
+    python benchmark.py --salida actual.json
+    python benchmark.py --base actual.json --tolerancia 0.25   # falla si hay regresión
+    python benchmark.py --carga http://127.0.0.1:8000 --concurrencia 200   # servidor en marcha
+    python benchmark.py --arranque --workers 4   # arranque en frío y memoria por worker
+    python benchmark.py --escalamiento --n 100000   # validación por lotes con 1..N procesos
+    python benchmark.py --generar-lote --n 100000   # generar_lote contra un ciclo de generar
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+from diccionario_apellidos import APELLIDOS_MEXICANOS
+from diccionario_nombres import NOMBRES_MASCULINOS
+from generador_curp import GeneradorCURP
+
+ESTADOS = sorted(GeneradorCURP.ESTADOS)
+LETRAS_ERRATA = 'ABCDEFGHIJLMNOPRSTUVZ'
+CAMPOS_PERSONA = ('apellido_paterno', 'apellido_materno', 'nombre',
+                  'fecha_nacimiento', 'sexo', 'estado')
+
+# nombre -> función(corpus) que retorna (operación, entradas)
+ESCENARIOS = {}
+# nombre -> p99 objetivo en µs, reportado junto a la medida
+OBJETIVOS_P99_US = {}
+
+
+def escenario(nombre, objetivo_p99_us=None):
+    def registrar(funcion):
+        ESCENARIOS[nombre] = funcion
+        if objetivo_p99_us is not None:
+            OBJETIVOS_P99_US[nombre] = objetivo_p99_us
+        return funcion
+    return registrar
+
+
+# ==================== CORPUS SINTÉTICO ====================
+
+def aplicar_errata(palabra, rng):
+    """Introduce una errata: sustitución, inserción, eliminación o transposición"""
+    if len(palabra) < 3:
+        return palabra + rng.choice(LETRAS_ERRATA)
+    i = rng.randrange(1, len(palabra) - 1)
+    operacion = rng.randrange(4)
+    if operacion == 0:
+        return palabra[:i] + rng.choice(LETRAS_ERRATA) + palabra[i + 1:]
+    if operacion == 1:
+        return palabra[:i] + rng.choice(LETRAS_ERRATA) + palabra[i:]
+    if operacion == 2:
+        return palabra[:i] + palabra[i + 1:]
+    return palabra[:i - 1] + palabra[i] + palabra[i - 1] + palabra[i + 1:]
+
+
+def generar_corpus(n=2000, semilla=20240816, tasa_errores=0.3):
+    """Corpus determinista de personas, CURPs y campos con erratas controladas"""
+    rng = random.Random(semilla)
+    nombres = sorted(NOMBRES_MASCULINOS)
+    apellidos = sorted(APELLIDOS_MEXICANOS)
+    generador = GeneradorCURP()
+    inicio = date(1930, 1, 1)
+    personas = []
+    for _ in range(n):
+        nacimiento = inicio + timedelta(days=rng.randrange(365 * 90))
+        personas.append({
+            'apellido_paterno': rng.choice(apellidos).title(),
+            'apellido_materno': rng.choice(apellidos).title(),
+            'nombre': rng.choice(nombres).title(),
+            'fecha_nacimiento': nacimiento.strftime('%d/%m/%Y'),
+            'sexo': rng.choice('HM'),
+            'estado': rng.choice(ESTADOS),
+        })
+    campos = []
+    for persona in personas:
+        for campo, tipo in (('apellido_paterno', 'apellido_paterno'), ('nombre', 'nombre')):
+            texto = persona[campo]
+            if rng.random() < tasa_errores:
+                texto = aplicar_errata(texto, rng)
+            campos.append((texto, tipo))
+    return {
+        'personas': personas,
+        'curps': [generador.generar(p) for p in personas],
+        'campos': campos,
+        'aciertos': [(p['apellido_paterno'], 'apellido_paterno') for p in personas],
+        'fallos': [(aplicar_errata(p['apellido_paterno'].upper(), rng), 'apellido_paterno')
+                   for p in personas],
+    }
+
+
+# ==================== MEDICIÓN ====================
+
+def percentil(ordenados, q):
+    if not ordenados:
+        return 0.0
+    return ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))]
+
+
+def medir(operacion, entradas, calentamiento=50):
+    """Ejecuta operacion(entrada) para cada entrada y resume latencias y rendimiento"""
+    for entrada in entradas[:calentamiento]:
+        operacion(entrada)
+    latencias = []
+    reloj = time.perf_counter_ns
+    inicio = reloj()
+    for entrada in entradas:
+        t = reloj()
+        operacion(entrada)
+        latencias.append(reloj() - t)
+    total = (reloj() - inicio) / 1e9
+    latencias.sort()
+    return {
+        'operaciones': len(entradas),
+        'segundos': round(total, 6),
+        'ops_por_segundo': round(len(entradas) / total, 2) if total else 0.0,
+        'p50_us': round(percentil(latencias, 0.50) / 1000, 3),
+        'p95_us': round(percentil(latencias, 0.95) / 1000, 3),
+        'p99_us': round(percentil(latencias, 0.99) / 1000, 3),
+    }
+
+
+def medir_asignaciones(operacion, entradas, muestras=500):
+    """Pico promedio de memoria asignada (bytes) durante una operación"""
+    entradas = entradas[:muestras]
+    for entrada in entradas[:10]:
+        operacion(entrada)
+    total = 0
+    tracemalloc.start()
+    try:
+        for entrada in entradas:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            operacion(entrada)
+            total += tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return round(total / len(entradas), 1) if entradas else 0.0
+
+
+# ==================== ESCENARIOS ====================
+
+@escenario('generar')
+def _generar(corpus):
+    return GeneradorCURP().generar, corpus['personas']
+
+
+def _columnas(personas):
+    return [[p[campo] for p in personas] for campo in CAMPOS_PERSONA]
+
+
+@escenario('generar_lote')
+def _generar_lote(corpus):
+    generador = GeneradorCURP()
+    columnas = _columnas(corpus['personas'])
+    return lambda _: generador.generar_lote(*columnas), [None] * 5
+
+
+@escenario('validar_sintaxis')
+def _validar_sintaxis(corpus):
+    return GeneradorCURP().validar_sintaxis, corpus['curps']
+
+
+@escenario('diccionario.es_nombre_valido')
+def _es_nombre_valido(corpus):
+    from diccionario_nombres import es_nombre_valido
+    return es_nombre_valido, [p['nombre'] for p in corpus['personas']]
+
+
+@escenario('diccionario.es_apellido_valido')
+def _es_apellido_valido(corpus):
+    from diccionario_apellidos import es_apellido_valido
+    return es_apellido_valido, [p['apellido_paterno'] for p in corpus['personas']]
+
+
+@escenario('validar_campo.acierto')
+def _validar_campo_acierto(corpus):
+    from validador_ortografico import validar_campo
+    return lambda campo: validar_campo(*campo), corpus['aciertos']
+
+
+@escenario('validar_campo.fallo')
+def _validar_campo_fallo(corpus):
+    from validador_ortografico import validar_campo
+    return lambda campo: validar_campo(*campo), corpus['fallos']
+
+
+@escenario('validar_campo.mixto')
+def _validar_campo_mixto(corpus):
+    from validador_ortografico import validar_campo
+    return lambda campo: validar_campo(*campo), corpus['campos']
+
+
+def _tecleos(corpus):
+    """(texto, tipo) de cada prefijo creciente de los nombres y apellidos, como al teclear"""
+    tecleos = []
+    for persona in corpus['personas']:
+        for campo, tipo in (('nombre', 'nombre'), ('apellido_paterno', 'apellido')):
+            texto = persona[campo]
+            tecleos.extend((texto[:i], tipo) for i in range(1, len(texto) + 1))
+    return tecleos
+
+
+# Objetivo: menos de 1 ms por tecla
+@escenario('autocompletar', objetivo_p99_us=1000)
+def _autocompletar(corpus):
+    from autocompletado import autocompletar
+    return lambda tecleo: autocompletar(*tecleo), _tecleos(corpus)
+
+
+def _cliente():
+    from app import app
+    return app.test_client()
+
+
+@escenario('http.validar_campo')
+def _http_validar_campo(corpus):
+    cliente = _cliente()
+    return (lambda campo: cliente.post('/validar-campo', json={'texto': campo[0], 'tipo': campo[1]}),
+            corpus['campos'])
+
+
+@escenario('http.generar_curp')
+def _http_generar_curp(corpus):
+    cliente = _cliente()
+    return lambda persona: cliente.post('/generar-curp', json=persona), corpus['personas']
+
+
+@escenario('http.validar_formulario')
+def _http_validar_formulario(corpus):
+    cliente = _cliente()
+    return lambda persona: cliente.post('/validar-formulario', json=persona), corpus['personas']
+
+
+@escenario('http.validar_curp')
+def _http_validar_curp(corpus):
+    cliente = _cliente()
+    return lambda curp: cliente.post('/validar-curp', json={'curp': curp}), corpus['curps']
+
+
+@escenario('http.autocompletar', objetivo_p99_us=1000)
+def _http_autocompletar(corpus):
+    cliente = _cliente()
+    return (lambda tecleo: cliente.get('/autocompletar', query_string={'q': tecleo[0], 'tipo': tecleo[1]}),
+            _tecleos(corpus))
+
+
+@escenario('http.estadisticas')
+def _http_estadisticas(corpus):
+    cliente = _cliente()
+    return lambda _: cliente.get('/estadisticas'), corpus['curps'][:200]
+
+
+@escenario('http.generar_curp_lote')
+def _http_generar_curp_lote(corpus):
+    cliente = _cliente()
+    cuerpo = ''.join(json.dumps(p, ensure_ascii=False) + '\n' for p in corpus['personas']).encode()
+    return (lambda _: cliente.post('/generar-curp/lote', data=cuerpo,
+                                   content_type='application/x-ndjson').get_data(),
+            [None] * 5)
+
+
+@escenario('http.validar_curp_lote')
+def _http_validar_curp_lote(corpus):
+    cliente = _cliente()
+    cuerpo = '\n'.join(corpus['curps']).encode()
+    return (lambda _: cliente.post('/validar-curp/lote', data=cuerpo,
+                                   content_type='text/plain').get_data(),
+            [None] * 5)
+
+
+# ==================== PRUEBA DE ESTRÉS CONCURRENTE ====================
+
+def prueba_estres(peticiones=4000, hilos=32, semilla=20240816):
+    """
+    Lanza peticiones concurrentes contra la app y verifica que los totales
+    sean exactos: contador de validaciones, consultas a la cache y CURPs
+    generadas (comparadas contra una ejecución secuencial del generador).
+    """
+    from app import app, contadores, curps_cache
+    corpus = generar_corpus(peticiones // 2, semilla, 0)
+    esperadas = corpus['curps']
+    validaciones_antes = contadores.valor('validaciones')
+    cache_antes = curps_cache.metricas()
+
+    def generar(persona):
+        respuesta = app.test_client().post('/generar-curp', json=persona).get_json()
+        return respuesta.get('curp')
+
+    def validar(curp):
+        return app.test_client().post('/validar-curp', json={'curp': curp}).get_json()
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+        generadas = list(ejecutor.map(generar, corpus['personas']))
+        validadas = list(ejecutor.map(validar, esperadas))
+    segundos = time.perf_counter() - inicio
+
+    no_cacheadas = sum(1 for v in validadas if v.get('success') and not v.get('cached'))
+    cache_despues = curps_cache.metricas()
+    consultas_cache = (cache_despues['aciertos'] + cache_despues['fallos'] -
+                       cache_antes['aciertos'] - cache_antes['fallos'])
+    comprobaciones = {
+        'curps_identicas': generadas == esperadas,
+        'validaciones_exactas': contadores.valor('validaciones') - validaciones_antes ==
+                                len(generadas) + no_cacheadas,
+        'consultas_cache_exactas': consultas_cache == len(validadas),
+    }
+    print(f"  {len(generadas) + len(validadas)} peticiones con {hilos} hilos en {segundos:.2f} s")
+    for nombre, correcto in comprobaciones.items():
+        print(f"  {'✓' if correcto else '❌'} {nombre}")
+    return all(comprobaciones.values())
+
+
+# ==================== PRUEBA DE CARGA HTTP ====================
+
+async def _peticion(lector, escritor, anfitrion, ruta, cuerpo):
+    """POST HTTP/1.1 con conexión persistente; retorna el código de estado"""
+    escritor.write(f'POST {ruta} HTTP/1.1\r\nHost: {anfitrion}\r\n'
+                   f'Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n\r\n'
+                   .encode() + cuerpo)
+    await escritor.drain()
+    codigo = int((await lector.readline()).split()[1])
+    longitud = 0
+    while (linea := await lector.readline()) not in (b'\r\n', b''):
+        nombre, _, valor = linea.decode('latin-1').partition(':')
+        if nombre.lower() == 'content-length':
+            longitud = int(valor)
+    await lector.readexactly(longitud)
+    return codigo
+
+
+async def _carga(url, cuerpos, concurrencia):
+    partes = urlsplit(url)
+    anfitrion, puerto = partes.hostname, partes.port or 80
+    pendientes = iter(cuerpos)
+    latencias, codigos = [], {}
+
+    async def cliente():
+        lector, escritor = await asyncio.open_connection(anfitrion, puerto)
+        try:
+            for cuerpo in pendientes:
+                t = time.perf_counter_ns()
+                codigo = await _peticion(lector, escritor, anfitrion, partes.path or '/', cuerpo)
+                latencias.append(time.perf_counter_ns() - t)
+                codigos[codigo] = codigos.get(codigo, 0) + 1
+        finally:
+            escritor.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(concurrencia)))
+    return time.perf_counter() - inicio, sorted(latencias), codigos
+
+
+def prueba_carga(url, peticiones=5000, concurrencia=200, semilla=20240816, tasa_errores=0.3):
+    """
+    Ráfaga de /validar-campo (como los blur del formulario) contra un servidor
+    en marcha; sirve para comparar app.py y app_async.py con la misma carga
+    """
+    if not urlsplit(url).path.strip('/'):
+        url = url.rstrip('/') + '/validar-campo'
+    corpus = generar_corpus(peticiones // 2 + 1, semilla, tasa_errores)
+    cuerpos = [json.dumps({'texto': texto, 'tipo': tipo}).encode()
+               for texto, tipo in corpus['campos'][:peticiones]]
+    segundos, latencias, codigos = asyncio.run(_carga(url, cuerpos, concurrencia))
+    resultado = {
+        'peticiones': len(latencias),
+        'segundos': round(segundos, 3),
+        'peticiones_por_segundo': round(len(latencias) / segundos, 1),
+        'p50_ms': round(percentil(latencias, 0.50) / 1e6, 2),
+        'p99_ms': round(percentil(latencias, 0.99) / 1e6, 2),
+        'codigos': {str(codigo): cuenta for codigo, cuenta in sorted(codigos.items())},
+    }
+    print(f"  {url} con {concurrencia} conexiones: {resultado['peticiones_por_segundo']:.1f} pet/s"
+          f"   p50 {resultado['p50_ms']:.2f} ms   p99 {resultado['p99_ms']:.2f} ms"
+          f"   códigos {resultado['codigos']}")
+    return resultado
+
+
+# ==================== ARRANQUE Y MEMORIA POR WORKER ====================
+
+_MEDIR_IMPORTACION = """
+import json, resource, time
+inicio = time.perf_counter()
+import app
+print(json.dumps({'segundos': time.perf_counter() - inicio,
+                  'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def _memoria_proceso(pid):
+    """RSS y PSS en MB (PSS reparte las páginas compartidas entre quienes las usan)"""
+    valores = {}
+    with open(f'/proc/{pid}/smaps_rollup') as archivo:
+        for linea in archivo:
+            nombre, _, resto = linea.partition(':')
+            if nombre in ('Rss', 'Pss'):
+                valores[nombre.lower() + '_mb'] = int(resto.split()[0]) / 1024
+    return valores
+
+
+def _hijos(pid):
+    hijos = []
+    for entrada in os.listdir('/proc'):
+        if entrada.isdigit():
+            try:
+                with open(f'/proc/{entrada}/stat') as archivo:
+                    campos = archivo.read().rsplit(')', 1)[1].split()
+            except OSError:
+                continue
+            if int(campos[1]) == pid:
+                hijos.append(int(entrada))
+    return hijos
+
+
+def _puerto_libre():
+    with socket.socket() as conexion:
+        conexion.bind(('127.0.0.1', 0))
+        return conexion.getsockname()[1]
+
+
+def _memoria_workers(workers, preload, entorno, espera=30):
+    """Arranca gunicorn, hace una petición por worker y promedia su memoria"""
+    puerto = _puerto_libre()
+    entorno = dict(entorno, CURP_WORKERS=str(workers), CURP_PRELOAD='1' if preload else '0',
+                   CURP_BIND=f'127.0.0.1:{puerto}')
+    maestro = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'app:app', '--log-level', 'warning'],
+                               env=entorno)
+    try:
+        limite = time.monotonic() + espera
+        while len(_hijos(maestro.pid)) < workers or not _responde(puerto):
+            if time.monotonic() > limite or maestro.poll() is not None:
+                raise RuntimeError('gunicorn no arrancó')
+            time.sleep(0.1)
+        for _ in range(4 * workers):
+            _responde(puerto, '/validar-campo', {'texto': 'Jose Lui', 'tipo': 'nombre'})
+        medidas = [_memoria_proceso(pid) for pid in _hijos(maestro.pid)]
+        return {clave: round(sum(m[clave] for m in medidas) / len(medidas), 1)
+                for clave in ('rss_mb', 'pss_mb')}
+    finally:
+        maestro.send_signal(signal.SIGTERM)
+        maestro.wait()
+
+
+def _responde(puerto, ruta='/estadisticas', cuerpo=None):
+    from http.client import HTTPConnection
+    try:
+        conexion = HTTPConnection('127.0.0.1', puerto, timeout=5)
+        if cuerpo is None:
+            conexion.request('GET', ruta)
+        else:
+            conexion.request('POST', ruta, json.dumps(cuerpo), {'Content-Type': 'application/json'})
+        return conexion.getresponse().status == 200
+    except OSError:
+        return False
+
+
+def prueba_arranque(workers=4):
+    """
+    Arranque en frío de un worker (importar app) sin instantánea y con ella,
+    el tiempo de construirla; y memoria promedio por worker de gunicorn
+    cargando la aplicación en cada worker o una vez en el maestro
+    """
+    directorio = tempfile.mkdtemp()
+    ruta = os.path.join(directorio, 'instantanea.pickle')
+    base = dict(os.environ, CURP_CACHE_BACKEND='local')
+    resultado = {'arranque': {}, 'workers': {}}
+    for nombre, entorno in (('sin_instantanea', dict(base, CURP_INSTANTANEA='')),
+                            ('con_instantanea', dict(base, CURP_INSTANTANEA=ruta))):
+        if nombre == 'con_instantanea':
+            inicio = time.perf_counter()
+            subprocess.run([sys.executable, 'instantanea.py', 'construir', ruta], env=base,
+                           cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, check=True)
+            segundos = time.perf_counter() - inicio
+            resultado['arranque']['construir_instantanea'] = {'segundos': round(segundos, 3)}
+            print(f"  {'construir instantánea':<35} {segundos:>7.3f} s")
+        salida = subprocess.run([sys.executable, '-c', _MEDIR_IMPORTACION], env=entorno,
+                                capture_output=True, text=True, check=True).stdout
+        medida = json.loads(salida.strip().splitlines()[-1])
+        resultado['arranque'][nombre] = {clave: round(valor, 3) for clave, valor in medida.items()}
+        print(f"  arranque {nombre:<26} {medida['segundos']:>7.3f} s   RSS {medida['rss_mb']:>6.1f} MB")
+    for preload in (False, True):
+        nombre = 'preload' if preload else 'sin_preload'
+        medida = _memoria_workers(workers, preload, dict(base, CURP_INSTANTANEA=ruta))
+        resultado['workers'][nombre] = medida
+        print(f"  {workers} workers {nombre:<24} RSS {medida['rss_mb']:>6.1f} MB"
+              f"   PSS {medida['pss_mb']:>6.1f} MB por worker")
+    return resultado
+
+
+# ==================== ESCALAMIENTO DE LA VALIDACIÓN POR LOTES ====================
+
+def prueba_escalamiento(filas=100000, semilla=20240816, maximo=None):
+    """
+    Filas por segundo de validar_en_orden con 1, 2, 4... procesos hasta
+    `maximo` (por omisión, núcleos disponibles), la aceleración contra un
+    proceso y el tiempo de CPU por fila que gasta el proceso principal, que
+    es la parte serial que limita la aceleración
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from validacion_lote import validar_en_orden
+
+    corpus = generar_corpus(min(filas, 20000), semilla, 0.3)
+    curps = (corpus['curps'] * (filas // len(corpus['curps']) + 1))[:filas]
+    maximo = maximo or os.cpu_count() or 1
+    cantidades = sorted({1, maximo} | {2 ** i for i in range(maximo.bit_length()) if 2 ** i <= maximo})
+    resultado = {}
+    base = None
+    for procesos in cantidades:
+        ejecutor = ProcessPoolExecutor(max_workers=procesos) if procesos > 1 else None
+        try:
+            if ejecutor is not None:
+                list(ejecutor.map(abs, range(procesos)))  # arrancar los procesos fuera de la medida
+            inicio, cpu = time.perf_counter(), time.process_time()
+            for _ in validar_en_orden(curps, ejecutor, en_vuelo=2 * procesos):
+                pass
+            segundos, cpu = time.perf_counter() - inicio, time.process_time() - cpu
+        finally:
+            if ejecutor is not None:
+                ejecutor.shutdown()
+        base = base or segundos
+        resultado[procesos] = {
+            'filas_por_segundo': round(filas / segundos, 1),
+            'aceleracion': round(base / segundos, 2),
+            'us_principal_por_fila': round(cpu / filas * 1e6, 2),
+        }
+        print(f"  {procesos:>3} procesos {resultado[procesos]['filas_por_segundo']:>12,.0f} filas/s"
+              f"   x{resultado[procesos]['aceleracion']:<6}"
+              f"   principal {resultado[procesos]['us_principal_por_fila']:>6.2f} µs/fila")
+    return resultado
+
+
+# ==================== GENERACIÓN COLUMNAR ====================
+
+def _sufijo(i):
+    """Sufijo de letras distinto para cada i, para volver únicos los nombres"""
+    letras = ''
+    while True:
+        i, resto = divmod(i, len(LETRAS_ERRATA))
+        letras += LETRAS_ERRATA[resto]
+        if not i:
+            return letras.lower()
+
+
+def prueba_generar_lote(filas=100000, semilla=20240816, distintas=200):
+    """
+    generar_lote contra un ciclo de generar() sobre las mismas filas, con datos
+    únicos (cada fila sorteada: fechas casi todas distintas, nombres y
+    apellidos del diccionario), con nombres y apellidos todos distintos (el
+    peor caso: ninguna producción se reutiliza) y con datos repetidos
+    (`distintas` personas que se repiten). Verifica que las CURPs sean
+    idénticas; la aceleración depende de cuántos valores distintos tiene cada
+    columna.
+    """
+    generador = GeneradorCURP()
+    unicas = generar_corpus(filas, semilla, 0)['personas']
+    conjuntos = {
+        'unicos': unicas,
+        'todo_distinto': [dict(p, **{campo: p[campo] + _sufijo(i) for campo in CAMPOS_PERSONA[:3]})
+                          for i, p in enumerate(unicas)],
+        'repetidos': (unicas[:distintas] * (filas // distintas + 1))[:filas],
+    }
+    resultado = {}
+    for nombre, personas in conjuntos.items():
+        inicio = time.perf_counter()
+        esperadas = [generador.generar(persona) for persona in personas]
+        ciclo = time.perf_counter() - inicio
+        columnas = _columnas(personas)
+        inicio = time.perf_counter()
+        curps = generador.generar_lote(*columnas)
+        lote = time.perf_counter() - inicio
+        identicas = list(curps) == esperadas
+        resultado[nombre] = {
+            'filas': filas,
+            'filas_por_segundo_generar': round(filas / ciclo, 1),
+            'filas_por_segundo_lote': round(filas / lote, 1),
+            'aceleracion': round(ciclo / lote, 2),
+            'identicas': identicas,
+        }
+        print(f"  {'✓' if identicas else '✗'} {nombre:<13} generar {filas / ciclo:>12,.0f} filas/s"
+              f"   generar_lote {filas / lote:>12,.0f} filas/s   x{ciclo / lote:.1f}")
+    return resultado
+
+
+# ==================== EJECUCIÓN Y COMPARACIÓN ====================
+
+def ejecutar(nombres, n, semilla, tasa_errores, asignaciones=False):
+    corpus = generar_corpus(n, semilla, tasa_errores)
+    resultados = {}
+    for nombre in nombres:
+        operacion, entradas = ESCENARIOS[nombre](corpus)
+        resultados[nombre] = medir(operacion, entradas)
+        linea = (f"  {nombre:<32} {resultados[nombre]['ops_por_segundo']:>12.1f} ops/s"
+                 f"   p50 {resultados[nombre]['p50_us']:>9.1f} µs"
+                 f"   p99 {resultados[nombre]['p99_us']:>9.1f} µs")
+        if asignaciones:
+            resultados[nombre]['bytes_por_op'] = medir_asignaciones(operacion, entradas)
+            linea += f"   {resultados[nombre]['bytes_por_op']:>9.0f} B/op"
+        objetivo = OBJETIVOS_P99_US.get(nombre)
+        if objetivo is not None:
+            resultados[nombre]['objetivo_p99_us'] = objetivo
+            cumple = resultados[nombre]['p99_us'] < objetivo
+            linea += f"   {'✓' if cumple else '✗'} p99 < {objetivo:,} µs"
+        print(linea)
+    return {
+        'parametros': {'n': n, 'semilla': semilla, 'tasa_errores': tasa_errores},
+        'entorno': {'python': platform.python_version(), 'plataforma': platform.platform()},
+        'resultados': resultados,
+    }
+
+
+def comparar(actual, base, tolerancia):
+    """Lista de regresiones: rendimiento por debajo de base * (1 - tolerancia)"""
+    regresiones = []
+    for nombre, medida in actual['resultados'].items():
+        anterior = base.get('resultados', {}).get(nombre)
+        if not anterior or not anterior.get('ops_por_segundo'):
+            continue
+        cambio = medida['ops_por_segundo'] / anterior['ops_por_segundo'] - 1
+        estado = '❌' if cambio < -tolerancia else '✓'
+        print(f"  {estado} {nombre:<32} {cambio:+.1%}")
+        if cambio < -tolerancia:
+            regresiones.append(nombre)
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=2000, help='personas en el corpus')
+    parser.add_argument('--semilla', type=int, default=20240816)
+    parser.add_argument('--tasa-errores', type=float, default=0.3)
+    parser.add_argument('--escenarios', nargs='*', choices=sorted(ESCENARIOS), default=None)
+    parser.add_argument('--asignaciones', action='store_true',
+                        help='mide también la memoria asignada por operación (tracemalloc)')
+    parser.add_argument('--estres', action='store_true',
+                        help='ejecuta solo la prueba de estrés concurrente')
+    parser.add_argument('--hilos', type=int, default=32)
+    parser.add_argument('--carga', metavar='URL',
+                        help='ejecuta solo la prueba de carga HTTP contra un servidor en marcha')
+    parser.add_argument('--concurrencia', type=int, default=200)
+    parser.add_argument('--arranque', action='store_true',
+                        help='mide solo el arranque en frío y la memoria por worker de gunicorn')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--escalamiento', action='store_true',
+                        help='mide solo la validación por lotes con distintos números de procesos')
+    parser.add_argument('--procesos', type=int, default=None,
+                        help='máximo de procesos en --escalamiento (por omisión, núcleos disponibles)')
+    parser.add_argument('--generar-lote', action='store_true',
+                        help='compara solo generar_lote contra un ciclo de generar con datos únicos y repetidos')
+    parser.add_argument('--salida', help='archivo JSON donde guardar los resultados')
+    parser.add_argument('--base', help='resultados JSON anteriores para comparar')
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help='caída máxima de rendimiento permitida (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    if args.estres:
+        print("=" * 70)
+        print("PRUEBA DE ESTRÉS CONCURRENTE")
+        print("=" * 70)
+        return 0 if prueba_estres(args.n, args.hilos, args.semilla) else 1
+
+    if args.carga:
+        print("=" * 70)
+        print("PRUEBA DE CARGA HTTP")
+        print("=" * 70)
+        resultado = prueba_carga(args.carga, args.n, args.concurrencia, args.semilla,
+                                 args.tasa_errores)
+        if args.salida:
+            with open(args.salida, 'w', encoding='utf-8') as archivo:
+                json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+        return 0
+
+    if args.arranque:
+        print("=" * 70)
+        print("ARRANQUE Y MEMORIA POR WORKER")
+        print("=" * 70)
+        resultado = prueba_arranque(args.workers)
+        if args.salida:
+            with open(args.salida, 'w', encoding='utf-8') as archivo:
+                json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+        return 0
+
+    if args.escalamiento:
+        print("=" * 70)
+        print("ESCALAMIENTO DE LA VALIDACIÓN POR LOTES")
+        print("=" * 70)
+        resultado = prueba_escalamiento(args.n, args.semilla, args.procesos)
+        if args.salida:
+            with open(args.salida, 'w', encoding='utf-8') as archivo:
+                json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+        return 0
+
+    if args.generar_lote:
+        print("=" * 70)
+        print("GENERACIÓN COLUMNAR")
+        print("=" * 70)
+        resultado = prueba_generar_lote(args.n, args.semilla)
+        if args.salida:
+            with open(args.salida, 'w', encoding='utf-8') as archivo:
+                json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+        return 0 if all(medida['identicas'] for medida in resultado.values()) else 1
+
+    print("=" * 70)
+    print("BENCHMARKS CURP")
+    print("=" * 70)
+    actual = ejecutar(args.escenarios or list(ESCENARIOS), args.n, args.semilla, args.tasa_errores,
+                      args.asignaciones)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(actual, archivo, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.salida}")
+
+    if args.base:
+        with open(args.base, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+        print(f"\nComparación contra {args.base} (tolerancia {args.tolerancia:.0%}):")
+        regresiones = comparar(actual, base, args.tolerancia)
+        if regresiones:
+            print(f"\n❌ Regresiones: {', '.join(regresiones)}")
+            return 1
+        print("\n✅ Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
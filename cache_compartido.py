@@ -0,0 +1,453 @@
+"""
+Cache y contadores compartidos entre procesos mediante un archivo SQLite (WAL)
+Todos los workers de gunicorn de un mismo nodo ven las mismas CURPs y totales
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from itertools import groupby
+
+from cache_curp import estimar_bytes
+from indice_cache import fecha_curp, estado_curp
+from indice_homonimos import raiz_curp
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    expira REAL,
+    acceso REAL NOT NULL,
+    estado TEXT,
+    fecha TEXT
+);
+CREATE INDEX IF NOT EXISTS cache_acceso ON cache (acceso);
+CREATE TABLE IF NOT EXISTS contadores (
+    nombre TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS homonimos (
+    orden INTEGER PRIMARY KEY,
+    raiz TEXT NOT NULL,
+    referencia TEXT NOT NULL,
+    curp TEXT NOT NULL,
+    UNIQUE (raiz, referencia)
+);
+"""
+
+# Índices secundarios para buscar por estado y fecha de nacimiento (el prefijo
+# usa la clave primaria o, con estado, el índice (estado, clave)); se crean
+# después de migrar archivos de versiones anteriores, cuya tabla no tenía las
+# columnas estado y fecha
+INDICES = """
+CREATE INDEX IF NOT EXISTS cache_estado_fecha ON cache (estado, fecha, clave);
+CREATE INDEX IF NOT EXISTS cache_fecha ON cache (fecha, clave);
+CREATE INDEX IF NOT EXISTS cache_estado_clave ON cache (estado, clave);
+"""
+
+# Claves por consulta en obtener_varios (SQLite admite al menos 999 parámetros)
+LOTE_CONSULTA = 500
+
+
+class _ConexionSQLite:
+    """Una conexión por hilo y por proceso (las conexiones no sobreviven a fork)"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._local = threading.local()
+        self._inicializar()
+
+    def _inicializar(self):
+        conexion = sqlite3.connect(self.ruta, timeout=30, isolation_level=None)
+        conexion.execute('PRAGMA journal_mode=WAL')
+        conexion.executescript(ESQUEMA)
+        columnas = {fila[1] for fila in conexion.execute('PRAGMA table_info(cache)')}
+        if 'fecha' not in columnas:
+            with conexion:
+                conexion.execute('BEGIN IMMEDIATE')
+                conexion.execute('ALTER TABLE cache ADD COLUMN estado TEXT')
+                conexion.execute('ALTER TABLE cache ADD COLUMN fecha TEXT')
+                conexion.executemany(
+                    'UPDATE cache SET estado = ?, fecha = ? WHERE clave = ?',
+                    [(estado_curp(clave), fecha_curp(clave), clave)
+                     for (clave,) in conexion.execute('SELECT clave FROM cache').fetchall()]
+                )
+        conexion.executescript(INDICES)
+        conexion.close()
+
+    def obtener(self):
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None or self._local.pid != os.getpid():
+            conexion = sqlite3.connect(self.ruta, timeout=30, isolation_level=None)
+            conexion.execute('PRAGMA synchronous=NORMAL')
+            self._local.conexion = conexion
+            self._local.pid = os.getpid()
+        return conexion
+
+
+def _incrementar(conexion, nombre, cantidad):
+    fila = conexion.execute(
+        'INSERT INTO contadores (nombre, valor) VALUES (?, ?) '
+        'ON CONFLICT (nombre) DO UPDATE SET valor = valor + excluded.valor RETURNING valor',
+        (nombre, cantidad)
+    ).fetchone()
+    return fila[0]
+
+
+class ContadoresSQLite:
+    """Contadores con nombre e incrementos atómicos visibles para todos los procesos"""
+
+    def __init__(self, ruta):
+        self._conexion = _ConexionSQLite(ruta)
+
+    def incrementar(self, nombre, cantidad=1):
+        """Suma cantidad al contador y retorna su nuevo valor"""
+        return _incrementar(self._conexion.obtener(), nombre, cantidad)
+
+    def incrementar_varios(self, cantidades):
+        """Suma {nombre: cantidad} en una sola transacción"""
+        conexion = self._conexion.obtener()
+        with conexion:
+            conexion.execute('BEGIN IMMEDIATE')
+            for nombre, cantidad in cantidades.items():
+                _incrementar(conexion, nombre, cantidad)
+
+    def valor(self, nombre):
+        fila = self._conexion.obtener().execute(
+            'SELECT valor FROM contadores WHERE nombre = ?', (nombre,)
+        ).fetchone()
+        return fila[0] if fila else 0
+
+    def con_prefijo(self, prefijo):
+        """{nombre sin el prefijo: valor} de los contadores que empiezan con prefijo"""
+        filas = self._conexion.obtener().execute(
+            'SELECT nombre, valor FROM contadores WHERE nombre >= ? AND nombre < ?',
+            (prefijo, prefijo + '\uffff')
+        ).fetchall()
+        return {nombre[len(prefijo):]: valor for nombre, valor in filas}
+
+
+class IndiceHomonimosSQLite:
+    """
+    IndiceHomonimos compartido por todos los procesos, con la misma interfaz.
+    El orden de llegada es la clave primaria y el total de registros un
+    contador, así que descartar los más antiguos no recorre la tabla.
+    """
+
+    def __init__(self, ruta, max_registros=None):
+        self.max_registros = max_registros
+        self._conexion = _ConexionSQLite(ruta)
+
+    def __len__(self):
+        fila = self._conexion.obtener().execute(
+            "SELECT valor FROM contadores WHERE nombre = 'homonimos.registros'"
+        ).fetchone()
+        return fila[0] if fila else 0
+
+    def agregar(self, curp, referencia=None):
+        raiz = raiz_curp(curp)
+        referencia = curp if referencia is None else referencia
+        conexion = self._conexion.obtener()
+        with conexion:
+            conexion.execute('BEGIN IMMEDIATE')
+            anterior = conexion.execute(
+                'DELETE FROM homonimos WHERE raiz = ? AND referencia = ? RETURNING orden',
+                (raiz, referencia)
+            ).fetchone()
+            conexion.execute('INSERT INTO homonimos (raiz, referencia, curp) VALUES (?, ?, ?)',
+                             (raiz, referencia, curp))
+            registros = _incrementar(conexion, 'homonimos.registros', anterior is None)
+            if self.max_registros is not None and registros > self.max_registros:
+                sobrantes = conexion.execute(
+                    'DELETE FROM homonimos WHERE orden IN '
+                    '(SELECT orden FROM homonimos ORDER BY orden LIMIT ?)',
+                    (registros - self.max_registros,)
+                ).rowcount
+                _incrementar(conexion, 'homonimos.registros', -sobrantes)
+
+    def cantidad(self, raiz):
+        """Cuántos registros comparten la raíz (acepta también una CURP completa)"""
+        return self._conexion.obtener().execute(
+            'SELECT COUNT(*) FROM homonimos WHERE raiz = ?', (raiz_curp(raiz),)
+        ).fetchone()[0]
+
+    def consultar(self, raiz):
+        """[(referencia, curp)] de los registros que comparten la raíz"""
+        return self._conexion.obtener().execute(
+            'SELECT referencia, curp FROM homonimos WHERE raiz = ? ORDER BY orden', (raiz_curp(raiz),)
+        ).fetchall()
+
+    def colisiones(self, minimo=2, limite=None):
+        """Hasta `limite` raíces con al menos `minimo` registros, en orden alfabético"""
+        filas = self._conexion.obtener().execute(
+            'SELECT raiz, referencia, curp FROM homonimos WHERE raiz IN '
+            '(SELECT raiz FROM homonimos GROUP BY raiz HAVING COUNT(*) >= ? ORDER BY raiz LIMIT ?) '
+            'ORDER BY raiz, orden',
+            (minimo, -1 if limite is None else limite)
+        ).fetchall()
+        return {raiz: [(referencia, curp) for _, referencia, curp in grupo]
+                for raiz, grupo in groupby(filas, key=lambda fila: fila[0])}
+
+    def limpiar(self):
+        conexion = self._conexion.obtener()
+        with conexion:
+            conexion.execute('BEGIN IMMEDIATE')
+            cantidad = conexion.execute('DELETE FROM homonimos').rowcount
+            conexion.execute("UPDATE contadores SET valor = 0 WHERE nombre = 'homonimos.registros'")
+        return cantidad
+
+
+class CacheSQLite:
+    """
+    Cache LRU/TTL compartida con la misma interfaz que CacheCURP.
+
+    Las escrituras de la cache y el total de entradas/bytes se aplican en una
+    transacción; las actualizaciones de recencia y las métricas de
+    aciertos/fallos se acumulan en memoria y se escriben por lotes cada
+    `lote` operaciones o `intervalo` segundos, antes de elegir a quién
+    desalojar y al terminar el proceso.
+    """
+
+    def __init__(self, ruta, max_entradas=10000, max_bytes=None, ttl=None, lote=64, intervalo=1.0):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lote = lote
+        self.intervalo = intervalo
+        self._conexion = _ConexionSQLite(ruta)
+        self._lock = threading.Lock()
+        self._accesos = {}
+        self._metricas = {}
+        self._ultima_escritura = time.monotonic()
+        # Lo acumulado al terminar el proceso no debe perderse (gunicorn además
+        # lo escribe en su gancho worker_exit, ver gunicorn.conf.py)
+        atexit.register(self.escribir_pendientes)
+
+    # ---------- escritura por lotes ----------
+
+    def _anotar(self, metrica, clave=None):
+        self._anotar_varios({metrica: 1}, () if clave is None else (clave,))
+
+    def _anotar_varios(self, cantidades, claves=()):
+        with self._lock:
+            for metrica, cantidad in cantidades.items():
+                if cantidad:
+                    self._metricas[metrica] = self._metricas.get(metrica, 0) + cantidad
+            ahora = time.time()
+            for clave in claves:
+                self._accesos[clave] = ahora
+            pendientes = len(self._accesos) + sum(self._metricas.values())
+            vencido = time.monotonic() - self._ultima_escritura >= self.intervalo
+        if pendientes >= self.lote or vencido:
+            self.escribir_pendientes()
+
+    def escribir_pendientes(self):
+        """Aplica en una sola transacción los accesos y métricas acumulados"""
+        accesos, metricas = self._tomar_pendientes()
+        if not accesos and not metricas:
+            return
+        conexion = self._conexion.obtener()
+        with conexion:
+            conexion.execute('BEGIN IMMEDIATE')
+            self._aplicar_pendientes(conexion, accesos, metricas)
+
+    def _tomar_pendientes(self):
+        with self._lock:
+            accesos, self._accesos = self._accesos, {}
+            metricas, self._metricas = self._metricas, {}
+            self._ultima_escritura = time.monotonic()
+        return accesos, metricas
+
+    @staticmethod
+    def _aplicar_pendientes(conexion, accesos, metricas):
+        """Escribe accesos y métricas dentro de la transacción en curso"""
+        if accesos:
+            conexion.executemany(
+                'UPDATE cache SET acceso = MAX(acceso, ?) WHERE clave = ?',
+                [(momento, clave) for clave, momento in accesos.items()]
+            )
+        for nombre, cantidad in metricas.items():
+            _incrementar(conexion, f'cache.{nombre}', cantidad)
+
+    # ---------- interfaz de cache ----------
+
+    def __len__(self):
+        return self._contador(self._conexion.obtener(), 'entradas')
+
+    @staticmethod
+    def _contador(conexion, nombre):
+        fila = conexion.execute(
+            'SELECT valor FROM contadores WHERE nombre = ?', (f'cache.{nombre}',)
+        ).fetchone()
+        return fila[0] if fila else 0
+
+    def get(self, clave, default=None):
+        fila = self._conexion.obtener().execute(
+            'SELECT valor, expira FROM cache WHERE clave = ?', (clave,)
+        ).fetchone()
+        if fila is None:
+            self._anotar('fallos')
+            return default
+        if fila[1] is not None and fila[1] <= time.time():
+            if self.eliminar(clave):
+                self._anotar('expiraciones')
+            self._anotar('fallos')
+            return default
+        self._anotar('aciertos', clave)
+        return json.loads(fila[0])
+
+    def obtener_varios(self, claves):
+        """{clave: valor} de las claves presentes, con una consulta por cada LOTE_CONSULTA claves"""
+        claves = list(claves)
+        conexion = self._conexion.obtener()
+        ahora = time.time()
+        encontrados = {}
+        vencidas = []
+        for i in range(0, len(claves), LOTE_CONSULTA):
+            grupo = claves[i:i + LOTE_CONSULTA]
+            filas = conexion.execute(
+                f'SELECT clave, valor, expira FROM cache WHERE clave IN ({",".join("?" * len(grupo))})',
+                grupo
+            )
+            for clave, valor, expira in filas:
+                if expira is not None and expira <= ahora:
+                    vencidas.append(clave)
+                else:
+                    encontrados[clave] = json.loads(valor)
+        expiraciones = sum(self.eliminar(clave) for clave in vencidas)
+        self._anotar_varios({'aciertos': len(encontrados), 'fallos': len(claves) - len(encontrados),
+                             'expiraciones': expiraciones}, encontrados)
+        return encontrados
+
+    def set(self, clave, valor):
+        texto = json.dumps(valor, ensure_ascii=False, default=str)
+        tamaño = estimar_bytes(clave, valor)
+        if self.max_bytes is not None and tamaño > self.max_bytes:
+            self.eliminar(clave)
+            return
+        ahora = time.time()
+        expira = ahora + self.ttl if self.ttl is not None else None
+        conexion = self._conexion.obtener()
+        with conexion:
+            conexion.execute('BEGIN IMMEDIATE')
+            # Los accesos recientes de este proceso cuentan al elegir a quién desalojar
+            self._aplicar_pendientes(conexion, *self._tomar_pendientes())
+            anterior = conexion.execute(
+                'DELETE FROM cache WHERE clave = ? RETURNING bytes', (clave,)
+            ).fetchone()
+            if anterior is not None:
+                _incrementar(conexion, 'cache.entradas', -1)
+                _incrementar(conexion, 'cache.bytes', -anterior[0])
+            conexion.execute(
+                'INSERT INTO cache (clave, valor, bytes, expira, acceso, estado, fecha) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (clave, texto, tamaño, expira, ahora, estado_curp(clave), fecha_curp(clave))
+            )
+            entradas = _incrementar(conexion, 'cache.entradas', 1)
+            total_bytes = _incrementar(conexion, 'cache.bytes', tamaño)
+            while ((self.max_entradas is not None and entradas > self.max_entradas) or
+                   (self.max_bytes is not None and total_bytes > self.max_bytes)):
+                antigua = conexion.execute(
+                    'DELETE FROM cache WHERE clave = '
+                    '(SELECT clave FROM cache ORDER BY acceso LIMIT 1) RETURNING bytes'
+                ).fetchone()
+                if antigua is None:
+                    break
+                entradas = _incrementar(conexion, 'cache.entradas', -1)
+                total_bytes = _incrementar(conexion, 'cache.bytes', -antigua[0])
+                _incrementar(conexion, 'cache.desalojos', 1)
+
+    def eliminar(self, clave):
+        conexion = self._conexion.obtener()
+        with conexion:
+            conexion.execute('BEGIN IMMEDIATE')
+            fila = conexion.execute(
+                'DELETE FROM cache WHERE clave = ? RETURNING bytes', (clave,)
+            ).fetchone()
+            if fila is None:
+                return False
+            _incrementar(conexion, 'cache.entradas', -1)
+            _incrementar(conexion, 'cache.bytes', -fila[0])
+            return True
+
+    def limpiar(self):
+        conexion = self._conexion.obtener()
+        with conexion:
+            conexion.execute('BEGIN IMMEDIATE')
+            cantidad = conexion.execute('DELETE FROM cache').rowcount
+            conexion.execute(
+                "UPDATE contadores SET valor = 0 WHERE nombre IN ('cache.entradas', 'cache.bytes')"
+            )
+        return cantidad
+
+    def claves(self):
+        filas = self._conexion.obtener().execute(
+            'SELECT clave FROM cache WHERE expira IS NULL OR expira > ? ORDER BY acceso',
+            (time.time(),)
+        ).fetchall()
+        return [fila[0] for fila in filas]
+
+    def pagina(self, despues_de=None, limite=100):
+        """Hasta `limite` claves vigentes mayores que `despues_de`, en orden (índice de la clave primaria)"""
+        return self.buscar(despues_de=despues_de, limite=limite)
+
+    def buscar(self, estado=None, desde=None, hasta=None, prefijo='', despues_de=None, limite=100):
+        """
+        Misma búsqueda que CacheCURP.buscar: con estado y fechas usa el
+        índice (estado, fecha, clave), con solo fechas (fecha, clave), con
+        solo estado (estado, clave) y si no la clave primaria; el prefijo
+        acota el rango de los índices ordenados por clave, el resto de los
+        filtros y la caducidad se aplican sobre el rango del índice
+        """
+        condiciones = ['(expira IS NULL OR expira > ?)']
+        parametros = [time.time()]
+        if prefijo:
+            condiciones.append('clave >= ? AND clave < ?')
+            parametros += [prefijo, prefijo + '\uffff']
+        if desde is None and hasta is None:
+            orden = 'clave'
+            if estado is not None:
+                condiciones.append('estado = ? AND fecha IS NOT NULL')
+                parametros.append(estado)
+            if despues_de:
+                condiciones.append('clave > ?')
+                parametros.append(despues_de)
+        else:
+            orden = 'fecha, clave'
+            condiciones.append('fecha IS NOT NULL')
+            if estado is not None:
+                condiciones.append('estado = ?')
+                parametros.append(estado)
+            if desde is not None:
+                condiciones.append('fecha >= ?')
+                parametros.append(desde)
+            if hasta is not None:
+                condiciones.append('fecha <= ?')
+                parametros.append(hasta)
+            fecha = fecha_curp(despues_de) if despues_de else None
+            if fecha is not None:
+                condiciones.append('(fecha, clave) > (?, ?)')
+                parametros += [fecha, despues_de]
+        filas = self._conexion.obtener().execute(
+            f'SELECT clave FROM cache WHERE {" AND ".join(condiciones)} ORDER BY {orden} LIMIT ?',
+            (*parametros, limite)
+        ).fetchall()
+        return [fila[0] for fila in filas]
+
+    def metricas(self):
+        self.escribir_pendientes()
+        conexion = self._conexion.obtener()
+        valores = {nombre: self._contador(conexion, nombre) for nombre in
+                   ('entradas', 'bytes', 'aciertos', 'fallos', 'desalojos', 'expiraciones')}
+        consultas = valores['aciertos'] + valores['fallos']
+        valores.update({
+            'max_entradas': self.max_entradas,
+            'max_bytes': self.max_bytes,
+            'ttl': self.ttl,
+            'tasa_aciertos': round(valores['aciertos'] / consultas, 4) if consultas else 0.0,
+        })
+        return valores
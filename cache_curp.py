@@ -0,0 +1,239 @@
+"""
+Cache de CURPs acotada (LRU + TTL) con métricas de uso
+Segura para usarse desde varios hilos de un mismo proceso
+"""
+
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from indice_cache import IndiceCURPs
+
+
+def estimar_bytes(clave, valor):
+    """Tamaño aproximado de una entrada: su representación JSON"""
+    return len(clave) + len(json.dumps(valor, ensure_ascii=False, default=str))
+
+
+class CacheCURP:
+    """
+    Cache LRU con límite de entradas, límite de bytes y caducidad opcional.
+
+    Args:
+        max_entradas (int): Número máximo de entradas (None = sin límite)
+        max_bytes (int): Tamaño máximo aproximado en bytes (None = sin límite)
+        ttl (float): Segundos de vida de cada entrada (None = no caducan)
+    """
+
+    def __init__(self, max_entradas=10000, max_bytes=None, ttl=None, reloj=time.monotonic):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.reloj = reloj
+        self._entradas = OrderedDict()  # clave -> (valor, bytes, expira)
+        self._indice = IndiceCURPs()  # claves, estados y fechas en orden, para buscar sin recorrer la cache
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expiraciones = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entradas)
+
+    def _quitar(self, clave):
+        _, tamaño, _ = self._entradas.pop(clave)
+        self._bytes -= tamaño
+        self._indice.quitar(clave)
+
+    def get(self, clave, default=None):
+        """Retorna el valor guardado (marcándolo como reciente) o default"""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return default
+            if entrada[2] is not None and entrada[2] <= self.reloj():
+                self._quitar(clave)
+                self.expiraciones += 1
+                self.fallos += 1
+                return default
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[0]
+
+    def obtener_varios(self, claves):
+        """{clave: valor} de las claves presentes (marcándolas como recientes), con un solo lock"""
+        encontrados = {}
+        with self._lock:
+            ahora = self.reloj()
+            for clave in claves:
+                entrada = self._entradas.get(clave)
+                if entrada is None:
+                    self.fallos += 1
+                elif entrada[2] is not None and entrada[2] <= ahora:
+                    self._quitar(clave)
+                    self.expiraciones += 1
+                    self.fallos += 1
+                else:
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    encontrados[clave] = entrada[0]
+        return encontrados
+
+    def set(self, clave, valor):
+        """Guarda un valor y desaloja las entradas menos recientes que excedan los límites"""
+        tamaño = estimar_bytes(clave, valor)
+        expira = self.reloj() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if clave in self._entradas:
+                self._quitar(clave)
+            if self.max_bytes is not None and tamaño > self.max_bytes:
+                return
+            self._entradas[clave] = (valor, tamaño, expira)
+            self._bytes += tamaño
+            self._indice.agregar(clave)
+            while ((self.max_entradas is not None and len(self._entradas) > self.max_entradas) or
+                   (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                antigua = next(iter(self._entradas))
+                self._quitar(antigua)
+                self.desalojos += 1
+
+    def eliminar(self, clave):
+        """Elimina una entrada; retorna True si existía"""
+        with self._lock:
+            if clave not in self._entradas:
+                return False
+            self._quitar(clave)
+            return True
+
+    def limpiar(self):
+        """Vacía la cache; retorna cuántas entradas se eliminaron"""
+        with self._lock:
+            cantidad = len(self._entradas)
+            self._entradas.clear()
+            self._indice.limpiar()
+            self._bytes = 0
+            return cantidad
+
+    def claves(self):
+        """Claves vigentes, de la menos a la más reciente"""
+        ahora = self.reloj()
+        with self._lock:
+            return [clave for clave, (_, _, expira) in self._entradas.items()
+                    if expira is None or expira > ahora]
+
+    def pagina(self, despues_de=None, limite=100):
+        """Hasta `limite` claves vigentes mayores que `despues_de`, en orden"""
+        return self.buscar(despues_de=despues_de, limite=limite)
+
+    def buscar(self, estado=None, desde=None, hasta=None, prefijo='', despues_de=None, limite=100):
+        """
+        Hasta `limite` claves vigentes del estado, con fecha de nacimiento
+        AAAAMMDD entre desde y hasta (inclusivas) y que empiezan con prefijo.
+        Con fechas se ordenan por (fecha, clave); si no, por clave.
+        """
+        ahora = self.reloj()
+        claves = []
+        with self._lock:
+            for clave in self._indice.buscar(estado, desde, hasta, prefijo, despues_de):
+                expira = self._entradas[clave][2]
+                if expira is None or expira > ahora:
+                    claves.append(clave)
+                    if len(claves) >= limite:
+                        break
+        return claves
+
+    def metricas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'entradas': len(self._entradas),
+                'bytes': self._bytes,
+                'max_entradas': self.max_entradas,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+                'expiraciones': self.expiraciones,
+                'tasa_aciertos': round(self.aciertos / consultas, 4) if consultas else 0.0,
+            }
+
+
+class _Testigo:
+    """Objeto que vive en el thread-local de un hilo y muere con él"""
+
+    __slots__ = ('__weakref__',)
+
+
+class ContadoresLocales:
+    """
+    Contadores con nombre para un solo proceso, fragmentados por hilo.
+
+    Cada hilo incrementa solo su propio fragmento (sin contención ni
+    read-modify-write compartido); la lectura suma todos los fragmentos.
+    Cuando un hilo termina, su fragmento se suma a un total base y se retira,
+    así que el número de fragmentos es el de hilos vivos y no el de hilos que
+    han existido (el servidor de desarrollo crea uno por petición).
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._fragmentos = {}  # id(fragmento) -> fragmento de un hilo vivo
+        self._base = {}
+        self._lock = threading.Lock()
+
+    def _fragmento(self):
+        fragmento = getattr(self._local, 'valores', None)
+        if fragmento is None:
+            fragmento = self._local.valores = {}
+            self._local.testigo = testigo = _Testigo()
+            with self._lock:
+                self._fragmentos[id(fragmento)] = fragmento
+            weakref.finalize(testigo, self._retirar, fragmento)
+        return fragmento
+
+    def _retirar(self, fragmento):
+        """Suma al total base el fragmento de un hilo que terminó"""
+        with self._lock:
+            for nombre, valor in fragmento.items():
+                self._base[nombre] = self._base.get(nombre, 0) + valor
+            del self._fragmentos[id(fragmento)]
+
+    def _instantanea(self):
+        # Base y fragmentos en un mismo momento: un fragmento retirado después
+        # conserva sus valores, así que no se cuenta dos veces ni se pierde
+        with self._lock:
+            return dict(self._base), list(self._fragmentos.values())
+
+    def incrementar(self, nombre, cantidad=1):
+        """Suma cantidad al contador y retorna el total observado"""
+        fragmento = self._fragmento()
+        fragmento[nombre] = fragmento.get(nombre, 0) + cantidad
+        return self.valor(nombre)
+
+    def incrementar_varios(self, cantidades):
+        """Suma {nombre: cantidad} de una vez"""
+        fragmento = self._fragmento()
+        for nombre, cantidad in cantidades.items():
+            fragmento[nombre] = fragmento.get(nombre, 0) + cantidad
+
+    def valor(self, nombre):
+        base, fragmentos = self._instantanea()
+        return base.get(nombre, 0) + sum(fragmento.get(nombre, 0) for fragmento in fragmentos)
+
+    def con_prefijo(self, prefijo):
+        """{nombre sin el prefijo: valor} de los contadores que empiezan con prefijo"""
+        base, fragmentos = self._instantanea()
+        valores = {}
+        for fragmento in [base] + fragmentos:
+            for nombre, valor in fragmento.copy().items():
+                if nombre.startswith(prefijo):
+                    clave = nombre[len(prefijo):]
+                    valores[clave] = valores.get(clave, 0) + valor
+        return valores
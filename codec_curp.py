@@ -0,0 +1,149 @@
+"""
+Codificación compacta de CURPs en enteros de ancho fijo
+Permite guardar millones de CURPs en arreglos de unos cuantos MB
+
+Es un componente independiente para almacenar o exportar grandes volúmenes
+de CURPs (por ejemplo, listas fuera de línea); la aplicación no lo usa: las
+caches guardan el resultado completo de cada validación por CURP y empacar y
+desempacar en cada consulta solo agregaría trabajo
+"""
+
+import time
+from array import array
+
+from generador_curp import GeneradorCURP
+
+# Alfabeto de cada campo según la gramática BNF que acepta validar_sintaxis
+LETRAS = GeneradorCURP.ALFABETO
+CONSONANTES = GeneradorCURP.CONSONANTES
+SEXOS = 'HMX'
+ENTIDADES = tuple(sorted(GeneradorCURP.ESTADOS))
+HOMOCLAVE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+
+# (alfabeto, posiciones) en orden de empaque; la fecha se empaca aparte
+_CAMPOS = (
+    (LETRAS, (0, 1, 2, 3)),
+    (SEXOS, (10,)),
+    (CONSONANTES, (13, 14, 15)),
+    (HOMOCLAVE, (16, 17)),
+)
+_INDICES = tuple({c: i for i, c in enumerate(alfabeto)} for alfabeto, _ in _CAMPOS)
+_INDICE_ENTIDAD = {clave: i for i, clave in enumerate(ENTIDADES)}
+
+# AAMMDD -> ((AA * 12) + MM - 1) * 31 + DD - 1
+_FECHAS = 100 * 12 * 31
+
+# 27^4 * 3 * 22^3 * 36^2 * 33 * 37200 < 2^65
+BITS = 65
+_MASCARA_BAJA = (1 << 64) - 1
+
+
+def empacar(curp: str) -> int:
+    """
+    Empaca una CURP sintácticamente válida en un entero de BITS bits.
+    Lanza ValueError si algún carácter no pertenece al alfabeto de su posición.
+    """
+    if len(curp) != 18:
+        raise ValueError(f"Longitud incorrecta: {len(curp)} (esperado: 18)")
+    # int() también acepta dígitos no ASCII, signos y espacios ('+1', ' 1')
+    if not all(campo.isascii() and campo.isdigit() for campo in (curp[4:6], curp[6:8], curp[8:10])):
+        raise ValueError(f"CURP no empacable: {curp}")
+    try:
+        codigo = 0
+        for (alfabeto, posiciones), indice in zip(_CAMPOS, _INDICES):
+            base = len(alfabeto)
+            for posicion in posiciones:
+                codigo = codigo * base + indice[curp[posicion]]
+        codigo = codigo * len(ENTIDADES) + _INDICE_ENTIDAD[curp[11:13]]
+        año, mes, dia = int(curp[4:6]), int(curp[6:8]), int(curp[8:10])
+    except (KeyError, ValueError):
+        raise ValueError(f"CURP no empacable: {curp}")
+    if not (1 <= mes <= 12 and 1 <= dia <= 31):
+        raise ValueError(f"CURP no empacable: {curp}")
+    return codigo * _FECHAS + (año * 12 + mes - 1) * 31 + dia - 1
+
+
+def desempacar(codigo: int) -> str:
+    """Inversa de empacar()"""
+    codigo, fecha = divmod(codigo, _FECHAS)
+    fecha, dia = divmod(fecha, 31)
+    año, mes = divmod(fecha, 12)
+    codigo, entidad = divmod(codigo, len(ENTIDADES))
+    chars = [''] * 18
+    for alfabeto, posiciones in reversed(_CAMPOS):
+        base = len(alfabeto)
+        for posicion in reversed(posiciones):
+            codigo, valor = divmod(codigo, base)
+            chars[posicion] = alfabeto[valor]
+    chars[4:10] = f"{año:02d}{mes + 1:02d}{dia + 1:02d}"
+    chars[11:13] = ENTIDADES[entidad]
+    return ''.join(chars)
+
+
+class AlmacenCURP:
+    """
+    Almacén columnar de CURPs empacadas con su marca de tiempo.
+
+    Cada entrada ocupa 17 bytes: los 64 bits bajos del código ('Q'), el bit
+    alto ('B') y la marca de tiempo en milisegundos desde la época ('q').
+    """
+
+    def __init__(self):
+        self.bajos = array('Q')
+        self.altos = array('B')
+        self.marcas = array('q')
+
+    def __len__(self):
+        return len(self.bajos)
+
+    def agregar(self, curp: str, marca_ms: int = None) -> int:
+        """Agrega una CURP y retorna su posición"""
+        codigo = empacar(curp)
+        self.bajos.append(codigo & _MASCARA_BAJA)
+        self.altos.append(codigo >> 64)
+        self.marcas.append(int(time.time() * 1000) if marca_ms is None else marca_ms)
+        return len(self.bajos) - 1
+
+    def codigo(self, posicion: int) -> int:
+        return (self.altos[posicion] << 64) | self.bajos[posicion]
+
+    def __getitem__(self, posicion: int) -> tuple:
+        """(curp, marca_ms) de la posición"""
+        return desempacar(self.codigo(posicion)), self.marcas[posicion]
+
+    def __iter__(self):
+        for posicion in range(len(self)):
+            yield self[posicion]
+
+    def limpiar(self):
+        cantidad = len(self)
+        del self.bajos[:], self.altos[:], self.marcas[:]
+        return cantidad
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.bajos, self.altos, self.marcas))
+
+
+def curp_aleatoria(aleatorio):
+    """CURP con cada carácter sorteado de su alfabeto; puede no ser válida (fecha, BNF)"""
+    return ''.join(aleatorio.choice(alfabeto) for alfabeto in (
+        LETRAS, LETRAS, LETRAS, LETRAS, '0123456789', '0123456789',
+        '01', '0123456789', '0123', '0123456789', SEXOS)) + \
+        aleatorio.choice(ENTIDADES) + \
+        ''.join(aleatorio.choice(alfabeto) for alfabeto in (
+            CONSONANTES, CONSONANTES, CONSONANTES, HOMOCLAVE, HOMOCLAVE))
+
+
+if __name__ == "__main__":
+    import random
+
+    generador = GeneradorCURP()
+    aleatorio = random.Random(0)
+    almacen = AlmacenCURP()
+    while len(almacen) < 100000:
+        curp = curp_aleatoria(aleatorio)
+        if generador.validar_sintaxis(curp, detalle=False)['valida']:
+            almacen.agregar(curp)
+    print(f"✅ {len(almacen)} CURPs en el almacén")
+    print(f"   Memoria del almacén: {almacen.nbytes / 1024 / 1024:.2f} MB")
@@ -0,0 +1,231 @@
+"""
+Validación y generación masiva de CURPs sin servidor web
+El archivo de entrada se mapea en memoria y se divide en tramos alineados a
+fin de línea; cada proceso trabajador lee su tramo directamente del archivo y
+devuelve el texto de salida ya formateado, que se escribe en orden. La memoria
+usada depende del tamaño de tramo, no del tamaño del archivo.
+
+Las filas de salida son las mismas que producen /validar-curp/lote y
+/generar-curp/lote (sin la consulta a la cache del servidor).
+
+Uso:
+    python curp_masivo.py validar curps.txt -o resultados.jsonl
+    python curp_masivo.py generar personas.csv -o curps.csv --procesos 8
+"""
+
+import argparse
+import csv
+import io
+import json
+import mmap
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from generador_curp import GeneradorCURP, generar_fila
+from validacion_lote import (curp_de_linea, persona_de_linea, fila_validacion, lineas_no_vacias,
+                             validar_registro, ResumenLote)
+
+TAMANO_TRAMO = 4 * 1024 * 1024
+COLUMNAS = {
+    'validar': ['fila', 'curp', 'valida', 'tipo_error', 'errores'],
+    'generar': ['fila', 'success', 'curp', 'error'],
+}
+
+_generador = GeneradorCURP()
+
+
+# ==================== TRAMOS ====================
+
+def tramos(mapa, inicio=0, tamano=TAMANO_TRAMO):
+    """(inicio, fin) de tramos de ~tamano bytes que terminan en fin de línea (\\n, \\r o \\r\\n)"""
+    total = len(mapa)
+    while inicio < total:
+        desde = min(inicio + tamano, total) - 1
+        saltos = [i for i in (mapa.find(b'\n', desde), mapa.find(b'\r', desde)) if i != -1]
+        fin = min(saltos) + 1 if saltos else total
+        if fin < total and mapa[fin - 1:fin + 1] == b'\r\n':
+            fin += 1
+        yield inicio, fin
+        inicio = fin
+
+
+def contar_registros(datos, es_csv):
+    """
+    Registros de un tramo con el mismo criterio que los endpoints: saltos de
+    línea universales; csv.DictReader salta solo las líneas vacías, JSONL y
+    las listas de CURPs también las que solo tienen espacios (str.strip)
+    """
+    lineas = io.StringIO(datos.decode('utf-8'), newline=None)
+    if es_csv:
+        return sum(1 for linea in lineas if linea != '\n')
+    return sum(1 for _ in lineas_no_vacias(lineas))
+
+
+# ==================== TRABAJO DE CADA PROCESO ====================
+
+def _registros(texto, modo, encabezado):
+    if modo == 'generar' and encabezado is not None:
+        yield from csv.DictReader(io.StringIO(texto, newline=''), fieldnames=encabezado)
+        return
+    leer = curp_de_linea if modo == 'validar' else persona_de_linea
+    for linea in lineas_no_vacias(io.StringIO(texto, newline=None)):
+        yield leer(linea)
+
+
+def _formato_csv(resultado):
+    fila = dict(resultado)
+    if 'errores' in fila:
+        fila['errores'] = '; '.join(fila['errores'])
+    return fila
+
+
+def procesar_tramo(ruta, inicio, fin, primera_fila, modo, encabezado, formato):
+    """
+    Procesa las líneas [inicio, fin) del archivo; retorna (salida, resumen).
+    primera_fila es el número de la primera fila del tramo dentro del archivo.
+    """
+    with open(ruta, 'rb') as archivo, \
+            mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        texto = mapa[inicio:fin].decode('utf-8')
+
+    salida = io.StringIO()
+    if formato == 'csv':
+        escritor = csv.DictWriter(salida, COLUMNAS[modo], lineterminator='\n', extrasaction='ignore')
+        escribir = lambda resultado: escritor.writerow(_formato_csv(resultado))
+    else:
+        escribir = lambda resultado: salida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+
+    resumen = ResumenLote() if modo == 'validar' else {'total': 0, 'exitosas': 0, 'fallidas': 0}
+    for fila, registro in enumerate(_registros(texto, modo, encabezado), start=primera_fila):
+        if modo == 'validar':
+            curp, validacion, _ = validar_registro(registro)
+            escribir(fila_validacion(fila, curp, validacion, resumen.registrar(validacion)))
+        else:
+            resultado = {'fila': fila, **generar_fila(_generador, registro)}
+            resumen['total'] += 1
+            resumen['exitosas' if resultado['success'] else 'fallidas'] += 1
+            escribir(resultado)
+    return salida.getvalue(), resumen
+
+
+# ==================== PROCESO PRINCIPAL ====================
+
+def _sumar(total, resumen):
+    if isinstance(resumen, dict):
+        for clave, valor in resumen.items():
+            total[clave] = total.get(clave, 0) + valor
+        return total
+    return total.sumar(resumen)
+
+
+def procesar_archivo(ruta, destino, modo, formato='jsonl', procesos=None,
+                     tamano_tramo=TAMANO_TRAMO, progreso=None):
+    """
+    Procesa el archivo completo escribiendo en `destino` (archivo de texto).
+
+    Las personas se leen como CSV con encabezado si la ruta termina en .csv y
+    como JSONL en otro caso. progreso(filas, bytes_leidos, bytes_totales) se
+    llama cada vez que se escribe un tramo. Retorna (filas, resumen).
+    """
+    procesos = procesos or os.cpu_count() or 1
+    es_csv = modo == 'generar' and ruta.lower().endswith('.csv')
+
+    with open(ruta, 'rb') as archivo:
+        if os.fstat(archivo.fileno()).st_size == 0:
+            mapa = b''
+        else:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    inicio = 0
+    encabezado = None
+    if es_csv and len(mapa):
+        fin_encabezado = next(tramos(mapa, 0, 1))[1]
+        encabezado = next(csv.reader([mapa[:fin_encabezado].decode('utf-8')]), [])
+        inicio = fin_encabezado
+
+    if formato == 'csv':
+        csv.writer(destino, lineterminator='\n').writerow(COLUMNAS[modo])
+
+    resumen = ResumenLote() if modo == 'validar' else {}
+    # Con un solo proceso no hay nada que repartir: se procesa en línea
+    ejecutor = ProcessPoolExecutor(max_workers=procesos) if procesos > 1 else None
+    pendientes = deque()
+    siguiente_fila = 1
+    filas = 0
+
+    def escribir_siguiente():
+        nonlocal filas, resumen
+        trabajo, fin, cantidad = pendientes.popleft()
+        texto, parcial = trabajo.result() if ejecutor is not None else trabajo
+        destino.write(texto)
+        resumen = _sumar(resumen, parcial)
+        filas += cantidad
+        if progreso is not None:
+            progreso(filas, fin, len(mapa))
+
+    try:
+        for a, b in tramos(mapa, inicio, tamano_tramo):
+            cantidad = contar_registros(mapa[a:b], es_csv)
+            argumentos = (ruta, a, b, siguiente_fila, modo, encabezado, formato)
+            if ejecutor is not None:
+                trabajo = ejecutor.submit(procesar_tramo, *argumentos)
+            else:
+                trabajo = procesar_tramo(*argumentos)
+            pendientes.append((trabajo, b, cantidad))
+            siguiente_fila += cantidad
+            while len(pendientes) > 2 * procesos:
+                escribir_siguiente()
+        while pendientes:
+            escribir_siguiente()
+    finally:
+        if ejecutor is not None:
+            ejecutor.shutdown(cancel_futures=True)
+        if isinstance(mapa, mmap.mmap):
+            mapa.close()
+
+    return filas, resumen.como_dict() if isinstance(resumen, ResumenLote) else resumen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modo', choices=sorted(COLUMNAS))
+    parser.add_argument('entrada', help='CURPs (una por línea) o personas (CSV con encabezado o JSONL)')
+    parser.add_argument('-o', '--salida', help='archivo de resultados (por omisión, salida estándar)')
+    parser.add_argument('--formato', choices=['jsonl', 'csv'],
+                        help='formato de salida (por omisión, según la extensión de --salida)')
+    parser.add_argument('--procesos', type=int, default=None,
+                        help='procesos trabajadores (por omisión, núcleos disponibles)')
+    parser.add_argument('--tramo', type=int, default=TAMANO_TRAMO, help='bytes por tramo')
+    args = parser.parse_args(argv)
+
+    formato = args.formato or ('csv' if (args.salida or '').lower().endswith('.csv') else 'jsonl')
+    inicio = time.perf_counter()
+
+    def progreso(filas, leidos, total):
+        segundos = time.perf_counter() - inicio
+        print(f"\r  {filas:,} filas   {leidos / total:6.1%}   {filas / segundos:,.0f} filas/s",
+              end='', file=sys.stderr, flush=True)
+
+    destino = open(args.salida, 'w', encoding='utf-8', newline='') if args.salida else sys.stdout
+    try:
+        filas, resumen = procesar_archivo(args.entrada, destino, args.modo, formato, args.procesos,
+                                          args.tramo, progreso)
+    except ValueError as e:
+        print(f"\n❌ {e}", file=sys.stderr)
+        return 1
+    finally:
+        if destino is not sys.stdout:
+            destino.close()
+
+    segundos = time.perf_counter() - inicio
+    print(f"\n✅ {filas:,} filas en {segundos:.2f} s ({filas / segundos if segundos else 0:,.0f} filas/s)",
+          file=sys.stderr)
+    print(f"   Resumen: {json.dumps(resumen, ensure_ascii=False)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
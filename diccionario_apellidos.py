@@ -3,6 +3,11 @@ Diccionario de apellidos más comunes en México
 Incluye variaciones con y sin acentos
 """
 
+import os
+
+from indice_diccionario import IndiceDiccionario
+from normalizacion import plegar
+
 APELLIDOS_MEXICANOS = {
     'GARCIA', 'GARCÍA', 'MARTINEZ', 'MARTÍNEZ', 'RODRIGUEZ', 'RODRÍGUEZ',
     'HERNANDEZ', 'HERNÁNDEZ', 'LOPEZ', 'LÓPEZ', 'GONZALEZ', 'GONZÁLEZ',
@@ -46,9 +51,22 @@ APELLIDOS_COMPUESTOS = {
     'SANTA MARIA', 'SANTA MARÍA',
 }
 
+PARTICULAS = frozenset({'DE', 'DEL', 'LA', 'LOS', 'LAS'})
+
+TODOS_LOS_APELLIDOS = frozenset(APELLIDOS_MEXICANOS | APELLIDOS_COMPUESTOS)
+
+# Claves plegadas (sin acentos) construidas una sola vez al importar, o bien
+# el diccionario nacional en disco si CURP_DICCIONARIO_APELLIDOS apunta a un archivo
+# creado con diccionario_disco.construir()
+if os.environ.get('CURP_DICCIONARIO_APELLIDOS'):
+    from diccionario_disco import DiccionarioDisco
+    INDICE_APELLIDOS = DiccionarioDisco(os.environ['CURP_DICCIONARIO_APELLIDOS'])
+else:
+    INDICE_APELLIDOS = IndiceDiccionario(TODOS_LOS_APELLIDOS)
+
 def obtener_todos_los_apellidos():
     """Retorna todos los apellidos válidos"""
-    return APELLIDOS_MEXICANOS.union(APELLIDOS_COMPUESTOS)
+    return TODOS_LOS_APELLIDOS
 
 def normalizar_apellido(apellido):
     """Normaliza un apellido"""
@@ -59,18 +77,17 @@ def es_apellido_valido(apellido):
     if not apellido or not isinstance(apellido, str):
         return False
     
-    apellido_normalizado = normalizar_apellido(apellido)
-    todos_apellidos = obtener_todos_los_apellidos()
+    apellido_normalizado = plegar(apellido)
     
     # Verificar si está en el diccionario
-    if apellido_normalizado in todos_apellidos:
+    if apellido_normalizado in INDICE_APELLIDOS:
         return True
     
     # Verificar apellidos compuestos
     partes = apellido_normalizado.split()
     if len(partes) > 1:
         for parte in partes:
-            if parte not in todos_apellidos and parte not in {'DE', 'DEL', 'LA', 'LOS', 'LAS'}:
+            if parte not in INDICE_APELLIDOS and parte not in PARTICULAS:
                 return False
         return True
     
@@ -0,0 +1,258 @@
+"""
+Diccionarios a escala nacional en disco: archivo binario ordenado y mapeado en memoria
+Los workers comparten las páginas a través de la cache del sistema operativo,
+así que abrir un diccionario de cientos de miles de entradas es casi instantáneo.
+Un índice difuso lateral (borrados de SymSpell y claves fonéticas) limita las
+sugerencias a unas cuantas claves candidatas en lugar de recorrer el archivo.
+
+Uso:
+    python diccionario_disco.py construir nombres.txt nombres.dic
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import islice
+
+from fonetica import clave_fonetica
+from indice_diccionario import IndiceDiccionario
+
+MAGIA = b'CURPDIC1'
+MAGIA_LONGITUDES = b'CURPLON1'
+MAGIA_DIFUSO = b'CURPSIM1'
+_ENCABEZADO = struct.Struct('<8sI')  # magia, número de entradas
+EXTENSION_LONGITUDES = '.lon'
+EXTENSION_DIFUSO = '.sim'
+
+# Borrados de SymSpell: dos palabras a distancia <= MAX_BORRADOS comparten una
+# variante con hasta MAX_BORRADOS letras borradas; como en SymSpell, solo se
+# borran letras de los primeros LONGITUD_PREFIJO caracteres para acotar el índice
+MAX_BORRADOS = 2
+LONGITUD_PREFIJO = 7
+# Cada entrada del índice difuso es firma de 40 bits << 24 | posición de la clave
+_BITS_POSICION = 24
+_MASCARA_POSICION = (1 << _BITS_POSICION) - 1
+
+
+def variantes_borrado(palabra, distancia=MAX_BORRADOS, prefijo=LONGITUD_PREFIJO):
+    """El prefijo de la palabra con 0 a `distancia` letras borradas"""
+    nivel = {palabra[:prefijo]}
+    variantes = set(nivel)
+    for _ in range(distancia):
+        nivel = {variante[:i] + variante[i + 1:] for variante in nivel for i in range(len(variante))}
+        variantes |= nivel
+    return variantes
+
+
+def _firma(texto):
+    return int.from_bytes(hashlib.blake2b(texto.encode('utf-8'), digest_size=5).digest(), 'little')
+
+
+def firmas_difusas(clave):
+    """Firmas bajo las que se indexa (o se busca) una clave plegada"""
+    firmas = {_firma(variante) for variante in variantes_borrado(clave)}
+    firmas.add(_firma('#' + clave_fonetica(clave)))
+    return firmas
+
+
+def construir(palabras, ruta):
+    """
+    Escribe el diccionario ordenado por clave plegada y su índice lateral.
+
+    ruta: claves y ortografías de presentación con sus tablas de posiciones.
+    ruta + '.lon': posiciones agrupadas por longitud de clave, para que la
+    búsqueda difusa solo examine longitudes compatibles con el radio.
+    ruta + '.sim': firmas de borrado y fonéticas de cada clave, ordenadas, para
+    que una sugerencia solo mida la distancia contra las claves candidatas.
+    """
+    indice = IndiceDiccionario(palabras)
+    claves = sorted(indice.claves, key=lambda clave: clave.encode('utf-8'))
+    datos_claves = [clave.encode('utf-8') for clave in claves]
+    datos_presentacion = [indice.mostrar(clave).encode('utf-8') for clave in claves]
+
+    with open(ruta, 'wb') as archivo:
+        archivo.write(_ENCABEZADO.pack(MAGIA, len(claves)))
+        for bloque in (datos_claves, datos_presentacion):
+            posiciones = array('I', [0])
+            for dato in bloque:
+                posiciones.append(posiciones[-1] + len(dato))
+            archivo.write(posiciones.tobytes())
+        for bloque in (datos_claves, datos_presentacion):
+            archivo.write(b''.join(bloque))
+
+    por_longitud = sorted(range(len(claves)), key=lambda i: (len(claves[i]), datos_claves[i]))
+    max_longitud = max((len(clave) for clave in claves), default=0)
+    inicios = array('I', [0] * (max_longitud + 2))
+    for i in por_longitud:
+        inicios[len(claves[i]) + 1] += 1
+    for longitud in range(1, max_longitud + 2):
+        inicios[longitud] += inicios[longitud - 1]
+    with open(ruta + EXTENSION_LONGITUDES, 'wb') as archivo:
+        archivo.write(_ENCABEZADO.pack(MAGIA_LONGITUDES, max_longitud))
+        archivo.write(inicios.tobytes())
+        archivo.write(array('I', por_longitud).tobytes())
+
+    _construir_difuso(claves, ruta + EXTENSION_DIFUSO)
+    return len(claves)
+
+
+def _construir_difuso(claves, ruta):
+    if len(claves) > _MASCARA_POSICION:
+        raise ValueError(f"El índice difuso admite hasta {_MASCARA_POSICION} claves")
+    # Repartidas por los 8 bits altos de la firma para ordenar un grupo a la vez
+    grupos = [array('Q') for _ in range(256)]
+    for posicion, clave in enumerate(claves):
+        for firma in firmas_difusas(clave):
+            grupos[firma >> 32].append((firma << _BITS_POSICION) | posicion)
+    with open(ruta, 'wb') as archivo:
+        archivo.write(_ENCABEZADO.pack(MAGIA_DIFUSO, sum(len(grupo) for grupo in grupos)))
+        for i, grupo in enumerate(grupos):
+            archivo.write(array('Q', sorted(grupo)).tobytes())
+            grupos[i] = None
+
+
+def _mapear(ruta, magia):
+    with open(ruta, 'rb') as archivo:
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    encontrada, cantidad = _ENCABEZADO.unpack_from(mapa, 0)
+    if encontrada != magia:
+        raise ValueError(f"{ruta} no es un diccionario CURP válido")
+    return mapa, cantidad
+
+
+class DiccionarioDisco:
+    """
+    Diccionario de solo lectura sobre un archivo creado con construir().
+
+    Ofrece la misma interfaz que IndiceDiccionario (pertenencia, iteración,
+    mostrar) sin cargar las claves en memoria: la pertenencia es una búsqueda
+    binaria sobre el archivo mapeado.
+    """
+
+    en_disco = True
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._mapa, self._cantidad = _mapear(ruta, MAGIA)
+        vista = memoryview(self._mapa)
+        n = self._cantidad
+        inicio = _ENCABEZADO.size
+        self._pos_claves = vista[inicio:inicio + 4 * (n + 1)].cast('I')
+        inicio += 4 * (n + 1)
+        self._pos_presentacion = vista[inicio:inicio + 4 * (n + 1)].cast('I')
+        self._base_claves = inicio + 4 * (n + 1)
+        self._base_presentacion = self._base_claves + self._pos_claves[n]
+
+        self._lon_mapa, max_longitud = _mapear(ruta + EXTENSION_LONGITUDES, MAGIA_LONGITUDES)
+        vista = memoryview(self._lon_mapa)
+        inicio = _ENCABEZADO.size
+        self._inicios_longitud = vista[inicio:inicio + 4 * (max_longitud + 2)].cast('I')
+        inicio += 4 * (max_longitud + 2)
+        self._por_longitud = vista[inicio:inicio + 4 * n].cast('I')
+        self.max_longitud = max_longitud
+
+        # Archivos construidos antes del índice difuso no lo tienen
+        self._difuso = None
+        if os.path.exists(ruta + EXTENSION_DIFUSO):
+            self._difuso_mapa, cantidad = _mapear(ruta + EXTENSION_DIFUSO, MAGIA_DIFUSO)
+            inicio = _ENCABEZADO.size
+            self._difuso = memoryview(self._difuso_mapa)[inicio:inicio + 8 * cantidad].cast('Q')
+
+    def __len__(self):
+        return self._cantidad
+
+    def _clave_bytes(self, i):
+        return self._mapa[self._base_claves + self._pos_claves[i]:
+                          self._base_claves + self._pos_claves[i + 1]]
+
+    def clave(self, i):
+        return self._clave_bytes(i).decode('utf-8')
+
+    def _posicion(self, clave):
+        """Posición de la clave (o de su punto de inserción) por búsqueda binaria"""
+        objetivo = clave.encode('utf-8')
+        bajo, alto = 0, self._cantidad
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._clave_bytes(medio) < objetivo:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo, objetivo
+
+    def __contains__(self, clave):
+        i, objetivo = self._posicion(clave)
+        return i < self._cantidad and self._clave_bytes(i) == objetivo
+
+    def __iter__(self):
+        return (self.clave(i) for i in range(self._cantidad))
+
+    @property
+    def claves(self):
+        return self
+
+    def mostrar(self, clave):
+        i, objetivo = self._posicion(clave)
+        if i >= self._cantidad or self._clave_bytes(i) != objetivo:
+            return clave
+        return self._mapa[self._base_presentacion + self._pos_presentacion[i]:
+                          self._base_presentacion + self._pos_presentacion[i + 1]].decode('utf-8')
+
+    def con_prefijo(self, prefijo):
+        """Claves que empiezan con el prefijo, en orden"""
+        i, objetivo = self._posicion(prefijo)
+        while i < self._cantidad:
+            dato = self._clave_bytes(i)
+            if not dato.startswith(objetivo):
+                return
+            yield dato.decode('utf-8')
+            i += 1
+
+    def por_longitud(self, minima, maxima):
+        """Claves cuya longitud está en [minima, maxima], según el índice lateral"""
+        minima = max(minima, 0)
+        maxima = min(maxima, self.max_longitud)
+        if minima > maxima:
+            return
+        for j in range(self._inicios_longitud[minima], self._inicios_longitud[maxima + 1]):
+            yield self.clave(self._por_longitud[j])
+
+
+    def candidatos_difusos(self, texto):
+        """
+        Claves que comparten con el texto plegado una variante de borrado o la
+        clave fonética, en orden; None si el archivo no tiene índice difuso
+        """
+        if self._difuso is None:
+            return None
+        entradas = self._difuso
+        posiciones = set()
+        for firma in firmas_difusas(texto):
+            j = bisect_left(entradas, firma << _BITS_POSICION)
+            while j < len(entradas) and entradas[j] >> _BITS_POSICION == firma:
+                posiciones.add(entradas[j] & _MASCARA_POSICION)
+                j += 1
+        return [self.clave(i) for i in sorted(posiciones)]
+
+
+def leer_lista(ruta):
+    """Una palabra por línea; ignora líneas vacías y comentarios (#)"""
+    with open(ruta, encoding='utf-8') as archivo:
+        for linea in archivo:
+            linea = linea.strip()
+            if linea and not linea.startswith('#'):
+                yield linea
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != 'construir':
+        print(__doc__.strip())
+        sys.exit(1)
+    cantidad = construir(leer_lista(sys.argv[2]), sys.argv[3])
+    diccionario = DiccionarioDisco(sys.argv[3])
+    print(f"✅ {cantidad} claves escritas en {sys.argv[3]} (+ {EXTENSION_LONGITUDES}, {EXTENSION_DIFUSO})")
+    print(f"   Primeras: {', '.join(islice(diccionario, 5))}")
@@ -3,6 +3,12 @@ Diccionario completo de nombres comunes en México
 Incluye más de 200 nombres y variantes
 """
 
+import os
+
+from diccionario_apellidos import PARTICULAS
+from indice_diccionario import IndiceDiccionario
+from normalizacion import plegar
+
 NOMBRES_MASCULINOS = {
     'JOSE', 'JOSÉ', 'LUIS', 'JUAN', 'CARLOS', 'MIGUEL', 'JESUS', 'JESÚS',
     'ANTONIO', 'FRANCISCO', 'JAVIER', 'ALEJANDRO', 'MANUEL', 'FERNANDO',
@@ -46,7 +52,7 @@ NOMBRES_FEMENINOS = {
     'SOLEDAD', 'JAZMIN', 'JAZMÍN', 'NATALIA', 'XIMENA', 'VALERIA', 'CAMILA',
     'ISABELLA', 'RENATA', 'VALENTINA', 'MARIA JOSE', 'MARÍA JOSÉ',
     'MARIA FERNANDA', 'MARÍA FERNANDA', 'ANA KAREN', 'ANA MARIA', 'ANA MARÍA',
-    'LOURDES', 'DOLORES', 'CONCEPCION', 'CONCEPCIÓN', 'PILAR', 'MERCEDES',
+    'LOURDES', 'DOLORES', 'ANGELES', 'ÁNGELES', 'CONCEPCION', 'CONCEPCIÓN', 'PILAR', 'MERCEDES',
     'AMPARO', 'JULIA', 'ESTHER','SOFIA','BIBIANA','SONIA',
     # Nombres adicionales
     'ABRIL', 'ADRIANA', 'ALMA', 'AMALIA', 'AMANDA', 'ANGELA', 'ÁNGELA',
@@ -74,9 +80,20 @@ NOMBRES_CORTOS = {
     'ED', 'IO', 'VI', 'BO', 'KIM', 'MAX', 'REY', 'GIL', 'LIA', 'LÍA',
 }
 
+TODOS_LOS_NOMBRES = frozenset(NOMBRES_MASCULINOS | NOMBRES_FEMENINOS | NOMBRES_CORTOS)
+
+# Claves plegadas (sin acentos) construidas una sola vez al importar, o bien
+# el diccionario nacional en disco si CURP_DICCIONARIO_NOMBRES apunta a un archivo
+# creado con diccionario_disco.construir()
+if os.environ.get('CURP_DICCIONARIO_NOMBRES'):
+    from diccionario_disco import DiccionarioDisco
+    INDICE_NOMBRES = DiccionarioDisco(os.environ['CURP_DICCIONARIO_NOMBRES'])
+else:
+    INDICE_NOMBRES = IndiceDiccionario(TODOS_LOS_NOMBRES)
+
 def obtener_todos_los_nombres():
     """Retorna todos los nombres válidos en un único conjunto"""
-    return NOMBRES_MASCULINOS.union(NOMBRES_FEMENINOS).union(NOMBRES_CORTOS)
+    return TODOS_LOS_NOMBRES
 
 def normalizar_nombre(nombre):
     """Normaliza un nombre eliminando espacios extras y convirtiendo a mayúsculas"""
@@ -95,21 +112,24 @@ def es_nombre_valido(nombre):
     if not nombre or not isinstance(nombre, str):
         return False
     
-    nombre_normalizado = normalizar_nombre(nombre)
-    todos_los_nombres = obtener_todos_los_nombres()
+    nombre_normalizado = plegar(nombre)
     
     # Verificar si es un nombre compuesto completo en el diccionario
-    if nombre_normalizado in todos_los_nombres:
+    if nombre_normalizado in INDICE_NOMBRES:
         return True
     
-    # Verificar cada parte del nombre por separado
+    # Verificar cada parte del nombre por separado; las partículas (DE, DEL,
+    # LA, LOS, LAS) solo entre dos partes: 'MARIA DEL CARMEN'
     partes = nombre_normalizado.split()
     if len(partes) == 0:
         return False
     
-    for parte in partes:
-        if parte not in todos_los_nombres:
-            return False
+    for posicion, parte in enumerate(partes):
+        if parte in INDICE_NOMBRES:
+            continue
+        if parte in PARTICULAS and 0 < posicion < len(partes) - 1:
+            continue
+        return False
     
     return True
 
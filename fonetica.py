@@ -0,0 +1,62 @@
+"""
+Clave fonética del español para agrupar nombres que suenan igual
+'XIMENEZ' y 'JIMENEZ', 'BASQUEZ' y 'VAZQUEZ' o 'GONSALES' y 'GONZALEZ'
+comparten clave, así que una errata fonética se resuelve consultando una
+cubeta de unas cuantas entradas en lugar de medir distancias contra todo el
+diccionario
+"""
+
+import re
+
+from normalizacion import plegar
+
+# Letras y dígrafos que se pronuncian igual que otros
+_SONIDOS = {
+    'LL': 'Y', 'CH': '&', 'QU': 'K', 'GU': 'G',
+    'K': 'K', 'Q': 'K', 'Z': 'S', 'X': 'J', 'V': 'B', 'W': 'U', 'H': '',
+}
+_PATRON = re.compile(r'LL|CH|QU(?=[EI])|GU(?=[EI])|[CGKQZXVWH]')
+_REPETIDAS = re.compile(r'(.)\1+')
+
+
+def _sonido(coincidencia):
+    letras = coincidencia.group()
+    if letras in ('C', 'G'):
+        # C y G suaves antes de E/I: CE/CI como S, GE/GI como J
+        suave = coincidencia.string[coincidencia.end():coincidencia.end() + 1] in ('E', 'I')
+        if letras == 'C':
+            return 'S' if suave else 'K'
+        return 'J' if suave else 'G'
+    return _SONIDOS[letras]
+
+
+def clave_fonetica(texto):
+    """
+    Clave de un texto ya plegado: une B/V, S/Z/C suave, J/X/G suave, LL/Y,
+    C dura/K/QU, quita la H muda y reduce las letras repetidas
+    """
+    return _REPETIDAS.sub(r'\1', _PATRON.sub(_sonido, texto))
+
+
+class IndiceFonetico:
+    """
+    Claves plegadas de un diccionario agrupadas por clave fonética.
+
+    Se construye una vez por diccionario; candidatos() es una consulta a un
+    dict y retorna solo las palabras que suenan igual que el texto.
+    """
+
+    __slots__ = ('cubetas',)
+
+    def __init__(self, claves):
+        cubetas = {}
+        for clave in sorted(claves):
+            cubetas.setdefault(clave_fonetica(clave), []).append(clave)
+        self.cubetas = {fonetica: tuple(grupo) for fonetica, grupo in cubetas.items()}
+
+    def __len__(self):
+        return len(self.cubetas)
+
+    def candidatos(self, texto):
+        """Claves del diccionario con la misma clave fonética que el texto"""
+        return self.cubetas.get(clave_fonetica(plegar(texto)), ())
@@ -4,12 +4,28 @@ Gramática BNF Formal para CURP México
 """
 
 import re
-import unicodedata
 from datetime import datetime
-from typing import Dict
+from time import perf_counter
+from typing import Dict, Optional, Sequence
+
+from metricas import registro
+from normalizacion import normalizar_texto
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: generar_lote recurre a generar()
+    np = None
 
 class GeneradorCURP:
-    """Analizador léxico y sintáctico para CURP"""
+    """
+    Analizador léxico y sintáctico para CURP
+
+    Sin estado por instancia (__slots__ vacío): todas las producciones trabajan
+    sobre variables locales, así que una misma instancia puede usarse desde
+    cualquier número de hilos a la vez.
+    """
+    
+    __slots__ = ()
     
     # Tokens léxicos
     VOCALES = 'AEIOU'
@@ -50,23 +66,11 @@ class GeneradorCURP:
     # Tabla para cálculo de homoclave
     TABLA_HOMOCLAVE = "0123456789ABCDEFGHIJKLMNÑOPQRSTUVWXYZ"
     
-    def __init__(self):
-        self.tokens = []
-        self.posicion = 0
-    
     # ==================== FASE 1: ANÁLISIS LÉXICO ====================
     
     def normalizar_texto(self, texto: str) -> str:
         """Tokenización: Normaliza texto removiendo acentos y caracteres especiales"""
-        if not texto:
-            return ""
-        # Remover acentos (normalización NFD)
-        texto = unicodedata.normalize('NFD', texto)
-        texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
-        # Convertir a mayúsculas y limpiar
-        texto = texto.upper()
-        texto = re.sub(r'[^A-ZÑ\s]', '', texto)
-        return texto.strip()
+        return normalizar_texto(texto)
     
     def extraer_primera_vocal_interna(self, palabra: str) -> str:
         """Análisis léxico: Extrae primera vocal después de la inicial"""
@@ -107,11 +111,14 @@ class GeneradorCURP:
         Producción: <iniciales> ::= <letra1> <vocal> <letra3> <letra4>
         Reglas sintácticas para las 4 iniciales de la CURP
         """
-        ap_paterno = self.normalizar_texto(ap_paterno)
-        ap_materno = self.normalizar_texto(ap_materno)
-        nombre = self.normalizar_texto(nombre)
-        nombre_principal = self.seleccionar_nombre_principal(nombre)
-        
+        return self._iniciales(
+            self.normalizar_texto(ap_paterno),
+            self.normalizar_texto(ap_materno),
+            self.seleccionar_nombre_principal(self.normalizar_texto(nombre))
+        )
+    
+    def _iniciales(self, ap_paterno: str, ap_materno: str, nombre_principal: str) -> str:
+        """generar_iniciales() sobre apellidos normalizados y el nombre principal ya elegido"""
         # Aplicar gramática
         letra1 = ap_paterno[0] if ap_paterno else 'X'
         vocal = self.extraer_primera_vocal_interna(ap_paterno)
@@ -131,6 +138,13 @@ class GeneradorCURP:
         Producción: <fecha> ::= <año> <mes> <día>
         Valida y formatea la fecha según la gramática
         """
+        if (len(fecha_str) == 10 and fecha_str[2] == '/' and fecha_str[5] == '/' and
+                fecha_str.isascii()):
+            # Camino rápido DD/MM/AAAA: mismas reglas de calendario que strptime
+            dia, mes, año = fecha_str[0:2], fecha_str[3:5], fecha_str[6:10]
+            if (año.isdigit() and int(año) > 0 and mes + dia in _MESES_DIAS_VALIDOS and
+                    (mes + dia != '0229' or _es_bisiesto(int(año)))):
+                return año[2:] + mes + dia
         try:
             fecha = datetime.strptime(fecha_str, '%d/%m/%Y')
             año = fecha.strftime('%y')
@@ -163,11 +177,14 @@ class GeneradorCURP:
         Producción: <consonantes> ::= <cons1> <cons2> <cons3>
         Extrae las consonantes internas según la gramática
         """
-        ap_paterno = self.normalizar_texto(ap_paterno)
-        ap_materno = self.normalizar_texto(ap_materno)
-        nombre = self.normalizar_texto(nombre)
-        nombre_principal = self.seleccionar_nombre_principal(nombre)
-        
+        return self._consonantes(
+            self.normalizar_texto(ap_paterno),
+            self.normalizar_texto(ap_materno),
+            self.seleccionar_nombre_principal(self.normalizar_texto(nombre))
+        )
+    
+    def _consonantes(self, ap_paterno: str, ap_materno: str, nombre_principal: str) -> str:
+        """generar_consonantes() sobre apellidos normalizados y el nombre principal ya elegido"""
         cons1 = self.extraer_primera_consonante_interna(ap_paterno)
         cons2 = self.extraer_primera_consonante_interna(ap_materno) if ap_materno else 'X'
         cons3 = self.extraer_primera_consonante_interna(nombre_principal) if nombre_principal else 'X'
@@ -181,11 +198,7 @@ class GeneradorCURP:
         """
         suma = 0
         for i, char in enumerate(curp_parcial):
-            if char in self.TABLA_HOMOCLAVE:
-                valor = self.TABLA_HOMOCLAVE.index(char)
-            else:
-                valor = 0
-            suma += valor * (18 - i)
+            suma += _VALOR_HOMOCLAVE.get(char, 0) * (18 - i)
         
         residuo = suma % 10
         digito = (10 - residuo) % 10
@@ -199,6 +212,30 @@ class GeneradorCURP:
         """Alias para compatibilidad con app.py"""
         return self.generar(datos)
     
+    def analizar(self, datos: Dict[str, str]) -> 'PersonaNormalizada':
+        """
+        Paso de análisis de generar(): normaliza cada campo una sola vez y
+        valida fecha, sexo y entidad
+        """
+        inicio = perf_counter()
+        ap_paterno = self.normalizar_texto(datos['apellido_paterno'])
+        ap_materno = self.normalizar_texto(datos['apellido_materno'])
+        nombre_principal = self.seleccionar_nombre_principal(self.normalizar_texto(datos['nombre']))
+        t = perf_counter()
+        _FASES['normalizacion'].observar(t - inicio)
+        
+        fecha = self.generar_fecha(datos['fecha_nacimiento'])
+        _FASES['fecha'].observar(perf_counter() - t)
+        
+        return PersonaNormalizada(
+            ap_paterno,
+            ap_materno,
+            nombre_principal,
+            fecha,
+            self.generar_sexo(datos['sexo']),
+            self.validar_entidad(datos['estado'])
+        )
+    
     def generar(self, datos: Dict[str, str]) -> str:
         """
         Método principal: Genera CURP completa aplicando todas las producciones
@@ -206,27 +243,24 @@ class GeneradorCURP:
         CURP ::= <iniciales> <fecha> <sexo> <entidad> <consonantes> <homoclave>
         """
         try:
-            # Aplicar producciones gramaticales
-            iniciales = self.generar_iniciales(
-                datos['apellido_paterno'],
-                datos['apellido_materno'],
-                datos['nombre']
-            )
+            persona = self.analizar(datos)
+            t = perf_counter()
+            
+            # Aplicar producciones gramaticales sobre el registro ya analizado
+            iniciales = self._iniciales(persona.ap_paterno, persona.ap_materno, persona.nombre_principal)
+            t, anterior = perf_counter(), t
+            _FASES['iniciales'].observar(t - anterior)
             
-            fecha = self.generar_fecha(datos['fecha_nacimiento'])
-            sexo = self.generar_sexo(datos['sexo'])
-            entidad = self.validar_entidad(datos['estado'])
-            consonantes = self.generar_consonantes(
-                datos['apellido_paterno'],
-                datos['apellido_materno'],
-                datos['nombre']
-            )
+            consonantes = self._consonantes(persona.ap_paterno, persona.ap_materno, persona.nombre_principal)
+            t, anterior = perf_counter(), t
+            _FASES['consonantes'].observar(t - anterior)
             
             # Ensamblar CURP parcial
-            curp_parcial = iniciales + fecha + sexo + entidad + consonantes
+            curp_parcial = iniciales + persona.fecha + persona.sexo + persona.entidad + consonantes
             
             # Calcular y añadir homoclave
             homoclave = self.calcular_homoclave(curp_parcial)
+            _FASES['homoclave'].observar(perf_counter() - t)
             curp_completa = curp_parcial + homoclave
             
             return curp_completa
@@ -234,15 +268,217 @@ class GeneradorCURP:
         except Exception as e:
             raise ValueError(f"Error al generar CURP: {str(e)}")
     
+    # ==================== FASE 3b: GENERACIÓN EN LOTE ====================
+    
+    def _partes_apellido_paterno(self, ap_paterno: str) -> str:
+        """<letra1> <vocal> <cons1> de un apellido paterno"""
+        ap_paterno = self.normalizar_texto(ap_paterno)
+        return ((ap_paterno[0] if ap_paterno else 'X') +
+                self.extraer_primera_vocal_interna(ap_paterno) +
+                self.extraer_primera_consonante_interna(ap_paterno))
+    
+    def _partes_apellido_materno(self, ap_materno: str) -> str:
+        """<letra3> <cons2> de un apellido materno"""
+        ap_materno = self.normalizar_texto(ap_materno)
+        if not ap_materno:
+            return 'XX'
+        return ap_materno[0] + self.extraer_primera_consonante_interna(ap_materno)
+    
+    def _partes_nombre(self, nombre: str) -> str:
+        """<letra4> <cons3> del nombre principal"""
+        nombre_principal = self.seleccionar_nombre_principal(self.normalizar_texto(nombre))
+        if not nombre_principal:
+            return 'XX'
+        return nombre_principal[0] + self.extraer_primera_consonante_interna(nombre_principal)
+    
+    @staticmethod
+    def _factorizar(valores: Sequence) -> tuple:
+        """Codifica una columna como (valores únicos, índice de cada fila en ellos)"""
+        unicos = list(dict.fromkeys(valores))
+        posiciones = {valor: i for i, valor in enumerate(unicos)}
+        codigos = np.fromiter(map(posiciones.__getitem__, valores), dtype=np.intp, count=len(valores))
+        return unicos, codigos
+    
+    @staticmethod
+    def _fila_de(codigos, posicion: int) -> int:
+        return int(np.argmax(codigos == posicion))
+    
+    def _columna_codificada(self, valores: Sequence, produccion, ancho: int):
+        """
+        Aplica una producción a cada valor único de la columna y expande el
+        resultado a una matriz (filas, ancho) de puntos de código
+        """
+        unicos, codigos = self._factorizar(valores)
+        resultados = []
+        for posicion, valor in enumerate(unicos):
+            try:
+                resultados.append(produccion(valor))
+            except Exception as e:
+                raise ValueError(f"Error al generar CURP (fila {self._fila_de(codigos, posicion)}): {str(e)}")
+        tabla = np.array(resultados, dtype=f'<U{ancho}').view(np.uint32).reshape(-1, ancho)
+        return tabla[codigos]
+    
+    def _columna_fechas(self, fechas: Sequence):
+        """
+        Producción <fecha> sobre una columna: las fechas con forma DD/MM/AAAA se
+        validan y reordenan como operaciones de arreglo; cualquier otra forma
+        pasa por generar_fecha() para conservar su comportamiento exacto
+        """
+        unicos, codigos = self._factorizar(fechas)
+        texto = np.array([f if isinstance(f, str) and len(f) == 10 else '' for f in unicos], dtype='<U10')
+        cp = texto.view(np.uint32).reshape(-1, 10).astype(np.int64)
+        digitos = cp - ord('0')
+        es_digito = (digitos >= 0) & (digitos <= 9)
+        forma = (es_digito[:, [0, 1, 3, 4, 6, 7, 8, 9]].all(axis=1) &
+                 (cp[:, 2] == ord('/')) & (cp[:, 5] == ord('/')))
+        dia = digitos[:, 0] * 10 + digitos[:, 1]
+        mes = digitos[:, 3] * 10 + digitos[:, 4]
+        año = digitos[:, 6] * 1000 + digitos[:, 7] * 100 + digitos[:, 8] * 10 + digitos[:, 9]
+        bisiesto = (año % 4 == 0) & ((año % 100 != 0) | (año % 400 == 0))
+        dias_mes = _DIAS_POR_MES[np.clip(mes, 0, 12)] + ((mes == 2) & bisiesto)
+        valida = forma & (año >= 1) & (mes >= 1) & (mes <= 12) & (dia >= 1) & (dia <= dias_mes)
+        
+        tabla = cp[:, [8, 9, 3, 4, 0, 1]].astype(np.uint32)
+        for posicion in np.flatnonzero(~valida):
+            try:
+                tabla[posicion] = [ord(c) for c in self.generar_fecha(unicos[posicion])]
+            except Exception as e:
+                raise ValueError(f"Error al generar CURP (fila {self._fila_de(codigos, posicion)}): {str(e)}")
+        return tabla[codigos]
+    
+    def generar_lote(self, apellidos_paternos: Sequence[str], apellidos_maternos: Sequence[str],
+                     nombres: Sequence[str], fechas: Sequence[str], sexos: Sequence[str],
+                     estados: Sequence[str]):
+        """
+        Generación columnar: produce la CURP de cada fila, idéntica a generar().
+        
+        Cada producción se evalúa una sola vez por valor distinto de su columna;
+        el ensamblado, el filtro de palabras prohibidas y la homoclave se
+        calculan como operaciones de arreglo sobre una matriz de puntos de código.
+        Retorna un arreglo NumPy '<U18' (o una lista si NumPy no está disponible).
+        """
+        columnas = (apellidos_paternos, apellidos_maternos, nombres, fechas, sexos, estados)
+        n = len(apellidos_paternos)
+        if any(len(columna) != n for columna in columnas):
+            raise ValueError("Todas las columnas deben tener la misma longitud")
+        
+        if np is None:
+            campos = ('apellido_paterno', 'apellido_materno', 'nombre',
+                      'fecha_nacimiento', 'sexo', 'estado')
+            return [self.generar(dict(zip(campos, fila))) for fila in zip(*columnas)]
+        
+        paterno = self._columna_codificada(apellidos_paternos, self._partes_apellido_paterno, 3)
+        materno = self._columna_codificada(apellidos_maternos, self._partes_apellido_materno, 2)
+        nombre = self._columna_codificada(nombres, self._partes_nombre, 2)
+        fecha = self._columna_fechas(fechas)
+        sexo = self._columna_codificada(sexos, self.generar_sexo, 1)
+        entidad = self._columna_codificada(estados, self.validar_entidad, 2)
+        
+        curps = np.empty((n, 18), dtype=np.uint32)
+        curps[:, 0:2] = paterno[:, 0:2]
+        curps[:, 2] = materno[:, 0]
+        curps[:, 3] = nombre[:, 0]
+        curps[:, 4:10] = fecha
+        curps[:, 10] = sexo[:, 0]
+        curps[:, 11:13] = entidad
+        curps[:, 13] = paterno[:, 2]
+        curps[:, 14] = materno[:, 1]
+        curps[:, 15] = nombre[:, 1]
+        
+        # Filtro léxico sobre las cuatro iniciales
+        iniciales = np.ascontiguousarray(curps[:, 0:4]).view('<U4').ravel()
+        prohibidas = np.isin(iniciales, np.array(sorted(self.PALABRAS_PROHIBIDAS)))
+        curps[prohibidas, 3] = ord('X')
+        
+        # Homoclave: suma ponderada con pesos 18..3 sobre la tabla de valores
+        valores = _VALORES_HOMOCLAVE[np.minimum(curps[:, 0:16], len(_VALORES_HOMOCLAVE) - 1)]
+        suma = valores @ np.arange(18, 2, -1, dtype=np.int64)
+        digito = (10 - suma % 10) % 10
+        curps[:, 16] = digito + ord('0')
+        curps[:, 17] = curps[:, 16]
+        
+        return curps.view('<U18').ravel()
+    
     # ==================== FASE 4: VALIDACIÓN ====================
     
-    def validar_curp_sintaxis(self, curp: str) -> Dict:
+    def validar_curp_sintaxis(self, curp: str, detalle: bool = True) -> Dict:
         """Alias para compatibilidad con app.py"""
-        return self.validar_sintaxis(curp)
+        return self.validar_sintaxis(curp, detalle)
     
-    def validar_sintaxis(self, curp: str) -> Dict:
+    def validar_sintaxis(self, curp: str, detalle: bool = True) -> Dict:
         """
         Validador sintáctico: Verifica que la CURP cumpla con la gramática BNF
+        
+        Recorre las 18 posiciones una sola vez contra la tabla de clases por
+        posición (_CLASES_POSICION), la tabla de entidades y la tabla de días
+        válidos por mes. Con detalle=False omite los mensajes de 'detalles'.
+        """
+        curp = curp.upper().strip()
+        resultado = {
+            'curp': curp,
+            'valida': True,
+            'errores': [],
+            'tokens': {},
+            'detalles': []
+        }
+        
+        if len(curp) != 18:
+            resultado['valida'] = False
+            resultado['errores'].append(f"Longitud incorrecta: {len(curp)} (esperado: 18)")
+            return resultado
+        
+        for char, clase in zip(curp, _CLASES_POSICION):
+            if char not in clase:
+                if any(c.isdecimal() and c not in self.DIGITOS for c in curp):
+                    # \d de la gramática acepta dígitos Unicode: conservar ese caso
+                    return self._validar_sintaxis_regex(curp, detalle)
+                resultado['valida'] = False
+                resultado['errores'].append("No cumple con la gramática BNF de CURP")
+                return resultado
+        
+        estado = self.ESTADOS.get(curp[11:13])
+        if estado is None:
+            resultado['valida'] = False
+            resultado['errores'].append("No cumple con la gramática BNF de CURP")
+            return resultado
+        
+        tokens = resultado['tokens']
+        tokens['iniciales'] = curp[0:4]
+        
+        año = curp[4:6]
+        mes_dia = curp[6:10]
+        siglo = '20' if int(año) <= datetime.now().year % 100 else '19'
+        año_completo = siglo + año
+        if mes_dia not in _MESES_DIAS_VALIDOS or (mes_dia == '0229' and not _es_bisiesto(int(año_completo))):
+            # Fecha imposible: strptime produce el mensaje de error original
+            try:
+                datetime.strptime(f"{año_completo}{mes_dia}", "%Y%m%d")
+            except ValueError as e:
+                resultado['valida'] = False
+                resultado['errores'].append(f"Error en análisis léxico: {str(e)}")
+            return resultado
+        
+        fecha = f"{curp[8:10]}/{curp[6:8]}/{año_completo}"
+        sexo = _SEXOS[curp[10]]
+        tokens['fecha'] = fecha
+        tokens['sexo'] = sexo
+        tokens['estado'] = estado
+        tokens['consonantes'] = curp[13:16]
+        tokens['homoclave'] = curp[16:18]
+        
+        if detalle:
+            resultado['detalles'] = [
+                f"✓ Fecha válida: {fecha}",
+                f"✓ Sexo: {sexo}",
+                f"✓ Estado: {estado}",
+            ]
+        
+        return resultado
+    
+    def _validar_sintaxis_regex(self, curp: str, detalle: bool = True) -> Dict:
+        """
+        Validador sintáctico original (expresión regular + strptime); se
+        conserva como referencia para pruebas de equivalencia
         """
         curp = curp.upper().strip()
         resultado = {
@@ -307,9 +543,120 @@ class GeneradorCURP:
             resultado['valida'] = False
             resultado['errores'].append(f"Error en análisis léxico: {str(e)}")
         
+        if not detalle:
+            resultado['detalles'] = []
         return resultado
 
 
+CAMPOS_REQUERIDOS = ['apellido_paterno', 'apellido_materno', 'nombre',
+                     'fecha_nacimiento', 'sexo', 'estado']
+
+def verificar_datos_persona(data: Dict) -> Optional[str]:
+    """Aplica las verificaciones previas a la generación; retorna el mensaje de error o None"""
+    for field in CAMPOS_REQUERIDOS:
+        if field not in data or not data[field]:
+            return f'Falta el campo: {field.replace("_", " ")}'
+    
+    try:
+        fecha = datetime.strptime(data['fecha_nacimiento'], '%d/%m/%Y')
+        if fecha > datetime.now():
+            return 'Fecha futura no válida'
+        if fecha.year < 1900:
+            return 'Fecha anterior a 1900 no válida'
+    except ValueError:
+        return 'Formato de fecha inválido'
+    
+    if data['sexo'].upper() not in ['H', 'M', 'X']:
+        return 'Sexo inválido'
+    
+    if data['estado'].upper() not in GeneradorCURP.ESTADOS:
+        return 'Estado inválido'
+    
+    return None
+
+def generar_fila(generador: GeneradorCURP, data: Optional[Dict]) -> Dict:
+    """Resultado de una fila de un lote de personas (None = fila mal formada)"""
+    if data is None:
+        return {'success': False, 'error': 'Fila mal formada'}
+    try:
+        error = verificar_datos_persona(data)
+        if error:
+            return {'success': False, 'error': error}
+        return {'success': True, 'curp': generador.generar_curp(data)}
+    except Exception as e:
+        return {'success': False, 'error': f'Error al generar CURP: {str(e)}'}
+
+
+class PersonaNormalizada:
+    """Campos de una persona tal como los leen las producciones de generar()"""
+    
+    __slots__ = ('ap_paterno', 'ap_materno', 'nombre_principal', 'fecha', 'sexo', 'entidad')
+    
+    def __init__(self, ap_paterno, ap_materno, nombre_principal, fecha, sexo, entidad):
+        self.ap_paterno = ap_paterno
+        self.ap_materno = ap_materno
+        self.nombre_principal = nombre_principal
+        self.fecha = fecha  # AAMMDD
+        self.sexo = sexo
+        self.entidad = entidad
+
+
+# Histogramas de las fases de generar(), resueltos una sola vez
+_FASES = {
+    fase: registro.histograma('curp_fase_segundos', fase=f'generar.{fase}')
+    for fase in ('normalizacion', 'iniciales', 'fecha', 'consonantes', 'homoclave')
+}
+
+# Tablas precompiladas del validador sintáctico
+_LETRAS = frozenset(GeneradorCURP.ALFABETO)
+_DIGITOS = frozenset(GeneradorCURP.DIGITOS)
+_CLASES_POSICION = (
+    (_LETRAS,) * 4 +
+    (_DIGITOS,) * 6 +
+    (frozenset('HMX'),) +
+    (_LETRAS,) * 2 +
+    (frozenset(GeneradorCURP.CONSONANTES),) * 3 +
+    (frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'),) * 2
+)
+_DIAS_MES = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_MESES_DIAS_VALIDOS = frozenset(
+    f"{mes:02d}{dia:02d}" for mes, dias in enumerate(_DIAS_MES, start=1) for dia in range(1, dias + 1)
+)
+_SEXOS = {'H': 'Hombre', 'M': 'Mujer', 'X': 'No binario'}
+_VALOR_HOMOCLAVE = {char: valor for valor, char in enumerate(GeneradorCURP.TABLA_HOMOCLAVE)}
+
+def _es_bisiesto(año: int) -> bool:
+    return año % 4 == 0 and (año % 100 != 0 or año % 400 == 0)
+
+# Prefijo del mensaje de error -> tipo de error, para reportes agregados
+TIPOS_ERROR = (
+    ('Longitud incorrecta', 'longitud'),
+    ('No cumple con la gramática', 'gramatica'),
+    ('Error en análisis léxico', 'fecha'),
+    ('Estado inválido', 'estado'),
+    ('Línea mal formada', 'formato'),
+)
+
+def tipo_error(validacion: Dict):
+    """Tipo del primer error de un resultado de validar_sintaxis (None si es válida)"""
+    if validacion['valida']:
+        return None
+    for mensaje in validacion['errores']:
+        for prefijo, tipo in TIPOS_ERROR:
+            if mensaje.startswith(prefijo):
+                return tipo
+    return 'otro'
+
+
+if np is not None:
+    # Valor de cada punto de código en TABLA_HOMOCLAVE (0 si no aparece);
+    # la última casilla absorbe cualquier punto de código mayor
+    _VALORES_HOMOCLAVE = np.zeros(max(map(ord, GeneradorCURP.TABLA_HOMOCLAVE)) + 2, dtype=np.int64)
+    for _valor, _char in enumerate(GeneradorCURP.TABLA_HOMOCLAVE):
+        _VALORES_HOMOCLAVE[ord(_char)] = _valor
+    _DIAS_POR_MES = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+
+
 # ==================== EJEMPLO DE USO ====================
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+"""
+Configuración de gunicorn (se lee sola al ejecutar gunicorn en este directorio)
+Con preload_app la aplicación, los diccionarios y sus índices se cargan una
+vez en el proceso maestro y los workers los comparten copia-en-escritura.
+
+Uso:
+    gunicorn app:app
+    gunicorn app_async:aplicacion -k uvicorn.workers.UvicornWorker
+
+Variables de entorno:
+    CURP_PRELOAD    1 (por omisión) carga la aplicación en el maestro; 0 en cada worker
+    CURP_WORKERS    número de workers (por omisión, núcleos disponibles)
+    CURP_BIND       dirección de escucha (por omisión 0.0.0.0:8000)
+"""
+
+import gc
+import os
+import sys
+
+bind = os.environ.get('CURP_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('CURP_WORKERS', 0)) or os.cpu_count() or 1
+preload_app = os.environ.get('CURP_PRELOAD', '1') != '0'
+
+
+def when_ready(server):
+    # El recolector escribe en el encabezado de cada objeto que recorre, lo que
+    # copiaría en cada worker las páginas heredadas; congelar los objetos del
+    # maestro los saca de sus recorridos
+    if preload_app:
+        gc.freeze()
+
+
+def worker_exit(server, worker):
+    # Aciertos, fallos y accesos que la cache SQLite aún tiene en memoria
+    app = sys.modules.get('app')
+    cache = getattr(app, 'curps_cache', None)
+    if hasattr(cache, 'escribir_pendientes'):
+        cache.escribir_pendientes()
@@ -0,0 +1,48 @@
+"""
+Índice precomputado de un diccionario con claves plegadas (sin acentos)
+'GARCIA' y 'GARCÍA' comparten una sola clave que recuerda su ortografía
+"""
+
+from normalizacion import plegar
+
+
+class IndiceDiccionario:
+    """
+    Claves plegadas congeladas con su ortografía de presentación.
+
+    Se construye una vez por diccionario; la pertenencia es O(1) y el motor
+    de sugerencias recorre cada clave una sola vez, sin duplicados por acento.
+    """
+
+    __slots__ = ('claves', 'presentacion')
+    en_disco = False
+
+    def __init__(self, palabras):
+        presentacion = {}
+        for palabra in sorted(palabras):
+            clave = plegar(palabra)
+            if not clave:
+                continue
+            actual = presentacion.get(clave)
+            # Se prefiere la ortografía acentuada ('GARCÍA' sobre 'GARCIA')
+            if actual is None or (palabra != clave and actual == clave):
+                presentacion[clave] = palabra
+        self.presentacion = presentacion
+        self.claves = frozenset(presentacion)
+
+    def __len__(self):
+        return len(self.claves)
+
+    def __contains__(self, clave):
+        return clave in self.claves
+
+    def __iter__(self):
+        return iter(self.claves)
+
+    def mostrar(self, clave):
+        """Ortografía de presentación de una clave plegada"""
+        return self.presentacion.get(clave, clave)
+
+    def contiene_texto(self, texto):
+        """Pertenencia del texto plegado"""
+        return plegar(texto) in self.claves
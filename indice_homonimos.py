@@ -0,0 +1,79 @@
+"""
+Índice de homónimos: CURPs que comparten los primeros 16 caracteres
+calcular_homoclave asigna la misma homoclave a toda raíz igual, así que las
+personas con raíz igual colisionan y deben desambiguarse por otros datos
+"""
+
+import threading
+from collections import OrderedDict
+from itertools import islice
+
+LONGITUD_RAIZ = 16
+
+
+def raiz_curp(curp: str) -> str:
+    return curp[:LONGITUD_RAIZ]
+
+
+class IndiceHomonimos:
+    """
+    Agrupa registros por raíz de CURP con consultas O(1).
+
+    Cada registro es (curp, referencia): la referencia distingue a personas
+    distintas con la misma raíz (p. ej. sus datos normalizados); por omisión
+    es la propia CURP. Con max_registros se descartan los más antiguos.
+    Seguro para usarse desde varios hilos, pero propio de cada proceso: con
+    varios workers se usa IndiceHomonimosSQLite (cache_compartido).
+    """
+
+    def __init__(self, max_registros=None):
+        self.max_registros = max_registros
+        self._grupos = {}  # raiz -> {referencia: curp}
+        self._orden = OrderedDict()  # (raiz, referencia) en orden de llegada
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._orden)
+
+    def agregar(self, curp: str, referencia: str = None):
+        raiz = raiz_curp(curp)
+        referencia = curp if referencia is None else referencia
+        with self._lock:
+            self._grupos.setdefault(raiz, {})[referencia] = curp
+            self._orden[(raiz, referencia)] = None
+            self._orden.move_to_end((raiz, referencia))
+            if self.max_registros is not None:
+                while len(self._orden) > self.max_registros:
+                    self._quitar(*self._orden.popitem(last=False)[0])
+
+    def _quitar(self, raiz, referencia):
+        grupo = self._grupos.get(raiz)
+        if grupo is None:
+            return
+        grupo.pop(referencia, None)
+        if not grupo:
+            del self._grupos[raiz]
+
+    def cantidad(self, raiz: str) -> int:
+        """Cuántos registros comparten la raíz (acepta también una CURP completa)"""
+        with self._lock:
+            return len(self._grupos.get(raiz_curp(raiz), ()))
+
+    def consultar(self, raiz: str) -> list:
+        """[(referencia, curp)] de los registros que comparten la raíz"""
+        with self._lock:
+            return list(self._grupos.get(raiz_curp(raiz), {}).items())
+
+    def colisiones(self, minimo=2, limite=None) -> dict:
+        """Hasta `limite` raíces con al menos `minimo` registros, en orden alfabético"""
+        with self._lock:
+            raices = sorted(raiz for raiz, grupo in self._grupos.items() if len(grupo) >= minimo)
+            return {raiz: list(self._grupos[raiz].items()) for raiz in islice(raices, limite)}
+
+    def limpiar(self):
+        with self._lock:
+            cantidad = len(self._orden)
+            self._grupos.clear()
+            self._orden.clear()
+            return cantidad
+
@@ -0,0 +1,79 @@
+"""
+Índice difuso (árbol BK) para sugerencias ortográficas
+Evita comparar cada consulta contra todo el diccionario
+"""
+
+
+class IndiceBK:
+    """
+    Árbol BK sobre un conjunto de palabras con una métrica de distancia.
+
+    Cada nodo guarda una palabra y sus hijos indexados por la distancia a
+    ella; la desigualdad triangular permite descartar ramas completas.
+    preparar_consulta(texto), si se da, retorna una función (palabra, cota) ->
+    distancia que reutiliza el preprocesamiento de la consulta durante toda la
+    búsqueda y puede abandonar (retornando cota + 1) en cuanto la distancia
+    supera la cota; ningún nodo necesita distancias mayores que
+    radio + la mayor distancia a sus hijos.
+    """
+
+    def __init__(self, palabras, distancia, preparar_consulta=None):
+        self.distancia = distancia
+        self.preparar_consulta = preparar_consulta
+        self.raiz = None
+        self.tamaño = 0
+        for palabra in palabras:
+            self.agregar(palabra)
+
+    def __len__(self):
+        return self.tamaño
+
+    def agregar(self, palabra):
+        if self.raiz is None:
+            self.raiz = (palabra, {})
+            self.tamaño = 1
+            return
+        nodo = self.raiz
+        while True:
+            d = self.distancia(palabra, nodo[0])
+            if d == 0:
+                return
+            hijo = nodo[1].get(d)
+            if hijo is None:
+                nodo[1][d] = (palabra, {})
+                self.tamaño += 1
+                return
+            nodo = hijo
+
+    def buscar(self, texto, radio):
+        """Retorna [(palabra, distancia)] de todas las palabras a distancia <= radio"""
+        if self.raiz is None:
+            return []
+        if self.preparar_consulta is not None:
+            medir = self.preparar_consulta(texto)
+        else:
+            medir = lambda palabra, cota: self.distancia(texto, palabra)
+        encontradas = []
+        pendientes = [self.raiz]
+        while pendientes:
+            palabra, hijos = pendientes.pop()
+            d = medir(palabra, radio + max(hijos, default=0))
+            if d <= radio:
+                encontradas.append((palabra, d))
+            for distancia_hijo, hijo in hijos.items():
+                if d - radio <= distancia_hijo <= d + radio:
+                    pendientes.append(hijo)
+        return encontradas
+
+
+def radio_para_umbral(longitud, umbral_similitud):
+    """
+    Distancia máxima que aún puede alcanzar el umbral de similitud.
+
+    similitud = (1 - d / max_len) * 100 y max_len <= longitud + d, así que
+    similitud <= 100 * longitud / (longitud + d); se deja margen para el
+    redondeo a dos decimales de calcular_similitud.
+    """
+    if umbral_similitud <= 0.005:
+        return None
+    return int(longitud * (100 / (umbral_similitud - 0.005) - 1))
@@ -0,0 +1,140 @@
+"""
+Instantánea de las estructuras derivadas de los diccionarios
+Los árboles BK y las cubetas fonéticas de sugerencias y los tries de
+autocompletado se serializan en un archivo que cada worker carga al arrancar
+en lugar de reconstruirlos; el archivo lleva la huella de los módulos fuente
+y se descarta cuando alguno de ellos cambia. Importar la aplicación nunca
+escribe el archivo: se construye con este módulo, p. ej. al desplegar.
+
+Uso:
+    python instantanea.py construir [RUTA]   # por omisión CURP_INSTANTANEA
+
+Variables de entorno:
+    CURP_INSTANTANEA    ruta del archivo (por omisión, curp_instantanea.pickle
+                        junto a este módulo); vacía para no usarla
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import time
+from functools import lru_cache, wraps
+
+RUTA = os.environ.get('CURP_INSTANTANEA',
+                      os.path.join(os.path.dirname(os.path.abspath(__file__)), 'curp_instantanea.pickle'))
+VERSION = 1
+
+# Módulos cuyo contenido determina las estructuras guardadas
+FUENTES = (
+    'diccionario_nombres.py', 'diccionario_apellidos.py', 'indice_diccionario.py',
+    'indice_sugerencias.py', 'normalizacion.py', 'validador_ortografico.py',
+    'autocompletado.py', 'fonetica.py', 'instantanea.py',
+)
+
+_cargadas = {}
+_constructores = {}
+
+
+def estructura(nombre, diccionario):
+    """
+    Registra la función que construye la estructura `nombre` sobre
+    `diccionario`. La función decorada retorna la copia de la instantánea
+    cargada o, si no la hay, la construye en el primer uso (como lru_cache).
+    Las estructuras sobre diccionarios en disco no se guardan.
+    """
+    def decorar(construir):
+        @lru_cache(maxsize=None)
+        @wraps(construir)
+        def obtener():
+            valor = _cargadas.get(nombre)
+            return valor if valor is not None else construir()
+
+        if not getattr(diccionario, 'en_disco', False):
+            _constructores[nombre] = (construir, obtener)
+        return obtener
+    return decorar
+
+
+def _registrar_todas():
+    # Importarlos registra sus constructores
+    import autocompletado  # noqa: F401
+    import validador_ortografico  # noqa: F401
+
+
+def huella():
+    """Resumen de las fuentes, las variables que cambian diccionarios y la versión de Python"""
+    base = os.path.dirname(os.path.abspath(__file__))
+    resumen = hashlib.sha256(f'{VERSION}|{sys.version}'.encode())
+    for fuente in FUENTES:
+        with open(os.path.join(base, fuente), 'rb') as archivo:
+            resumen.update(fuente.encode() + b'\0' + archivo.read())
+    for variable in ('CURP_DICCIONARIO_NOMBRES', 'CURP_DICCIONARIO_APELLIDOS'):
+        resumen.update(f'{variable}={os.environ.get(variable, "")}'.encode())
+    return resumen.hexdigest()
+
+
+def construir(ruta=RUTA):
+    """
+    Construye todas las estructuras registradas y las escribe de forma
+    atómica; si el directorio no admite escritura solo las retorna
+    """
+    _registrar_todas()
+    estructuras = {nombre: funcion() for nombre, (funcion, _) in _constructores.items()}
+    if not os.access(os.path.dirname(os.path.abspath(ruta)), os.W_OK):
+        return estructuras
+    temporal = f'{ruta}.{os.getpid()}.tmp'
+    try:
+        with open(temporal, 'wb') as archivo:
+            pickle.dump((huella(), estructuras), archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return estructuras
+
+
+def cargar(ruta=RUTA):
+    """
+    Estructuras de la instantánea si su huella coincide con las fuentes
+    actuales; None si no existe, está dañada o es de otra versión
+    """
+    try:
+        with open(ruta, 'rb') as archivo:
+            guardada, estructuras = pickle.load(archivo)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError):
+        return None
+    return estructuras if guardada == huella() else None
+
+
+def precargar(ruta=RUTA):
+    """
+    Carga la instantánea, si la hay y está al día, y materializa todas las
+    estructuras registradas (las que falten se construyen en memoria, sin
+    escribir nada). Llamada en el proceso maestro de gunicorn con
+    preload_app, los workers las heredan por fork y comparten sus páginas.
+    Retorna los segundos que tardó.
+    """
+    inicio = time.perf_counter()
+    _registrar_todas()
+    if ruta:
+        _cargadas.update(cargar(ruta) or {})
+    for _, obtener in _constructores.values():
+        obtener()
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != 'construir':
+        print(__doc__.strip())
+        sys.exit(2)
+    # Los módulos registran sus constructores en `instantanea`, no en __main__
+    import instantanea
+    destino = sys.argv[2] if len(sys.argv) > 2 else RUTA
+    inicio = time.perf_counter()
+    construidas = instantanea.construir(destino)
+    if not os.path.exists(destino):
+        print(f"❌ Sin permiso de escritura para {destino}")
+        sys.exit(1)
+    print(f"✅ {len(construidas)} estructuras en {destino} "
+          f"({os.path.getsize(destino):,} bytes, {time.perf_counter() - inicio:.2f} s)")
@@ -0,0 +1,170 @@
+"""
+Instrumentación de bajo costo: contadores e histogramas de latencia
+exportables en formato de texto de Prometheus
+"""
+
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+# Límites superiores (segundos) de las cubetas de latencia
+LIMITES_LATENCIA = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+CUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histograma:
+    """Histograma de cubetas fijas; observar() es O(log cubetas)"""
+
+    __slots__ = ('limites', 'cuentas', 'suma', 'total', '_lock')
+
+    def __init__(self, limites=LIMITES_LATENCIA):
+        self.limites = limites
+        self.cuentas = [0] * (len(limites) + 1)
+        self.suma = 0.0
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def observar(self, valor):
+        indice = bisect_left(self.limites, valor)
+        with self._lock:
+            self.cuentas[indice] += 1
+            self.suma += valor
+            self.total += 1
+
+    def cuantil(self, q):
+        """Estimación por interpolación lineal dentro de la cubeta que contiene q"""
+        with self._lock:
+            cuentas = list(self.cuentas)
+            total = self.total
+        if total == 0:
+            return 0.0
+        objetivo = q * total
+        acumulado = 0
+        for indice, cuenta in enumerate(cuentas):
+            if cuenta and acumulado + cuenta >= objetivo:
+                if indice == len(self.limites):
+                    return self.limites[-1]
+                inferior = self.limites[indice - 1] if indice else 0.0
+                superior = self.limites[indice]
+                return inferior + (superior - inferior) * (objetivo - acumulado) / cuenta
+            acumulado += cuenta
+        return self.limites[-1]
+
+
+class Cronometro:
+    """Context manager que observa la duración de un bloque en un histograma"""
+
+    __slots__ = ('histograma', 'inicio')
+
+    def __init__(self, histograma):
+        self.histograma = histograma
+
+    def __enter__(self):
+        self.inicio = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histograma.observar(perf_counter() - self.inicio)
+        return False
+
+
+def _etiquetas(etiquetas):
+    return tuple(sorted(etiquetas.items()))
+
+
+def _formatear_etiquetas(etiquetas, extra=()):
+    pares = list(etiquetas) + list(extra)
+    if not pares:
+        return ''
+    texto = ','.join('{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+                     for k, v in pares)
+    return '{' + texto + '}'
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class RegistroMetricas:
+    """Colección de métricas con nombre y etiquetas"""
+
+    def __init__(self):
+        self._histogramas = {}  # (nombre, etiquetas) -> Histograma
+        self._contadores = {}  # (nombre, etiquetas) -> int
+        self._ayuda = {}
+        self._lock = threading.Lock()
+
+    def describir(self, nombre, ayuda):
+        self._ayuda[nombre] = ayuda
+
+    def histograma(self, nombre, **etiquetas):
+        clave = (nombre, _etiquetas(etiquetas))
+        histograma = self._histogramas.get(clave)
+        if histograma is None:
+            with self._lock:
+                histograma = self._histogramas.setdefault(clave, Histograma())
+        return histograma
+
+    def observar(self, nombre, valor, **etiquetas):
+        self.histograma(nombre, **etiquetas).observar(valor)
+
+    def cronometro(self, nombre, **etiquetas):
+        return Cronometro(self.histograma(nombre, **etiquetas))
+
+    def incrementar(self, nombre, cantidad=1, **etiquetas):
+        clave = (nombre, _etiquetas(etiquetas))
+        with self._lock:
+            self._contadores[clave] = self._contadores.get(clave, 0) + cantidad
+
+    def exportar_prometheus(self):
+        """Texto en formato de exposición de Prometheus (version 0.0.4)"""
+        with self._lock:
+            contadores = sorted(self._contadores.items())
+            histogramas = sorted(self._histogramas.items(), key=lambda par: par[0])
+        lineas = []
+        anterior = None
+        for (nombre, etiquetas), valor in contadores:
+            if nombre != anterior:
+                if nombre in self._ayuda:
+                    lineas.append(f'# HELP {nombre} {self._ayuda[nombre]}')
+                lineas.append(f'# TYPE {nombre} counter')
+                anterior = nombre
+            lineas.append(f'{nombre}{_formatear_etiquetas(etiquetas)} {valor}')
+        for tipo in ('histogram', 'gauge'):
+            anterior = None
+            for (nombre, etiquetas), histograma in histogramas:
+                nombre_salida = nombre if tipo == 'histogram' else f'{nombre}_cuantil'
+                if nombre_salida != anterior:
+                    if nombre in self._ayuda:
+                        lineas.append(f'# HELP {nombre_salida} {self._ayuda[nombre]}')
+                    lineas.append(f'# TYPE {nombre_salida} {tipo}')
+                    anterior = nombre_salida
+                if tipo == 'gauge':
+                    for q in CUANTILES:
+                        lineas.append(f'{nombre_salida}{_formatear_etiquetas(etiquetas, [("quantile", q)])} '
+                                      f'{_numero(histograma.cuantil(q))}')
+                    continue
+                with histograma._lock:
+                    cuentas = list(histograma.cuentas)
+                    suma, total = histograma.suma, histograma.total
+                acumulado = 0
+                for limite, cuenta in zip(histograma.limites, cuentas):
+                    acumulado += cuenta
+                    lineas.append(f'{nombre}_bucket{_formatear_etiquetas(etiquetas, [("le", limite)])} {acumulado}')
+                lineas.append(f'{nombre}_bucket{_formatear_etiquetas(etiquetas, [("le", "+Inf")])} {total}')
+                lineas.append(f'{nombre}_sum{_formatear_etiquetas(etiquetas)} {_numero(suma)}')
+                lineas.append(f'{nombre}_count{_formatear_etiquetas(etiquetas)} {total}')
+        return '\n'.join(lineas) + '\n'
+
+
+# Registro global del proceso
+registro = RegistroMetricas()
+registro.describir('curp_http_peticiones_total', 'Peticiones atendidas por ruta, método y código')
+registro.describir('curp_http_errores_total', 'Peticiones con código >= 400 por ruta')
+registro.describir('curp_http_latencia_segundos', 'Latencia de las peticiones por ruta')
+registro.describir('curp_fase_segundos', 'Duración de las fases internas de generación y validación')
+registro.describir('curp_arranque_instantanea_segundos', 'Carga o reconstrucción de los índices de diccionario al arrancar')
+registro.describir('curp_sugerencias_total', 'Búsquedas de sugerencias por origen (fonetica, distancia o disco)')
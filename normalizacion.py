@@ -0,0 +1,38 @@
+"""
+Normalización léxica compartida: quita acentos, pasa a mayúsculas y
+elimina todo lo que no sea letra o espacio
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+_NO_LETRAS = re.compile(r'[^A-ZÑ\s]')
+
+# Los mismos apellidos y nombres se repiten constantemente en el tráfico
+MAX_MEMO_NORMALIZACION = 8192
+
+
+@lru_cache(maxsize=MAX_MEMO_NORMALIZACION)
+def normalizar_texto(texto: str) -> str:
+    """Tokenización: Normaliza texto removiendo acentos y caracteres especiales"""
+    if not texto:
+        return ""
+    if texto.isascii():
+        # Sin acentos posibles: basta con mayúsculas y, si hace falta, limpiar
+        texto = texto.upper()
+        if not texto.replace(' ', '').isalpha():
+            texto = _NO_LETRAS.sub('', texto)
+        return texto.strip()
+    # Remover acentos (normalización NFD)
+    texto = unicodedata.normalize('NFD', texto)
+    texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
+    # Convertir a mayúsculas y limpiar
+    texto = texto.upper()
+    texto = _NO_LETRAS.sub('', texto)
+    return texto.strip()
+
+
+def plegar(texto: str) -> str:
+    """Clave canónica de diccionario: texto normalizado con espacios simples"""
+    return ' '.join(normalizar_texto(texto).split())
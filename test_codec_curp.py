@@ -0,0 +1,52 @@
+"""
+Ida y vuelta de la codificación compacta de CURPs (empacar/desempacar y
+AlmacenCURP) y rechazo de las que no se pueden empacar
+
+Uso:
+    python -m pytest -q test_codec_curp.py
+"""
+
+import random
+
+import pytest
+
+from codec_curp import BITS, AlmacenCURP, curp_aleatoria, desempacar, empacar
+from generador_curp import GeneradorCURP
+
+CURP = 'PEAY000816HCSRGRA5'
+
+
+def test_ida_y_vuelta():
+    generador = GeneradorCURP()
+    aleatorio = random.Random(0)
+    almacen = AlmacenCURP()
+    comprobadas = 0
+    while comprobadas < 20000:
+        curp = curp_aleatoria(aleatorio)
+        validacion = generador.validar_sintaxis(curp)
+        if not validacion['valida']:
+            continue
+        assert 0 <= empacar(curp) < 1 << BITS
+        assert desempacar(empacar(curp)) == curp
+        posicion = almacen.agregar(curp, marca_ms=comprobadas)
+        assert almacen[posicion] == (curp, comprobadas)
+        assert generador.validar_sintaxis(almacen[posicion][0]) == validacion
+        comprobadas += 1
+    assert len(almacen) == comprobadas
+    assert almacen.nbytes == 17 * comprobadas
+    assert almacen.limpiar() == comprobadas and len(almacen) == 0
+
+
+@pytest.mark.parametrize('curp', [
+    CURP[:-1],                              # longitud
+    'ñEAY000816HCSRGRA5',                   # letra fuera del alfabeto
+    'PEAY000816HZZRGRA5',                   # entidad
+    'PEAY001316HCSRGRA5',                   # mes
+    'PEAY000800HCSRGRA5',                   # día
+    'PEAY+10816HCSRGRA5',                   # signo, que int() acepta
+    'PEAY 10816HCSRGRA5',                   # espacio, que int() acepta
+    'PEAY٠٠08١٦HCSRGRA5',                   # dígitos arábigos, que int() acepta
+])
+def test_no_empacables(curp):
+    with pytest.raises(ValueError):
+        empacar(curp)
@@ -0,0 +1,52 @@
+"""
+Diccionario en disco: las sugerencias con índice difuso deben coincidir con
+el recorrido lineal de las mismas claves, también cuando el radio del umbral
+pasa de MAX_BORRADOS y la mejor sugerencia está más lejos de lo que el índice
+difuso ve
+
+Uso:
+    python -m pytest -q test_diccionario_disco.py
+"""
+
+import random
+
+import pytest
+
+from benchmark import aplicar_errata
+from diccionario_apellidos import APELLIDOS_MEXICANOS
+from diccionario_disco import MAX_BORRADOS, DiccionarioDisco, construir
+from diccionario_nombres import NOMBRES_MASCULINOS
+from validador_ortografico import (distancia_levenshtein, encontrar_sugerencias,
+                                   encontrar_sugerencias_en_disco)
+
+SEMILLA = 20240816
+
+
+@pytest.fixture(scope='module')
+def diccionario(tmp_path_factory):
+    ruta = str(tmp_path_factory.mktemp('disco') / 'nombres.dic')
+    construir(sorted(NOMBRES_MASCULINOS | APELLIDOS_MEXICANOS), ruta)
+    return DiccionarioDisco(ruta)
+
+
+def test_mas_alla_de_max_borrados(diccionario):
+    # A MAX_BORRADOS + 1 ediciones, fuera del alcance del índice difuso, pero
+    # con similitud 66.67 (umbral 60)
+    texto = 'HXRXAXDEZ'
+    assert distancia_levenshtein(texto, 'HERNANDEZ') == MAX_BORRADOS + 1
+    assert 'HERNANDEZ' not in diccionario.candidatos_difusos(texto)
+    sugerencias = encontrar_sugerencias_en_disco(texto, diccionario, 3, 60)
+    assert ('HERNANDEZ', 66.67) in sugerencias
+
+
+@pytest.mark.parametrize('umbral', [40, 60, 70, 85])
+def test_igual_a_recorrido_lineal(diccionario, umbral):
+    claves = list(diccionario)
+    rng = random.Random(SEMILLA)
+    for clave in claves[::7]:
+        texto = clave
+        for _ in range(rng.randrange(1, 5)):
+            texto = aplicar_errata(texto, rng)
+        lineal = sorted(encontrar_sugerencias(texto, claves, len(claves), umbral),
+                        key=lambda x: (-x[1], x[0]))[:3]
+        assert encontrar_sugerencias_en_disco(texto, diccionario, 3, umbral) == lineal, texto
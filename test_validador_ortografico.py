@@ -0,0 +1,97 @@
+"""
+Equivalencia de los núcleos rápidos del validador ortográfico con sus
+referencias: las distancias acotadas y por lote contra la programación
+dinámica completa, y las sugerencias del árbol BK contra el recorrido lineal
+del diccionario
+
+Uso:
+    python -m pytest -q test_validador_ortografico.py
+"""
+
+import random
+
+import pytest
+
+from benchmark import aplicar_errata
+from diccionario_apellidos import INDICE_APELLIDOS
+from diccionario_nombres import INDICE_NOMBRES
+from validador_ortografico import (
+    PALABRA_MAQUINA, _distancia_myers, distancia_levenshtein, distancia_levenshtein_acotada,
+    distancia_levenshtein_dp, distancias_lote, encontrar_sugerencias,
+    encontrar_sugerencias_indexadas, indice_apellidos, indice_nombres, tabla_patron)
+
+SEMILLA = 20240816
+ALFABETO = 'ABCDEÑ '
+
+
+def _cadenas(n, longitud_maxima, rng):
+    # Alfabeto pequeño para que haya muchas coincidencias parciales; las
+    # longitudes cruzan PALABRA_MAQUINA para cubrir también el camino de DP
+    return [''.join(rng.choice(ALFABETO) for _ in range(rng.randrange(longitud_maxima + 1)))
+            for _ in range(n)]
+
+
+@pytest.fixture(scope='module')
+def pares():
+    rng = random.Random(SEMILLA)
+    cortas = _cadenas(400, 12, rng)
+    largas = _cadenas(40, PALABRA_MAQUINA + 10, rng)
+    return list(zip(cortas, reversed(cortas))) + list(zip(largas, reversed(largas)))
+
+
+def test_myers_igual_a_dp(pares):
+    for s1, s2 in pares:
+        esperada = distancia_levenshtein_dp(s1, s2)
+        assert distancia_levenshtein(s1, s2) == esperada, (s1, s2)
+        if len(s2) <= PALABRA_MAQUINA:
+            assert _distancia_myers(tabla_patron(s2), len(s2), s1) == esperada, (s1, s2)
+
+
+@pytest.mark.parametrize('k', [0, 1, 2, 3, 5, 8])
+def test_acotada_igual_a_dp(pares, k):
+    for s1, s2 in pares:
+        esperada = min(distancia_levenshtein_dp(s1, s2), k + 1)
+        assert distancia_levenshtein_acotada(s1, s2, k) == esperada, (s1, s2, k)
+        if len(s2) <= PALABRA_MAQUINA:
+            assert _distancia_myers(tabla_patron(s2), len(s2), s1, k) == esperada, (s1, s2, k)
+
+
+@pytest.mark.parametrize('k', [None, 0, 2, 4])
+def test_lote_igual_a_dp(pares, k):
+    consultas = sorted({s1 for s1, _ in pares}, key=len)[::25]
+    candidatos = [s2 for _, s2 in pares]
+    for consulta in consultas:
+        esperadas = [distancia_levenshtein_dp(consulta, c) for c in candidatos]
+        if k is not None:
+            esperadas = [min(d, k + 1) for d in esperadas]
+        assert distancias_lote(consulta, candidatos, k) == esperadas, consulta
+
+
+def _consultas(claves, rng):
+    """Claves del diccionario, con una y dos erratas, y prefijos"""
+    consultas = []
+    for clave in claves:
+        consultas.append(clave)
+        consultas.append(aplicar_errata(clave, rng))
+        consultas.append(aplicar_errata(aplicar_errata(clave, rng), rng))
+        consultas.append(clave[:max(1, len(clave) // 2)])
+    return consultas
+
+
+@pytest.mark.parametrize('diccionario, indice', [
+    (INDICE_NOMBRES, indice_nombres),
+    (INDICE_APELLIDOS, indice_apellidos),
+])
+@pytest.mark.parametrize('umbral', [40, 60, 80])
+def test_sugerencias_indexadas_iguales_a_lineales(diccionario, indice, umbral):
+    claves = sorted(diccionario.claves)
+    rng = random.Random(SEMILLA)
+    arbol = indice()
+    # Sin límite de sugerencias, para comparar el conjunto completo y no solo
+    # los primeros puestos; el recorrido lineal desempata por orden del
+    # diccionario, el indexado alfabéticamente
+    todas = len(claves)
+    for consulta in _consultas(claves[::3], rng):
+        lineal = encontrar_sugerencias(consulta, claves, todas, umbral)
+        indexada = encontrar_sugerencias_indexadas(consulta, arbol, todas, umbral)
+        assert indexada == sorted(lineal, key=lambda x: (-x[1], x[0])), consulta
@@ -0,0 +1,225 @@
+"""
+Validación masiva de CURPs en varios núcleos
+Las CURPs se agrupan en bloques que procesos trabajadores normalizan,
+validan, resumen y serializan; el proceso principal solo consulta la cache
+una vez por bloque y escribe el texto de cada bloque en el orden de entrada,
+manteniendo acotado el número de bloques en vuelo, así que la memoria no
+crece con el tamaño del lote
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import agregados
+from generador_curp import GeneradorCURP, tipo_error
+
+BLOQUE = 2000
+PROCESOS = int(os.environ.get('CURP_LOTE_PROCESOS', 0)) or os.cpu_count() or 1
+
+_generador = GeneradorCURP()
+_ejecutor = None
+_lock = threading.Lock()
+
+
+class LineaMalFormada:
+    """
+    Línea de un lote que no se pudo leer (JSON inválido). Se reporta en su
+    fila como inválida con tipo_error 'formato' y el lote continúa.
+    """
+
+    __slots__ = ('linea', 'error')
+
+    def __init__(self, linea, error):
+        self.linea = linea
+        self.error = error
+
+    def validacion(self):
+        return {'valida': False, 'errores': [f'Línea mal formada: {self.error}']}
+
+
+def validar_registro(registro, conocidas=None):
+    """
+    (curp, validacion, en_cache) de un registro de lote: una CURP sin
+    normalizar, buscada primero en `conocidas` (cache), o una LineaMalFormada
+    """
+    if isinstance(registro, LineaMalFormada):
+        return registro.linea, registro.validacion(), False
+    curp = registro.strip().upper()
+    validacion = conocidas.get(curp) if conocidas else None
+    if validacion is not None:
+        return curp, validacion, True
+    return curp, _generador.validar_sintaxis(curp, detalle=False), False
+
+
+def validar_bloque(curps, primera_fila=1, conocidas=None):
+    """
+    Trabajo de un proceso: normaliza y valida un bloque de CURPs, salvo las
+    que `conocidas` ya trae de la cache. Retorna (texto, resumen, cantidades):
+    las líneas JSON del bloque ya serializadas, su ResumenLote y los
+    contadores que suman las validaciones nuevas (las líneas mal formadas
+    cuentan en el resumen, no en los contadores).
+    """
+    resumen = ResumenLote()
+    cantidades = {}
+    lineas = []
+    for fila, registro in enumerate(curps, start=primera_fila):
+        curp, validacion, en_cache = validar_registro(registro, conocidas)
+        tipo = resumen.registrar(validacion, en_cache)
+        if not en_cache and tipo != 'formato':
+            agregados.acumular(cantidades, validacion)
+            if tipo is None:
+                cantidades['validaciones'] = cantidades.get('validaciones', 0) + 1
+        lineas.append(json.dumps(fila_validacion(fila, curp, validacion, tipo, en_cache),
+                                 ensure_ascii=False))
+        lineas.append('\n')
+    return ''.join(lineas), resumen, cantidades
+
+
+def ejecutor_procesos():
+    """
+    Pool de procesos del proceso actual, creado en el primer uso; None con un
+    solo núcleo, donde enviar bloques a otro proceso solo agrega serialización
+    """
+    global _ejecutor
+    if PROCESOS <= 1:
+        return None
+    with _lock:
+        if _ejecutor is None:
+            _ejecutor = ProcessPoolExecutor(max_workers=PROCESOS)
+        return _ejecutor
+
+
+def _bloques(iterable, tamano):
+    iterador = iter(iterable)
+    while bloque := list(islice(iterador, tamano)):
+        yield bloque
+
+
+def validar_en_orden(curps, ejecutor=None, consultar=None, bloque=BLOQUE, en_vuelo=None):
+    """
+    Produce (texto, resumen, cantidades) de validar_bloque para cada bloque de
+    CURPs, en el orden de entrada.
+
+    consultar(curps) recibe el conjunto de CURPs normalizadas del bloque y
+    retorna {curp: validacion} con las que ya conoce (cache): una sola
+    consulta por bloque. Sin ejecutor, o si el lote cabe en un solo bloque,
+    valida en el proceso actual para no pagar la comunicación.
+    """
+    if en_vuelo is None:
+        en_vuelo = 2 * PROCESOS
+    pendientes = deque()
+    primera_fila = 1
+    for curps_bloque in _bloques(curps, bloque):
+        conocidas = consultar({curp.strip().upper() for curp in curps_bloque
+                               if isinstance(curp, str)}) if consultar else {}
+        if ejecutor is None or (not pendientes and len(curps_bloque) < bloque):
+            pendientes.append(validar_bloque(curps_bloque, primera_fila, conocidas))
+        else:
+            pendientes.append(ejecutor.submit(validar_bloque, curps_bloque, primera_fila, conocidas))
+        primera_fila += len(curps_bloque)
+        while len(pendientes) > en_vuelo:
+            yield _resultado(pendientes.popleft())
+    while pendientes:
+        yield _resultado(pendientes.popleft())
+
+
+def _resultado(trabajo):
+    return trabajo if isinstance(trabajo, tuple) else trabajo.result()
+
+
+def lineas_no_vacias(archivo):
+    """
+    Líneas de un archivo de texto abierto con saltos universales (\\n, \\r o
+    \\r\\n), sin espacios alrededor (str.strip) y omitiendo las vacías: el
+    mismo criterio en los endpoints y en curp_masivo, para que las filas se
+    numeren igual
+    """
+    for linea in archivo:
+        linea = linea.strip()
+        if linea:
+            yield linea
+
+
+def curp_de_elemento(elemento):
+    """CURP de un elemento de lote: cadena u objeto con 'curp'; cualquier otra cosa es ''"""
+    if isinstance(elemento, dict):
+        elemento = elemento.get('curp', '')
+    return elemento if isinstance(elemento, str) else ''
+
+
+def curp_de_linea(linea):
+    """
+    CURP de una línea no vacía: texto plano, cadena JSON u objeto JSON; si el
+    JSON es inválido, una LineaMalFormada
+    """
+    if linea[:1] not in ('"', '{'):
+        return linea
+    try:
+        return curp_de_elemento(json.loads(linea))
+    except ValueError as e:
+        return LineaMalFormada(linea, str(e))
+
+
+def persona_de_linea(linea):
+    """Registro de persona de una línea JSONL no vacía; None si está mal formada"""
+    try:
+        fila = json.loads(linea)
+    except ValueError:
+        return None
+    return fila if isinstance(fila, dict) else None
+
+
+def fila_validacion(fila, curp, validacion, tipo, en_cache=False):
+    """Línea de resultado de un lote de validación (HTTP y línea de comandos)"""
+    return {
+        'fila': fila,
+        'curp': curp,
+        'valida': validacion['valida'],
+        'tipo_error': tipo,
+        'errores': validacion['errores'],
+        'cached': en_cache
+    }
+
+
+class ResumenLote:
+    """Conteos de un lote: válidas, inválidas por tipo de error y aciertos de cache"""
+
+    __slots__ = ('total', 'validas', 'por_tipo_error', 'aciertos_cache')
+
+    def __init__(self):
+        self.total = 0
+        self.validas = 0
+        self.por_tipo_error = {}
+        self.aciertos_cache = 0
+
+    def registrar(self, validacion, en_cache=False):
+        self.total += 1
+        self.aciertos_cache += en_cache
+        tipo = tipo_error(validacion)
+        if tipo is None:
+            self.validas += 1
+        else:
+            self.por_tipo_error[tipo] = self.por_tipo_error.get(tipo, 0) + 1
+        return tipo
+
+    def sumar(self, otro):
+        """Agrega los conteos de otro resumen (el de un bloque o tramo)"""
+        self.total += otro.total
+        self.validas += otro.validas
+        self.aciertos_cache += otro.aciertos_cache
+        for tipo, cuenta in otro.por_tipo_error.items():
+            self.por_tipo_error[tipo] = self.por_tipo_error.get(tipo, 0) + cuenta
+        return self
+
+    def como_dict(self):
+        return {
+            'total': self.total,
+            'validas': self.validas,
+            'invalidas': self.total - self.validas,
+            'por_tipo_error': dict(sorted(self.por_tipo_error.items())),
+            'aciertos_cache': self.aciertos_cache,
+        }
@@ -2,13 +2,36 @@
 Validador ortográfico con algoritmo de distancia de Levenshtein
 """
 
+import heapq
 import re
-from diccionario_nombres import obtener_todos_los_nombres, es_nombre_valido
-from diccionario_apellidos import obtener_todos_los_apellidos, es_apellido_valido
+from functools import lru_cache
+from time import perf_counter
+import instantanea
+from metricas import registro
+from indice_sugerencias import IndiceBK, radio_para_umbral
+from diccionario_disco import MAX_BORRADOS
+from fonetica import IndiceFonetico
+from normalizacion import plegar
+from diccionario_nombres import INDICE_NOMBRES, es_nombre_valido
+from diccionario_apellidos import INDICE_APELLIDOS, PARTICULAS, es_apellido_valido
 
-def distancia_levenshtein(s1, s2):
+PALABRA_MAQUINA = 64
+
+# Las mismas erratas se repiten constantemente en el tráfico
+MAX_MEMO_PALABRAS = 4096
+SUGERENCIAS_POR_PALABRA = 3
+# Corregir una palabra que ya existe en algún diccionario rara vez es lo que
+# se quiso escribir; en las muy cortas agregar o quitar una letra ya da otro nombre
+CASTIGO_PALABRA_VALIDA = 0.8
+MIN_LETRAS_CORRECCION = 4
+
+_FASE_DICCIONARIO = registro.histograma('curp_fase_segundos', fase='validar_campo.diccionario')
+_FASE_SUGERENCIAS = registro.histograma('curp_fase_segundos', fase='validar_campo.sugerencias')
+
+def distancia_levenshtein_dp(s1, s2):
+    """Programación dinámica fila por fila; referencia para el núcleo bit-paralelo"""
     if len(s1) < len(s2):
-        return distancia_levenshtein(s2, s1)
+        return distancia_levenshtein_dp(s2, s1)
     if len(s2) == 0:
         return len(s1)
     
@@ -23,24 +46,395 @@ def distancia_levenshtein(s1, s2):
         fila_anterior = fila_actual
     return fila_anterior[-1]
 
-def calcular_similitud(s1, s2):
-    distancia = distancia_levenshtein(s1.upper(), s2.upper())
-    max_len = max(len(s1), len(s2))
+def _distancia_acotada_dp(s1, s2, k):
+    """DP restringida a la banda de diagonales |i - j| <= k; retorna k + 1 si la excede"""
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    n, m = len(s1), len(s2)
+    if n - m > k:
+        return k + 1
+    fuera = k + 1
+    fila_anterior = [j if j <= k else fuera for j in range(m + 1)]
+    for i in range(1, n + 1):
+        inicio = max(1, i - k)
+        fin = min(m, i + k)
+        fila_actual = [fuera] * (m + 1)
+        if i <= k:
+            fila_actual[0] = i
+        c1 = s1[i - 1]
+        for j in range(inicio, fin + 1):
+            fila_actual[j] = min(fila_anterior[j] + 1,
+                                 fila_actual[j - 1] + 1,
+                                 fila_anterior[j - 1] + (c1 != s2[j - 1]))
+        if min(fila_actual[max(0, inicio - 1):fin + 1]) > k:
+            return fuera
+        fila_anterior = fila_actual
+    return min(fila_anterior[m], fuera)
+
+def tabla_patron(patron):
+    """Máscaras de coincidencia por carácter (Peq) para el algoritmo de Myers"""
+    peq = {}
+    bit = 1
+    for c in patron:
+        peq[c] = peq.get(c, 0) | bit
+        bit <<= 1
+    return peq
+
+def _distancia_myers(peq, m, texto, k=None):
+    """
+    Distancia de edición bit-paralela de Myers/Hyyrö entre un patrón de
+    longitud m (ya convertido en peq) y texto. Con k, abandona en cuanto la
+    distancia final ya no puede ser <= k y retorna k + 1.
+    """
+    if m == 0:
+        return len(texto) if k is None else min(len(texto), k + 1)
+    mascara = (1 << m) - 1
+    bit_alto = 1 << (m - 1)
+    pv = mascara
+    mv = 0
+    puntaje = m
+    restantes = len(texto)
+    for c in texto:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mascara) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mascara)
+        mh = pv & xh
+        if ph & bit_alto:
+            puntaje += 1
+        elif mh & bit_alto:
+            puntaje -= 1
+        restantes -= 1
+        if k is not None and puntaje - restantes > k:
+            return k + 1
+        ph = ((ph << 1) | 1) & mascara
+        mh = (mh << 1) & mascara
+        pv = mh | (~(xv | ph) & mascara)
+        mv = ph & xv
+    # Con texto vacío el ciclo no llega a comparar contra k
+    return puntaje if k is None else min(puntaje, k + 1)
+
+def distancia_levenshtein(s1, s2):
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if len(s2) > PALABRA_MAQUINA:
+        return distancia_levenshtein_dp(s1, s2)
+    return _distancia_myers(tabla_patron(s2), len(s2), s1)
+
+def distancia_levenshtein_acotada(s1, s2, k):
+    """Distancia de edición si es <= k; en otro caso retorna k + 1 sin terminar el cálculo"""
+    if abs(len(s1) - len(s2)) > k:
+        return k + 1
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if len(s2) > PALABRA_MAQUINA:
+        return _distancia_acotada_dp(s1, s2, k)
+    return _distancia_myers(tabla_patron(s2), len(s2), s1, k)
+
+def distancias_lote(consulta, candidatos, k=None):
+    """
+    Distancias de una consulta contra muchos candidatos reutilizando su
+    tabla Peq; con k, las distancias mayores se reportan como k + 1
+    """
+    m = len(consulta)
+    if m > PALABRA_MAQUINA:
+        if k is None:
+            return [distancia_levenshtein_dp(consulta, c) for c in candidatos]
+        return [_distancia_acotada_dp(consulta, c, k) for c in candidatos]
+    peq = tabla_patron(consulta)
+    if k is None:
+        return [_distancia_myers(peq, m, c) for c in candidatos]
+    fuera = k + 1
+    return [fuera if abs(len(c) - m) > k else _distancia_myers(peq, m, c, k) for c in candidatos]
+
+def preparar_consulta(consulta):
+    """Función (palabra, cota) -> distancia acotada que reutiliza la tabla Peq de la consulta"""
+    m = len(consulta)
+    if m > PALABRA_MAQUINA:
+        return lambda palabra, cota: _distancia_acotada_dp(consulta, palabra, cota)
+    peq = tabla_patron(consulta)
+    
+    def medir(palabra, cota):
+        if abs(len(palabra) - m) > cota:
+            return cota + 1
+        return _distancia_myers(peq, m, palabra, cota)
+    return medir
+
+def _similitud(distancia, len1, len2):
+    max_len = max(len1, len2)
     if max_len == 0:
         return 100.0
-    similitud = (1 - distancia / max_len) * 100
-    return round(similitud, 2)
+    return round((1 - distancia / max_len) * 100, 2)
+
+def calcular_similitud(s1, s2):
+    s1, s2 = s1.upper(), s2.upper()
+    return _similitud(distancia_levenshtein(s1, s2), len(s1), len(s2))
 
 def encontrar_sugerencias(texto, diccionario, max_sugerencias=3, umbral_similitud=60):
     texto_upper = texto.upper().strip()
+    palabras = [palabra.upper() for palabra in diccionario]
+    radio = radio_para_umbral(len(texto_upper), umbral_similitud)
+    distancias = distancias_lote(texto_upper, palabras, radio)
     sugerencias = []
-    for palabra in diccionario:
-        similitud = calcular_similitud(texto_upper, palabra)
+    for palabra, distancia in zip(diccionario, distancias):
+        if radio is not None and distancia > radio:
+            continue
+        similitud = _similitud(distancia, len(texto_upper), len(palabra.upper()))
         if similitud >= umbral_similitud:
             sugerencias.append((palabra, similitud))
     sugerencias.sort(key=lambda x: x[1], reverse=True)
     return sugerencias[:max_sugerencias]
 
+def palabras_diccionario(diccionario):
+    """Palabras sueltas de las claves plegadas, incluidas las partes de las compuestas ('DE LA TORRE')"""
+    return sorted({palabra for clave in diccionario.claves for palabra in clave.split()})
+
+@instantanea.estructura('bk_nombres', INDICE_NOMBRES)
+def indice_nombres():
+    """Árbol BK sobre las claves plegadas de INDICE_NOMBRES, de la instantánea o construido en el primer uso"""
+    return IndiceBK(sorted(INDICE_NOMBRES.claves), distancia_levenshtein, preparar_consulta)
+
+@instantanea.estructura('bk_apellidos', INDICE_APELLIDOS)
+def indice_apellidos():
+    """Árbol BK sobre las claves plegadas de INDICE_APELLIDOS, de la instantánea o construido en el primer uso"""
+    return IndiceBK(sorted(INDICE_APELLIDOS.claves), distancia_levenshtein, preparar_consulta)
+
+@instantanea.estructura('fonetica_nombres', INDICE_NOMBRES)
+def fonetica_nombres():
+    """Cubetas fonéticas de INDICE_NOMBRES, de la instantánea o construidas en el primer uso"""
+    return IndiceFonetico(INDICE_NOMBRES.claves)
+
+@instantanea.estructura('fonetica_apellidos', INDICE_APELLIDOS)
+def fonetica_apellidos():
+    """Cubetas fonéticas de INDICE_APELLIDOS, de la instantánea o construidas en el primer uso"""
+    return IndiceFonetico(INDICE_APELLIDOS.claves)
+
+@instantanea.estructura('bk_palabras_nombres', INDICE_NOMBRES)
+def indice_palabras_nombres():
+    """Árbol BK sobre las palabras de INDICE_NOMBRES, de la instantánea o construido en el primer uso"""
+    return IndiceBK(palabras_diccionario(INDICE_NOMBRES), distancia_levenshtein, preparar_consulta)
+
+@instantanea.estructura('bk_palabras_apellidos', INDICE_APELLIDOS)
+def indice_palabras_apellidos():
+    """Árbol BK sobre las palabras de INDICE_APELLIDOS, de la instantánea o construido en el primer uso"""
+    return IndiceBK(palabras_diccionario(INDICE_APELLIDOS), distancia_levenshtein, preparar_consulta)
+
+@instantanea.estructura('fonetica_palabras_nombres', INDICE_NOMBRES)
+def fonetica_palabras_nombres():
+    """Cubetas fonéticas de las palabras de INDICE_NOMBRES, de la instantánea o construidas en el primer uso"""
+    return IndiceFonetico(palabras_diccionario(INDICE_NOMBRES))
+
+@instantanea.estructura('fonetica_palabras_apellidos', INDICE_APELLIDOS)
+def fonetica_palabras_apellidos():
+    """Cubetas fonéticas de las palabras de INDICE_APELLIDOS, de la instantánea o construidas en el primer uso"""
+    return IndiceFonetico(palabras_diccionario(INDICE_APELLIDOS))
+
+@instantanea.estructura('vocabulario_nombres', INDICE_NOMBRES)
+def vocabulario_nombres():
+    """Palabras de INDICE_NOMBRES para consultar si una palabra suelta es conocida"""
+    return frozenset(palabras_diccionario(INDICE_NOMBRES))
+
+@instantanea.estructura('vocabulario_apellidos', INDICE_APELLIDOS)
+def vocabulario_apellidos():
+    """Palabras de INDICE_APELLIDOS para consultar si una palabra suelta es conocida"""
+    return frozenset(palabras_diccionario(INDICE_APELLIDOS))
+
+def encontrar_sugerencias_foneticas(texto, indice, max_sugerencias=3, umbral_similitud=60):
+    """
+    Palabras que suenan igual que el texto ('XIMENEZ' -> 'JIMÉNEZ') y alcanzan
+    el umbral de similitud, ordenadas por similitud de edición
+    """
+    texto_upper = plegar(texto)
+    candidatos = indice.candidatos(texto_upper)
+    sugerencias = []
+    for palabra, distancia in zip(candidatos, distancias_lote(texto_upper, candidatos)):
+        similitud = _similitud(distancia, len(texto_upper), len(palabra))
+        if similitud >= umbral_similitud:
+            sugerencias.append((palabra, similitud))
+    sugerencias.sort(key=lambda x: (-x[1], x[0]))
+    return sugerencias[:max_sugerencias]
+
+def encontrar_sugerencias_indexadas(texto, indice, max_sugerencias=3, umbral_similitud=60):
+    """
+    Igual que encontrar_sugerencias sobre claves plegadas, pero consulta solo
+    las palabras del índice cuya distancia puede alcanzar el umbral de similitud
+    """
+    texto_upper = plegar(texto)
+    radio = radio_para_umbral(len(texto_upper), umbral_similitud)
+    if radio is None:
+        radio = float('inf')
+    sugerencias = []
+    for palabra, distancia in indice.buscar(texto_upper, radio):
+        similitud = _similitud(distancia, len(texto_upper), len(palabra))
+        if similitud >= umbral_similitud:
+            sugerencias.append((palabra, similitud))
+    sugerencias.sort(key=lambda x: (-x[1], x[0]))
+    return sugerencias[:max_sugerencias]
+
+def _sugerencias_medidas(texto_upper, candidatos, radio, umbral_similitud):
+    """(palabra, similitud) de los candidatos que alcanzan el umbral, de mejor a peor"""
+    sugerencias = []
+    for palabra, distancia in zip(candidatos, distancias_lote(texto_upper, candidatos, radio)):
+        if radio is not None and distancia > radio:
+            continue
+        similitud = _similitud(distancia, len(texto_upper), len(palabra))
+        if similitud >= umbral_similitud:
+            sugerencias.append((palabra, similitud))
+    sugerencias.sort(key=lambda x: (-x[1], x[0]))
+    return sugerencias
+
+def encontrar_sugerencias_en_disco(texto, diccionario, max_sugerencias=3, umbral_similitud=60):
+    """
+    Sugerencias sobre un DiccionarioDisco: primero solo se mide la distancia
+    contra las claves que su índice difuso propone (a <= MAX_BORRADOS borrados
+    o con la misma clave fonética). Ese índice no ve claves más lejanas, que
+    con umbrales bajos y palabras largas aún pueden alcanzarlo: si el radio
+    del umbral pasa de MAX_BORRADOS y las sugerencias encontradas no superan
+    la mejor similitud posible a MAX_BORRADOS + 1, se recurre al índice por
+    longitud, que limita la comparación a longitudes compatibles con el radio.
+    Los archivos sin índice difuso recurren a él siempre.
+    """
+    texto_upper = plegar(texto)
+    radio = radio_para_umbral(len(texto_upper), umbral_similitud)
+    candidatos = diccionario.candidatos_difusos(texto_upper)
+    if candidatos is not None:
+        sugerencias = _sugerencias_medidas(texto_upper, candidatos, radio,
+                                           umbral_similitud)[:max_sugerencias]
+        if radio is not None and radio <= MAX_BORRADOS:
+            return sugerencias
+        # similitud <= 100 * longitud / (longitud + d) para d = MAX_BORRADOS + 1
+        tope = _similitud(MAX_BORRADOS + 1, len(texto_upper), len(texto_upper) + MAX_BORRADOS + 1)
+        if sugerencias and len(sugerencias) == max_sugerencias and sugerencias[-1][1] > tope:
+            return sugerencias
+    if radio is None:
+        candidatos = list(diccionario)
+    else:
+        candidatos = list(diccionario.por_longitud(len(texto_upper) - radio, len(texto_upper) + radio))
+    return _sugerencias_medidas(texto_upper, candidatos, radio, umbral_similitud)[:max_sugerencias]
+
+def _sugerir_claves(texto, diccionario, indice_bk, umbral_similitud, max_sugerencias, indice_fonetico):
+    """
+    Claves plegadas sugeridas, desde memoria o desde disco. En memoria van
+    primero las de la cubeta fonética del texto que alcanzan el umbral y el
+    árbol BK completa el resto hasta max_sugerencias; solo si la cubeta ya
+    las llena no se consulta el árbol.
+    """
+    if getattr(diccionario, 'en_disco', False):
+        claves = encontrar_sugerencias_en_disco(texto, diccionario, max_sugerencias, umbral_similitud)
+        origen = 'disco'
+    else:
+        claves = []
+        origen = 'fonetica'
+        if indice_fonetico is not None:
+            claves = encontrar_sugerencias_foneticas(texto, indice_fonetico(), max_sugerencias,
+                                                     umbral_similitud)
+        if len(claves) < max_sugerencias:
+            vistas = {clave for clave, _ in claves}
+            for sugerencia in encontrar_sugerencias_indexadas(texto, indice_bk(), max_sugerencias,
+                                                              umbral_similitud):
+                if sugerencia[0] not in vistas and len(claves) < max_sugerencias:
+                    claves.append(sugerencia)
+            origen = 'distancia'
+    registro.incrementar('curp_sugerencias_total', origen=origen)
+    return claves
+
+def sugerir(texto, diccionario, indice_bk, umbral_similitud, max_sugerencias=3, indice_fonetico=None):
+    """Sugerencias con ortografía de presentación para el texto completo"""
+    claves = _sugerir_claves(texto, diccionario, indice_bk, umbral_similitud, max_sugerencias,
+                             indice_fonetico)
+    return [(diccionario.mostrar(clave), similitud) for clave, similitud in claves]
+
+# tipo -> (diccionario, árbol BK y cubetas fonéticas de las claves completas, árbol BK
+# y cubetas fonéticas de las palabras, vocabulario, umbral de similitud, partículas, validador)
+_MOTORES = {
+    'nombre': (INDICE_NOMBRES, indice_nombres, fonetica_nombres, indice_palabras_nombres,
+               fonetica_palabras_nombres, vocabulario_nombres, 65, PARTICULAS, es_nombre_valido),
+    'apellido': (INDICE_APELLIDOS, indice_apellidos, fonetica_apellidos, indice_palabras_apellidos,
+                 fonetica_palabras_apellidos, vocabulario_apellidos, 70, PARTICULAS,
+                 es_apellido_valido),
+}
+
+def _palabra_conocida(palabra, tipo):
+    """La palabra es una clave o parte de una clave compuesta del diccionario del tipo"""
+    diccionario, _, _, _, _, vocabulario, _, _, _ = _MOTORES[tipo]
+    if getattr(diccionario, 'en_disco', False):
+        return palabra in diccionario
+    return palabra in vocabulario()
+
+@lru_cache(maxsize=MAX_MEMO_PALABRAS)
+def sugerencias_palabra(palabra, tipo):
+    """
+    Opciones (clave, similitud) para una palabra suelta ya plegada, memorizadas.
+    Una palabra conocida en cualquiera de los diccionarios ('SAN' escrito
+    como nombre) ya es correcta: sus correcciones se castigan con
+    CASTIGO_PALABRA_VALIDA y se descartan si quedan bajo el umbral. En las
+    palabras de menos de MIN_LETRAS_CORRECCION letras solo se cambian letras,
+    sin agregar ni quitar ('RIO' no pasa a 'RIOS').
+    """
+    diccionario, _, _, indice_bk, indice_fonetico, _, umbral, _, _ = _MOTORES[tipo]
+    propia = _palabra_conocida(palabra, tipo)
+    correcciones = _sugerir_claves(palabra, diccionario, indice_bk, umbral, SUGERENCIAS_POR_PALABRA,
+                                   indice_fonetico)
+    if len(palabra) < MIN_LETRAS_CORRECCION:
+        correcciones = [(clave, similitud) for clave, similitud in correcciones
+                        if len(clave) == len(palabra)]
+    if not (propia or any(_palabra_conocida(palabra, otro) for otro in _MOTORES)):
+        return tuple(correcciones)
+    castigadas = [(clave, round(similitud * CASTIGO_PALABRA_VALIDA, 2))
+                  for clave, similitud in correcciones if clave != palabra]
+    opciones = [(palabra, 100.0)] if propia else []
+    return tuple(opciones + [opcion for opcion in castigadas if opcion[1] >= umbral])
+
+def sugerir_por_palabra(texto, tipo='nombre', max_sugerencias=3):
+    """
+    Sugerencias para un nombre o apellido, simple o compuesto. Se unen las
+    claves completas más parecidas al texto ('DELAROSA' -> 'DE LA ROSA') y
+    las combinaciones que corrigen cada palabra por separado ('JOSE LUIZ' ->
+    'JOSÉ LUIS'), y se ordenan juntas por similitud. Las partículas (DE, DEL,
+    LA, LOS, LAS) se conservan; la similitud de una combinación es el
+    promedio de las de sus palabras ponderado por la longitud de lo escrito,
+    y solo se proponen combinaciones que el diccionario acepta.
+    """
+    diccionario, indice_bk, indice_fonetico, _, _, _, umbral, particulas, es_valido = _MOTORES[tipo]
+    sugerencias = {}
+    for clave, similitud in _sugerir_claves(texto, diccionario, indice_bk, umbral, max_sugerencias,
+                                            indice_fonetico):
+        sugerencias[diccionario.mostrar(clave)] = similitud
+
+    palabras = plegar(texto).split()
+    opciones = []
+    for palabra in palabras:
+        candidatas = ((palabra, 100.0),) if palabra in particulas else sugerencias_palabra(palabra, tipo)
+        if not candidatas:
+            break
+        opciones.append(candidatas)
+    else:
+        # El puntaje es una suma por posición: conservar las mejores parciales
+        # en cada paso basta para obtener las mejores combinaciones completas
+        ancho = max_sugerencias * SUGERENCIAS_POR_PALABRA
+        parciales = [((), 0.0)]
+        for palabra, candidatas in zip(palabras, opciones):
+            parciales = heapq.nlargest(
+                ancho,
+                ((claves + (clave,), puntos + similitud * len(palabra))
+                 for claves, puntos in parciales for clave, similitud in candidatas),
+                key=lambda parcial: parcial[1]
+            )
+
+        total = sum(len(palabra) for palabra in palabras)
+        for claves, puntos in parciales:
+            clave = ' '.join(claves)
+            if claves == tuple(palabras) or not es_valido(clave):
+                continue
+            if clave in diccionario:
+                mostrada = diccionario.mostrar(clave)
+            else:
+                mostrada = ' '.join(diccionario.mostrar(parte) for parte in claves)
+            similitud = round(puntos / total, 2)
+            if similitud > sugerencias.get(mostrada, 0):
+                sugerencias[mostrada] = similitud
+    return sorted(sugerencias.items(), key=lambda x: (-x[1], x[0]))[:max_sugerencias]
+
 def validar_sintaxis_basica(texto):
     texto = texto.strip()
     if not texto:
@@ -59,8 +453,9 @@ def validar_sintaxis_basica(texto):
         return False, "Contiene un patrón sospechoso (letras repetidas)"
     return True, None
 
-def validar_nombre_con_correccion(nombre):
-    es_valido_sintaxis, error_sintaxis = validar_sintaxis_basica(nombre)
+def _resultado_directo(texto, es_valido, mensaje_valido):
+    """Resultado que no requiere búsqueda difusa (error sintáctico o palabra conocida), o None"""
+    es_valido_sintaxis, error_sintaxis = validar_sintaxis_basica(texto)
     if not es_valido_sintaxis:
         return {
             'valido': False,
@@ -69,16 +464,26 @@ def validar_nombre_con_correccion(nombre):
             'sugerencias': []
         }
     
-    if es_nombre_valido(nombre):
+    inicio = perf_counter()
+    encontrado = es_valido(texto)
+    _FASE_DICCIONARIO.observar(perf_counter() - inicio)
+    if encontrado:
         return {
             'valido': True,
             'tipo_error': None,
-            'mensaje': "Nombre válido",
+            'mensaje': mensaje_valido,
             'sugerencias': []
         }
+    return None
+
+def validar_nombre_con_correccion(nombre):
+    resultado = _resultado_directo(nombre, es_nombre_valido, "Nombre válido")
+    if resultado is not None:
+        return resultado
     
-    diccionario = obtener_todos_los_nombres()
-    sugerencias = encontrar_sugerencias(nombre, diccionario, max_sugerencias=3, umbral_similitud=65)
+    inicio = perf_counter()
+    sugerencias = sugerir_por_palabra(nombre, 'nombre')
+    _FASE_SUGERENCIAS.observar(perf_counter() - inicio)
     
     if sugerencias:
         mejor_sugerencia = sugerencias[0]
@@ -101,25 +506,13 @@ def validar_nombre_con_correccion(nombre):
         }
 
 def validar_apellido_con_correccion(apellido):
-    es_valido_sintaxis, error_sintaxis = validar_sintaxis_basica(apellido)
-    if not es_valido_sintaxis:
-        return {
-            'valido': False,
-            'tipo_error': 'sintactico',
-            'mensaje': f"Error sintáctico: {error_sintaxis}",
-            'sugerencias': []
-        }
+    resultado = _resultado_directo(apellido, es_apellido_valido, "Apellido válido")
+    if resultado is not None:
+        return resultado
     
-    if es_apellido_valido(apellido):
-        return {
-            'valido': True,
-            'tipo_error': None,
-            'mensaje': "Apellido válido",
-            'sugerencias': []
-        }
-    
-    diccionario = obtener_todos_los_apellidos()
-    sugerencias = encontrar_sugerencias(apellido, diccionario, max_sugerencias=3, umbral_similitud=70)
+    inicio = perf_counter()
+    sugerencias = sugerir_por_palabra(apellido, 'apellido')
+    _FASE_SUGERENCIAS.observar(perf_counter() - inicio)
     
     if sugerencias:
         mejor_sugerencia = sugerencias[0]
@@ -145,4 +538,28 @@ def validar_campo(texto, tipo='nombre'):
     if tipo == 'nombre':
         return validar_nombre_con_correccion(texto)
     else:
-        return validar_apellido_con_correccion(texto)
\ No newline at end of file
+        return validar_apellido_con_correccion(texto)
+
+def validar_campo_directo(texto, tipo='nombre'):
+    """
+    Parte barata de validar_campo: el resultado si basta la sintaxis y el
+    diccionario, o None si hace falta buscar sugerencias
+    """
+    if tipo == 'nombre':
+        return _resultado_directo(texto, es_nombre_valido, "Nombre válido")
+    return _resultado_directo(texto, es_apellido_valido, "Apellido válido")
+
+def validar_campos(campos):
+    """
+    Valida varios campos de un formulario ({tipo: texto}) en una sola pasada.
+    Los textos repetidos (p. ej. el mismo apellido paterno y materno) se
+    buscan en el diccionario una sola vez.
+    """
+    resultados = {}
+    vistos = {}
+    for tipo, texto in campos.items():
+        clave = (texto, tipo == 'nombre')
+        if clave not in vistos:
+            vistos[clave] = validar_campo(texto, tipo)
+        resultados[tipo] = vistos[clave]
+    return resultados